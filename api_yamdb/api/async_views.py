@@ -0,0 +1,81 @@
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from functools import update_wrapper
+from threading import Lock
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.http import HttpResponse
+
+from .metrics import install_query_recorder
+
+READ_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_executor = None
+_executor_lock = Lock()
+
+
+def get_read_executor():
+    """
+    Пул потоков для чтения. Его размер (ASYNC_READ_WORKERS) ограничивает
+    число одновременных обращений к БД, а ожидающие запросы держит
+    цикл событий, не занимая потоков.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.ASYNC_READ_WORKERS,
+                thread_name_prefix='async-read',
+            )
+        return _executor
+
+
+def _run_read(view, request, args, kwargs):
+    """
+    Выполняет sync view в потоке пула и рендерит ответ там же,
+    чтобы обработчику ASGI не пришлось переходить в sync-поток.
+    Соединения потока закрываются по тем же правилам, что и
+    в конце обычного запроса (CONN_MAX_AGE).
+    """
+    close_old_connections()
+    install_query_recorder()
+    try:
+        response = view(request, *args, **kwargs)
+        if hasattr(response, 'render') and callable(response.render):
+            response.render()
+            return HttpResponse(
+                response.content,
+                status=response.status_code,
+                headers=response.headers,
+            )
+        return response
+    finally:
+        close_old_connections()
+
+
+def async_read(view):
+    """
+    Делает из sync view асинхронный: GET/HEAD/OPTIONS выполняются
+    в ограниченном пуле потоков (get_read_executor), остальные методы -
+    в sync-потоке, как у обычных sync view под ASGI.
+    :param view: view-функция, например ViewSet.as_view(...)
+    """
+
+    async def wrapper(request, *args, **kwargs):
+        if request.method not in READ_METHODS:
+            return await sync_to_async(view)(request, *args, **kwargs)
+        context = contextvars.copy_context()
+        return await asyncio.get_running_loop().run_in_executor(
+            get_read_executor(),
+            context.run,
+            _run_read,
+            view,
+            request,
+            args,
+            kwargs,
+        )
+
+    return update_wrapper(wrapper, view)
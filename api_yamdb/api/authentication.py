@@ -0,0 +1,125 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+User = get_user_model()
+
+USERNAME_CLAIM = 'username'
+ROLE_CLAIM = 'role'
+SUPERUSER_CLAIM = 'is_superuser'
+USER_STATE_KEY_TEMPLATE = 'auth:user:{user_id}'
+REVOKED = 'revoked'
+
+
+def _set_user_state(user_id, state):
+    """
+    Записи живут USER_STATE_TIMEOUT секунд: изменения, прошедшие
+    мимо сигналов (update(), другой процесс с локальным кешем),
+    применяются не позже, чем через это время.
+    """
+    cache.set(
+        USER_STATE_KEY_TEMPLATE.format(user_id=user_id),
+        state,
+        timeout=settings.USER_STATE_TIMEOUT,
+    )
+
+
+def remember_user_state(user):
+    """
+    Сохраняет актуальные имя, роль и статус суперпользователя,
+    чтобы они перекрывали устаревшие claims в уже выданных токенах.
+    Вызывается сигналом сохранения пользователя (api/signals.py).
+    :param user: объект пользователя после изменения
+    :return: сохранённое состояние
+    """
+    if not user.is_active:
+        state = REVOKED
+    else:
+        state = {
+            USERNAME_CLAIM: user.username,
+            ROLE_CLAIM: user.role,
+            SUPERUSER_CLAIM: user.is_superuser,
+        }
+    _set_user_state(user.pk, state)
+    return state
+
+
+def revoke_user(user_id):
+    """
+    Отзывает все выданные пользователю токены (например, при удалении).
+    :param user_id: id пользователя
+    """
+    _set_user_state(user_id, REVOKED)
+
+
+def get_user_state(user_id):
+    """
+    Возвращает состояние пользователя из кеша, а если запись
+    устарела - из БД одним запросом, и кеширует его.
+    :param user_id: id пользователя
+    :return: словарь claims или REVOKED
+    """
+    state = cache.get(USER_STATE_KEY_TEMPLATE.format(user_id=user_id))
+    if state is not None:
+        return state
+    user = (
+        User.objects.filter(pk=user_id)
+        .only('username', 'role', 'is_superuser', 'is_active')
+        .first()
+    )
+    if user is None:
+        revoke_user(user_id)
+        return REVOKED
+    return remember_user_state(user)
+
+
+class RoleAccessToken(AccessToken):
+    """Access-токен с именем, ролью и статусом суперпользователя."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token[USERNAME_CLAIM] = user.username
+        token[ROLE_CLAIM] = user.role
+        token[SUPERUSER_CLAIM] = user.is_superuser
+        return token
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    JWT-аутентификация без запроса пользователя в БД.
+    Пользователь собирается из кеша состояний как несохраняемый
+    экземпляр модели, поэтому работают сравнения с объектами
+    и присваивание в ForeignKey. Состояние обновляют сигналы
+    сохранения и удаления пользователя, а устаревшее через
+    USER_STATE_TIMEOUT секунд перечитывается из БД. Токены без
+    claims роли обрабатываются как раньше, с запросом в БД.
+    """
+
+    def get_user(self, validated_token):
+        if ROLE_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                'Токен не содержит идентификатор пользователя'
+            )
+        state = get_user_state(user_id)
+        if state == REVOKED:
+            raise AuthenticationFailed(
+                'Пользователь не найден', code='user_not_found'
+            )
+        user = User(
+            username=state[USERNAME_CLAIM],
+            role=state[ROLE_CLAIM],
+            is_superuser=state[SUPERUSER_CLAIM],
+        )
+        setattr(user, api_settings.USER_ID_FIELD, user_id)
+        user._state.adding = False
+        return user
@@ -0,0 +1,333 @@
+from hashlib import md5
+from time import time, time_ns
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import router, transaction
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.response import Response
+
+from .pagination import COUNT_HEADER, PAGINATION_HEADER
+from .renderers import fragment
+
+VERSION_KEY_TEMPLATE = 'api:{namespace}:version'
+MODIFIED_KEY_TEMPLATE = 'api:{namespace}:modified'
+RESPONSE_KEY_TEMPLATE = 'api:{namespace}:{version}:{digest}'
+
+TITLES_NAMESPACE = 'reviews.title'
+CATEGORIES_NAMESPACE = 'reviews.category'
+GENRES_NAMESPACE = 'reviews.genre'
+USERS_NAMESPACE = 'reviews.user'
+RANKINGS_NAMESPACE = 'reviews.titleranking'
+# массовые изменения данных командами: входит во все ETag
+BULK_NAMESPACE = 'reviews.bulk'
+
+
+def title_namespace(title_id):
+    """Пространство имён одного произведения."""
+    return f'{TITLES_NAMESPACE}:{title_id}'
+
+
+def reviews_namespace(title_id):
+    """Пространство имён отзывов на произведение."""
+    return f'reviews.review:title:{title_id}'
+
+
+def comments_namespace(review_id):
+    """Пространство имён комментариев к отзыву."""
+    return f'reviews.comment:review:{review_id}'
+
+
+def _initial_version():
+    """
+    Начальная версия зависит от времени, чтобы после очистки кеша
+    версии не повторялись и процессные кеши не считали себя свежими.
+    """
+    return time_ns()
+
+
+def get_version(namespace):
+    """
+    Возвращает текущую версию данных пространства имён кеша.
+    :param namespace: имя пространства (например, модель)
+    """
+    key = VERSION_KEY_TEMPLATE.format(namespace=namespace)
+    version = cache.get(key)
+    if version is None:
+        initial = _initial_version()
+        cache.add(key, initial, timeout=None)
+        version = cache.get(key, initial)
+    return version
+
+
+def bump_version(namespace):
+    """
+    Увеличивает версию пространства имён, делая недействительными
+    все закешированные для него ответы.
+    :param namespace: имя пространства (например, модель)
+    """
+    key = VERSION_KEY_TEMPLATE.format(namespace=namespace)
+    cache.set(
+        MODIFIED_KEY_TEMPLATE.format(namespace=namespace),
+        int(time()),
+        timeout=None,
+    )
+    try:
+        return cache.incr(key)
+    except ValueError:
+        version = _initial_version()
+        cache.set(key, version, timeout=None)
+        return version
+
+
+def bump_versions_on_commit(*namespaces):
+    """
+    Увеличивает версии пространств имён после фиксации транзакции,
+    чтобы параллельный GET не закешировал старые данные с новой версией.
+    :param namespaces: имена пространств
+    """
+
+    def bump():
+        for namespace in namespaces:
+            bump_version(namespace)
+
+    transaction.on_commit(bump)
+
+
+def get_last_modified(namespace):
+    """
+    Возвращает время последнего изменения пространства имён (unix time).
+    :param namespace: имя пространства (например, модель)
+    """
+    key = MODIFIED_KEY_TEMPLATE.format(namespace=namespace)
+    modified = cache.get(key)
+    if modified is None:
+        cache.add(key, int(time()), timeout=None)
+        modified = cache.get(key, int(time()))
+    return modified
+
+
+def get_response_key(namespace, request):
+    """
+    Ключ кеша ответа: версия пространства и URL с отсортированными
+    query-параметрами (ссылки пагинации в ответе абсолютные).
+    :param namespace: имя пространства (например, модель)
+    :param request: DRF запрос
+    """
+    params = sorted(request.query_params.lists())
+    url = f'{request.build_absolute_uri(request.path)}?{params}'
+    return RESPONSE_KEY_TEMPLATE.format(
+        namespace=namespace,
+        version=get_version(namespace),
+        digest=md5(url.encode()).hexdigest(),
+    )
+
+
+class SlugCache:
+    """
+    Процессный кеш строк маленького справочника по slug.
+    Строки перечитываются одним запросом, когда меняется версия
+    пространства имён модели: её увеличивают сигналы сохранения
+    и удаления (api/signals.py) и команды массовой загрузки,
+    в том числе в других процессах, если кеш Django общий.
+    Slug, которого нет в кеше, ищется в БД, поэтому строки,
+    добавленные без смены версии, не отклоняются.
+    """
+
+    def __init__(self, model, slug_field='slug'):
+        self.model = model
+        self.namespace = model._meta.label_lower
+        self.slug_field = slug_field
+        self.field_names = [
+            field.attname for field in model._meta.concrete_fields
+        ]
+        self._slug_index = self.field_names.index(slug_field)
+        self._state = (None, {})
+
+    def _load(self, **lookups):
+        return {
+            row[self._slug_index]: row
+            for row in self.model.objects.filter(**lookups).values_list(
+                *self.field_names
+            )
+        }
+
+    def _rows(self):
+        version = get_version(self.namespace)
+        cached_version, rows = self._state
+        if cached_version != version:
+            rows = self._load()
+            self._state = (version, rows)
+        return rows
+
+    def get_many(self, slugs):
+        """
+        Возвращает объекты модели по slug: {slug: объект}. Найденные
+        в кеше берутся без запроса в БД, остальные - одним запросом;
+        отсутствующих в БД slug в результате нет.
+        :param slugs: slug объектов
+        """
+        rows = self._rows()
+        missing = [slug for slug in slugs if slug not in rows]
+        if missing:
+            rows.update(
+                self._load(**{f'{self.slug_field}__in': missing})
+            )
+        db = router.db_for_read(self.model)
+        return {
+            slug: self.model.from_db(db, self.field_names, rows[slug])
+            for slug in slugs
+            if slug in rows
+        }
+
+    def get(self, slug):
+        """
+        Возвращает объект модели по slug или None, если такого slug нет.
+        :param slug: slug объекта
+        """
+        return self.get_many([slug]).get(slug)
+
+
+_slug_caches = {}
+
+
+def get_slug_cache(model, slug_field='slug'):
+    """Возвращает общий для процесса SlugCache модели."""
+    key = (model, slug_field)
+    if key not in _slug_caches:
+        _slug_caches[key] = SlugCache(model, slug_field)
+    return _slug_caches[key]
+
+
+class NestedObjectCache:
+    """
+    Процессный кеш готовых представлений строк справочника
+    (категории, жанра) по pk для вложения в ответы произведений:
+    один словарь на все строки ответа, без повторной сборки.
+    Для ответов через orjson 3.9+ хранит и закодированный
+    фрагмент JSON, который вставляется в вывод как есть.
+    Сбрасывается при смене версии пространства имён модели,
+    как SlugCache, в том числе после переименования в админке.
+    """
+
+    def __init__(self, model, fields):
+        self.namespace = model._meta.label_lower
+        self.fields = fields
+        self._state = (None, {}, {})
+
+    def getter(self, fragments=False):
+        """
+        Возвращает функцию объект -> представление. Версия проверяется
+        один раз, поэтому функцию берут на один ответ.
+        :param fragments: отдавать orjson.Fragment вместо словарей
+        """
+        version = get_version(self.namespace)
+        cached_version, objects, encoded = self._state
+        if cached_version != version:
+            objects, encoded = {}, {}
+            self._state = (version, objects, encoded)
+        fields = self.fields
+
+        def get(obj):
+            data = objects.get(obj.pk)
+            if data is None:
+                data = objects[obj.pk] = {
+                    field: getattr(obj, field) for field in fields
+                }
+            return data
+
+        if not fragments:
+            return get
+
+        def get_fragment(obj):
+            data = encoded.get(obj.pk)
+            if data is None:
+                data = encoded[obj.pk] = fragment(get(obj))
+            return data
+
+        return get_fragment
+
+
+class CachedListMixin:
+    """
+    Миксин read-through кеша для list: сериализованные данные ответа
+    хранятся в кеше Django до смены версии пространства имён модели
+    (сигналы сохранения и удаления, api/signals.py).
+    """
+
+    cache_timeout = settings.REFERENCE_CACHE_TIMEOUT
+
+    def get_cache_namespace(self):
+        return self.queryset.model._meta.label_lower
+
+    def list(self, request, *args, **kwargs):
+        key = get_response_key(self.get_cache_namespace(), request)
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, timeout=self.cache_timeout)
+        return response
+
+
+class ConditionalGetMixin:
+    """
+    Миксин условных GET-запросов для list и retrieve.
+    ETag строится по версиям пространств имён, URL запроса, формату
+    ответа и заголовкам режима пагинации, Last-Modified - по времени
+    последнего изменения пространств. При совпадении
+    If-None-Match/If-Modified-Since возвращается 304 без обращения
+    к БД и сериализации.
+    """
+
+    # заголовки запроса, от которых зависит тело ответа (кроме Accept)
+    etag_headers = (PAGINATION_HEADER, COUNT_HEADER)
+    vary_headers = ('Accept', 'X-Pagination', 'X-Pagination-Count')
+
+    def get_etag_namespaces(self):
+        """Пространства имён, от которых зависит ответ."""
+        raise NotImplementedError
+
+    def _get_validators(self, request):
+        namespaces = (*self.get_etag_namespaces(), BULK_NAMESPACE)
+        versions = [get_version(namespace) for namespace in namespaces]
+        headers = [request.META.get(header) for header in self.etag_headers]
+        source = (
+            f'{versions}:{request.build_absolute_uri()}:'
+            f'{request.accepted_media_type}:{headers}'
+        )
+        etag = f'"{md5(source.encode()).hexdigest()}"'
+        last_modified = max(
+            get_last_modified(namespace) for namespace in namespaces
+        )
+        # точность Last-Modified - секунда: пока идёт секунда последней
+        # записи, следующая запись в ней же не изменила бы заголовок
+        if last_modified >= int(time()):
+            last_modified = None
+        return etag, last_modified
+
+    def _conditional(self, handler, request, *args, **kwargs):
+        etag, last_modified = self._get_validators(request)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (
+            status.HTTP_200_OK,
+            status.HTTP_304_NOT_MODIFIED,
+        ):
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+            patch_vary_headers(response, self.vary_headers)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self._conditional(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._conditional(super().retrieve, request, *args, **kwargs)
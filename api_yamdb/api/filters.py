@@ -1,5 +1,7 @@
 from django_filters import rest_framework as filters
+from rest_framework.filters import SearchFilter
 from reviews.models import Title
+from reviews.search import get_search_backend
 
 
 class TitleFilter(filters.FilterSet):
@@ -7,9 +9,40 @@ class TitleFilter(filters.FilterSet):
 
     category = filters.CharFilter(field_name='category__slug')
     genre = filters.CharFilter(field_name='genre__slug')
-    name = filters.CharFilter(field_name='name', lookup_expr='icontains')
+    name = filters.CharFilter(method='filter_name')
     year = filters.NumberFilter(field_name='year')
 
     class Meta:
         model = Title
         fields = ['category', 'genre', 'name', 'year']
+
+    def filter_name(self, queryset, name, value):
+        """Поиск по названию через полнотекстовый бэкенд."""
+        return get_search_backend().search(queryset, value)
+
+
+class TitleRankingFilter(filters.FilterSet):
+    """
+    Фильтры топов произведений. Без поиска по названию:
+    он сортирует по релевантности и сломал бы порядок топа.
+    """
+
+    category = filters.CharFilter(field_name='category__slug')
+    genre = filters.CharFilter(field_name='genre__slug')
+
+    class Meta:
+        model = Title
+        fields = ['category', 'genre']
+
+
+class TitleSearchFilter(SearchFilter):
+    """
+    Поиск произведений по параметру `search` через полнотекстовый
+    бэкенд с ранжированием по релевантности.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '')
+        if not query.strip():
+            return queryset
+        return get_search_backend().search(queryset, query)
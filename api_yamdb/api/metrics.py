@@ -0,0 +1,329 @@
+import asyncio
+import logging
+from bisect import bisect_left
+from contextvars import ContextVar
+from hmac import compare_digest
+from threading import Lock
+from time import perf_counter
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.decorators import sync_and_async_middleware
+
+logger = logging.getLogger('api.metrics')
+
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+UNRESOLVED_VIEW = '<unresolved>'
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+_current = ContextVar('api_request_metrics', default=None)
+
+
+class RequestMetrics:
+    """Счётчики одного запроса."""
+
+    __slots__ = (
+        'queries',
+        'db_time',
+        'serializer_time',
+        'slow_threshold_ms',
+        '_serializing',
+    )
+
+    def __init__(self, slow_threshold_ms=None):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.slow_threshold_ms = slow_threshold_ms
+        self._serializing = False
+
+
+class EndpointStats:
+    """Накопленные метрики одного эндпоинта."""
+
+    __slots__ = (
+        'count',
+        'latency_sum',
+        'latency_buckets',
+        'queries',
+        'db_time',
+        'serializer_time',
+    )
+
+    def __init__(self):
+        self.count = 0
+        self.latency_sum = 0.0
+        self.latency_buckets = [0] * len(LATENCY_BUCKETS)
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+
+    def copy(self):
+        stats = EndpointStats()
+        for name in self.__slots__:
+            setattr(stats, name, getattr(self, name))
+        stats.latency_buckets = list(self.latency_buckets)
+        return stats
+
+
+class MetricsRegistry:
+    """
+    Метрики эндпоинтов в памяти процесса.
+    Ключ - (имя view, маршрут, HTTP-метод).
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._stats = {}
+
+    def observe(self, key, latency, request_metrics):
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = EndpointStats()
+            stats.count += 1
+            stats.latency_sum += latency
+            bucket = bisect_left(LATENCY_BUCKETS, latency)
+            if bucket < len(LATENCY_BUCKETS):
+                stats.latency_buckets[bucket] += 1
+            stats.queries += request_metrics.queries
+            stats.db_time += request_metrics.db_time
+            stats.serializer_time += request_metrics.serializer_time
+
+    def snapshot(self):
+        """Копия метрик: {ключ: EndpointStats}."""
+        with self._lock:
+            return {key: stats.copy() for key, stats in self._stats.items()}
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    def render(self):
+        """Метрики в текстовом формате Prometheus."""
+        snapshot = sorted(self.snapshot().items())
+        lines = []
+
+        def family(name, kind, help_text, samples):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            lines.extend(samples)
+
+        def labels(key, **extra):
+            view, route, method = key
+            pairs = {'view': view, 'route': route, 'method': method, **extra}
+            return ','.join(
+                f'{label}="{_escape(value)}"' for label, value in pairs.items()
+            )
+
+        latency_samples = []
+        for key, stats in snapshot:
+            cumulative = 0
+            for bound, amount in zip(LATENCY_BUCKETS, stats.latency_buckets):
+                cumulative += amount
+                latency_samples.append(
+                    'yamdb_http_request_duration_seconds_bucket'
+                    f'{{{labels(key, le=repr(bound))}}} {cumulative}'
+                )
+            latency_samples.append(
+                'yamdb_http_request_duration_seconds_bucket'
+                f'{{{labels(key, le="+Inf")}}} {stats.count}'
+            )
+            latency_samples.append(
+                'yamdb_http_request_duration_seconds_sum'
+                f'{{{labels(key)}}} {stats.latency_sum!r}'
+            )
+            latency_samples.append(
+                'yamdb_http_request_duration_seconds_count'
+                f'{{{labels(key)}}} {stats.count}'
+            )
+        family(
+            'yamdb_http_request_duration_seconds',
+            'histogram',
+            'Время обработки запроса.',
+            latency_samples,
+        )
+        for name, attr, help_text in (
+            ('yamdb_db_queries_total', 'queries', 'Количество SQL-запросов.'),
+            (
+                'yamdb_db_query_duration_seconds_total',
+                'db_time',
+                'Суммарное время SQL-запросов.',
+            ),
+            (
+                'yamdb_serializer_duration_seconds_total',
+                'serializer_time',
+                'Суммарное время сериализации ответов.',
+            ),
+        ):
+            family(
+                name,
+                'counter',
+                help_text,
+                [
+                    f'{name}{{{labels(key)}}} {getattr(stats, attr)!r}'
+                    for key, stats in snapshot
+                ],
+            )
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return (
+        str(value)
+        .replace('\\', '\\\\')
+        .replace('\n', '\\n')
+        .replace('"', '\\"')
+    )
+
+
+registry = MetricsRegistry()
+
+
+class QueryRecorder:
+    """
+    Обёртка connection.execute_wrapper: считает SQL-запросы и их время
+    в метриках текущего запроса (из contextvar, поэтому работает и
+    в потоках, куда запрос передан через asgiref), медленные запросы
+    пишет в лог api.metrics.
+    """
+
+    def __call__(self, execute, sql, params, many, context):
+        request_metrics = _current.get()
+        if request_metrics is None:
+            return execute(sql, params, many, context)
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = perf_counter() - started
+            request_metrics.queries += 1
+            request_metrics.db_time += elapsed
+            threshold = request_metrics.slow_threshold_ms
+            if threshold is not None and elapsed * 1000 >= threshold:
+                logger.warning(
+                    'Медленный SQL-запрос (%.1f мс): %s',
+                    elapsed * 1000,
+                    sql,
+                )
+
+
+query_recorder = QueryRecorder()
+
+
+def install_query_recorder():
+    """
+    Подключает query_recorder к соединениям текущего потока.
+    Соединения потоковые, поэтому вызывается в каждом потоке,
+    где выполняются запросы к БД.
+    """
+    for connection in connections.all():
+        if query_recorder not in connection.execute_wrappers:
+            connection.execute_wrappers.append(query_recorder)
+
+
+@receiver(connection_created)
+def _install_on_connect(sender, connection, **kwargs):
+    if query_recorder not in connection.execute_wrappers:
+        connection.execute_wrappers.append(query_recorder)
+
+
+class TimedSerializerMixin:
+    """
+    Миксин сериализатора: время to_representation добавляется
+    к метрикам текущего запроса. Вложенные сериализаторы
+    не учитываются повторно.
+    """
+
+    def to_representation(self, instance):
+        request_metrics = _current.get()
+        if request_metrics is None or request_metrics._serializing:
+            return super().to_representation(instance)
+        request_metrics._serializing = True
+        started = perf_counter()
+        try:
+            return super().to_representation(instance)
+        finally:
+            request_metrics.serializer_time += perf_counter() - started
+            request_metrics._serializing = False
+
+
+def _endpoint_key(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return (UNRESOLVED_VIEW, '', request.method)
+    return (match.view_name or match._func_path, match.route, request.method)
+
+
+@sync_and_async_middleware
+def metrics_middleware(get_response):
+    """
+    Собирает по каждому эндпоинту время ответа, количество и время
+    SQL-запросов и время сериализации. Порог медленных запросов
+    задаётся настройкой SLOW_QUERY_THRESHOLD_MS (None - не логировать).
+    Работает и под WSGI, и под ASGI без лишних переходов между потоками.
+    """
+
+    def start():
+        request_metrics = RequestMetrics(
+            getattr(settings, 'SLOW_QUERY_THRESHOLD_MS', None)
+        )
+        return request_metrics, _current.set(request_metrics), perf_counter()
+
+    def finish(request, request_metrics, token, started):
+        _current.reset(token)
+        registry.observe(
+            _endpoint_key(request), perf_counter() - started, request_metrics
+        )
+
+    if asyncio.iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            request_metrics, token, started = start()
+            try:
+                return await get_response(request)
+            finally:
+                finish(request, request_metrics, token, started)
+
+    else:
+
+        def middleware(request):
+            install_query_recorder()
+            request_metrics, token, started = start()
+            try:
+                return get_response(request)
+            finally:
+                finish(request, request_metrics, token, started)
+
+    return middleware
+
+
+def _metrics_allowed(request):
+    """
+    Доступ к метрикам: заголовок `Authorization: Bearer <METRICS_TOKEN>`
+    или адрес из METRICS_ALLOWED_IPS. По умолчанию закрыто.
+    """
+    token = settings.METRICS_TOKEN
+    if token:
+        scheme, _, credentials = request.META.get(
+            'HTTP_AUTHORIZATION', ''
+        ).partition(' ')
+        if scheme.lower() == 'bearer' and compare_digest(
+            credentials.encode(), token.encode()
+        ):
+            return True
+    return request.META.get('REMOTE_ADDR') in settings.METRICS_ALLOWED_IPS
+
+
+def metrics_view(request):
+    """Метрики в формате Prometheus, доступ см. _metrics_allowed."""
+    if not _metrics_allowed(request):
+        return HttpResponseForbidden()
+    return HttpResponse(
+        registry.render(), content_type=PROMETHEUS_CONTENT_TYPE
+    )
@@ -0,0 +1,222 @@
+import json
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (
+    BasePagination,
+    CursorPagination,
+    LimitOffsetPagination,
+    _reverse_ordering,
+)
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+PAGINATION_QUERY_PARAM = 'pagination'
+PAGINATION_HEADER = 'HTTP_X_PAGINATION'
+COUNT_QUERY_PARAM = 'count'
+COUNT_HEADER = 'HTTP_X_PAGINATION_COUNT'
+CURSOR_MODE = 'cursor'
+FALSE_VALUES = ('0', 'false', 'no', 'off')
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Курсорная пагинация: следующая страница выбирается по ключу
+    последней записи, а не через OFFSET и без COUNT(*).
+
+    В отличие от CursorPagination DRF, которая сравнивает только первое
+    поле сортировки и пропускает совпадения по нему смещением,
+    позиция курсора - значения всех полей сортировки, а страница
+    выбирается сравнением кортежей, например для ('-pub_date', '-id'):
+    pub_date < p OR (pub_date = p AND id < i). Последнее поле
+    сортировки должно быть уникальным.
+    """
+
+    page_size_query_param = 'limit'
+
+    def _get_position_from_instance(self, instance, ordering):
+        fields = [order.lstrip('-') for order in ordering]
+        if isinstance(instance, dict):
+            values = [instance[field] for field in fields]
+        else:
+            values = [getattr(instance, field) for field in fields]
+        return json.dumps([str(value) for value in values])
+
+    def _position_filter(self, position, reverse):
+        """Условие "после позиции" для кортежа полей сортировки."""
+        try:
+            values = json.loads(position)
+        except ValueError:
+            values = None
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        condition = Q()
+        equal = {}
+        for order, value in zip(self.ordering, values):
+            field = order.lstrip('-')
+            lookup = 'lt' if reverse != order.startswith('-') else 'gt'
+            condition |= Q(**equal, **{f'{field}__{lookup}': value})
+            equal[field] = value
+        return condition
+
+    def _set_positions(self, reverse, offset, current, following):
+        """Соседние страницы и их позиции, как в DRF."""
+        has_current = current is not None or offset > 0
+        has_following = following is not None
+        if reverse:
+            self.has_next, self.has_previous = has_current, has_following
+            self.next_position, self.previous_position = current, following
+        else:
+            self.has_next, self.has_previous = has_following, has_current
+            self.next_position, self.previous_position = following, current
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        CursorPagination.paginate_queryset DRF, в котором фильтр
+        по первому полю заменён сравнением кортежей.
+        """
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            (offset, reverse, current_position) = (0, False, None)
+        else:
+            (offset, reverse, current_position) = self.cursor
+
+        if reverse:
+            queryset = queryset.order_by(*_reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+        if current_position is not None:
+            queryset = queryset.filter(
+                self._position_filter(current_position, reverse)
+            )
+
+        results = list(queryset[offset:offset + self.page_size + 1])
+        self.page = list(results[:self.page_size])
+
+        following_position = None
+        if len(results) > len(self.page):
+            following_position = self._get_position_from_instance(
+                results[-1], self.ordering
+            )
+        if reverse:
+            self.page = list(reversed(self.page))
+        self._set_positions(
+            reverse, offset, current_position, following_position
+        )
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+
+class CursorOrLimitOffsetPagination(LimitOffsetPagination):
+    """
+    Пагинация limit/offset по умолчанию с переключением в курсорный
+    режим через `?pagination=cursor` или заголовок `X-Pagination: cursor`.
+    Подсчёт общего количества отключается через `?count=false`
+    или заголовок `X-Pagination-Count: false`.
+    """
+
+    cursor_ordering = 'id'
+
+    def _use_cursor(self, request):
+        return (
+            request.query_params.get(PAGINATION_QUERY_PARAM)
+            or request.META.get(PAGINATION_HEADER, '')
+        ).lower() == CURSOR_MODE or (
+            KeysetCursorPagination.cursor_query_param in request.query_params
+        )
+
+    def _with_count(self, request):
+        value = request.query_params.get(COUNT_QUERY_PARAM) or (
+            request.META.get(COUNT_HEADER, '')
+        )
+        return value.lower() not in FALSE_VALUES
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_paginator = None
+        if self._use_cursor(request):
+            self.cursor_paginator = KeysetCursorPagination()
+            self.cursor_paginator.ordering = self.cursor_ordering
+            return self.cursor_paginator.paginate_queryset(
+                queryset, request, view
+            )
+        if self._with_count(request):
+            return super().paginate_queryset(queryset, request, view)
+
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+        self.offset = self.get_offset(request)
+        self.count = None
+        self.request = request
+        rows = list(queryset[self.offset:self.offset + self.limit + 1])
+        self.has_next = len(rows) > self.limit
+        return rows[:self.limit]
+
+    def get_next_link(self):
+        if self.count is not None:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(
+            url, self.offset_query_param, self.offset + self.limit
+        )
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return Response(
+            {
+                'count': self.count,
+                'next': self.get_next_link(),
+                'previous': self.get_previous_link(),
+                'results': data,
+            }
+        )
+
+
+class TitlePagination(CursorOrLimitOffsetPagination):
+    """Пагинация произведений, курсор по id."""
+
+    cursor_ordering = 'id'
+
+
+class PubDatePagination(CursorOrLimitOffsetPagination):
+    """Пагинация отзывов и комментариев, курсор по (pub_date, id)."""
+
+    cursor_ordering = ('-pub_date', '-id')
+
+
+class TopPagination(BasePagination):
+    """
+    Первые `limit` записей без COUNT(*) и ссылок на страницы:
+    для топов, где нужна только голова упорядоченного списка.
+    """
+
+    limit_query_param = 'limit'
+    default_limit = 50
+    max_limit = 100
+
+    def get_limit(self, request):
+        try:
+            limit = int(request.query_params[self.limit_query_param])
+        except (KeyError, ValueError):
+            return self.default_limit
+        return min(max(limit, 1), self.max_limit)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return list(queryset[:self.get_limit(request)])
+
+    def get_paginated_response(self, data):
+        return Response(data)
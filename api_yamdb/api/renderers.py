@@ -0,0 +1,130 @@
+import json
+
+from rest_framework.compat import (
+    INDENT_SEPARATORS,
+    LONG_SEPARATORS,
+    SHORT_SEPARATORS,
+)
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson необязателен
+    orjson = None
+
+# orjson 3.9+ вставляет заранее закодированный JSON (Fragment) как есть
+FRAGMENTS = orjson is not None and hasattr(orjson, 'Fragment')
+
+
+def _escape_separators(content):
+    """Экранирует U+2028/U+2029, как JSONRenderer DRF."""
+    return content.replace(b'\xe2\x80\xa8', b'\\u2028').replace(
+        b'\xe2\x80\xa9', b'\\u2029'
+    )
+
+
+def _stdlib_dumps(
+    data,
+    indent=None,
+    separators=SHORT_SEPARATORS,
+    ensure_ascii=False,
+    allow_nan=False,
+):
+    content = json.dumps(
+        data,
+        cls=encoders.JSONEncoder,
+        indent=indent,
+        ensure_ascii=ensure_ascii,
+        allow_nan=allow_nan,
+        separators=separators,
+    ).encode()
+    return _escape_separators(content)
+
+
+def _orjson_dumps(data):
+    """
+    Кодирование orjson. Даты отдаются кодировщику DRF, чтобы формат
+    совпадал с JSONRenderer.
+    """
+    content = orjson.dumps(
+        data,
+        default=encoders.JSONEncoder().default,
+        option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+    )
+    return _escape_separators(content)
+
+
+def fragment(data):
+    """
+    Заранее закодированный фрагмент JSON для вложения в ответ: orjson
+    не кодирует его повторно. Годится только для ответов, которые
+    кодирует orjson (см. renders_fragments).
+    """
+    return orjson.Fragment(_orjson_dumps(data))
+
+
+def dumps(data):
+    """
+    Компактный JSON (bytes) с теми же настройками, что у JSONRenderer
+    DRF по умолчанию. Использует orjson, если он установлен
+    и справляется с данными, иначе стандартный json.
+    """
+    if orjson is not None and api_settings.UNICODE_JSON:
+        try:
+            return _orjson_dumps(data)
+        except orjson.JSONEncodeError:
+            pass
+    return _stdlib_dumps(
+        data,
+        ensure_ascii=not api_settings.UNICODE_JSON,
+        allow_nan=not api_settings.STRICT_JSON,
+    )
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer на orjson со стандартным json в качестве запасного
+    варианта. Вывод совпадает с JSONRenderer DRF; с отступами
+    (браузерный API, `indent` в Accept) всегда работает json.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is None and self.compact and not self.ensure_ascii:
+            return dumps(data)
+        if indent is not None:
+            separators = INDENT_SEPARATORS
+        elif self.compact:
+            separators = SHORT_SEPARATORS
+        else:
+            separators = LONG_SEPARATORS
+        return _stdlib_dumps(
+            data,
+            indent=indent,
+            separators=separators,
+            ensure_ascii=self.ensure_ascii,
+            allow_nan=not self.strict,
+        )
+
+
+def renders_fragments(request):
+    """
+    Вставит ли рендерер ответа на request фрагменты orjson как есть.
+    Браузерному API, ответам с отступами и стандартному json нужны
+    обычные словари.
+    """
+    if not FRAGMENTS or request is None or not api_settings.UNICODE_JSON:
+        return False
+    renderer = getattr(request, 'accepted_renderer', None)
+    return (
+        isinstance(renderer, FastJSONRenderer)
+        and renderer.compact
+        and not renderer.ensure_ascii
+        and renderer.get_indent(
+            request.accepted_media_type, {'request': request}
+        ) is None
+    )
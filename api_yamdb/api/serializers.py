@@ -1,13 +1,42 @@
 from datetime import date
 
 from django.contrib.auth import get_user_model
+from django.utils.functional import cached_property
+from django.utils.encoding import smart_str
 from rest_framework import serializers
 from reviews.models import Category, Comment, Genre, Review, Title
 
+from .cache import NestedObjectCache, get_slug_cache
+from .metrics import TimedSerializerMixin
+from .renderers import renders_fragments
+
 User = get_user_model()
 
 
-class UserSerializer(serializers.ModelSerializer):
+class CachedSlugRelatedField(serializers.SlugRelatedField):
+    """
+    SlugRelatedField для маленьких справочников: slug разрешается
+    через процессный SlugCache, в БД ищутся только slug,
+    которых нет в кеше.
+    """
+
+    def to_internal_value(self, data):
+        if not isinstance(data, str):
+            self.fail('invalid')
+        slug_cache = get_slug_cache(
+            self.get_queryset().model, self.slug_field
+        )
+        obj = slug_cache.get(data)
+        if obj is None:
+            self.fail(
+                'does_not_exist',
+                slug_name=self.slug_field,
+                value=smart_str(data),
+            )
+        return obj
+
+
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Сериализатор для модели пользователя."""
 
     class Meta:
@@ -22,7 +51,7 @@ class UserSerializer(serializers.ModelSerializer):
         )
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Сериализатор для модели категорий."""
 
     class Meta:
@@ -33,7 +62,7 @@ class CategorySerializer(serializers.ModelSerializer):
         )
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Сериализатор для модели жанров."""
 
     class Meta:
@@ -44,7 +73,7 @@ class GenreSerializer(serializers.ModelSerializer):
         )
 
 
-class TitleSerializer(serializers.ModelSerializer):
+class TitleSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Сериализатор для модели произведений."""
 
     category = CategorySerializer(read_only=True)
@@ -80,14 +109,35 @@ class TitleSerializer(serializers.ModelSerializer):
         return value
 
 
-class TitleCreateSerializer(serializers.ModelSerializer):
+class TitleRatingDistributionSerializer(
+    TimedSerializerMixin, serializers.ModelSerializer
+):
+    """Распределение оценок произведения по счётчикам Title."""
+
+    rating = serializers.IntegerField(read_only=True)
+    distribution = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Title
+        fields = (
+            'id',
+            'rating',
+            'reviews_count',
+            'distribution',
+        )
+
+    def get_distribution(self, title):
+        return title.score_distribution()
+
+
+class TitleCreateSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Сериализатор только для создания произведений."""
 
-    category = serializers.SlugRelatedField(
+    category = CachedSlugRelatedField(
         slug_field='slug',
         queryset=Category.objects.all(),
     )
-    genre = serializers.SlugRelatedField(
+    genre = CachedSlugRelatedField(
         slug_field='slug',
         queryset=Genre.objects.all(),
         many=True,
@@ -105,7 +155,17 @@ class TitleCreateSerializer(serializers.ModelSerializer):
         )
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class TitleBatchItemSerializer(TitleCreateSerializer):
+    """
+    Сериализатор одного произведения в пакетном создании.
+    Слаги проверяются во вьюхе сразу для всего пакета.
+    """
+
+    category = serializers.SlugField()
+    genre = serializers.ListField(child=serializers.SlugField())
+
+
+class ReviewSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Сериализатор для модели отзывов."""
 
     author = serializers.SlugRelatedField(
@@ -125,7 +185,7 @@ class ReviewSerializer(serializers.ModelSerializer):
         read_only_fields = ('title',)
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Сериализатор для модели комментариев."""
 
     author = serializers.SlugRelatedField(
@@ -142,3 +202,121 @@ class CommentSerializer(serializers.ModelSerializer):
             'pub_date',
         )
         read_only_fields = ('review',)
+
+
+class FastReadSerializer:
+    """
+    Лёгкий сериализатор списков только для чтения. Строит словари
+    напрямую из строк .values() или из полей модели, без объектов
+    полей DRF, и даёт тот же JSON, что и обычный сериализатор.
+    Подключается во ViewSet через FastListMixin.
+    values_fields - поля для .values(); None - работа с объектами.
+    """
+
+    values_fields = None
+    datetime_field = serializers.DateTimeField()
+
+    def __init__(self, instance=None, many=False, context=None, **kwargs):
+        self.instance = instance
+        self.many = many
+        self.context = context or {}
+
+    @classmethod
+    def prepare_queryset(cls, queryset):
+        if cls.values_fields is None:
+            return queryset
+        return queryset.values(*cls.values_fields)
+
+    def to_row(self, obj):
+        raise NotImplementedError
+
+    def to_representation(self, instance):
+        if self.many:
+            to_row = self.to_row
+            return [to_row(obj) for obj in instance]
+        return self.to_row(instance)
+
+    @cached_property
+    def data(self):
+        return self.to_representation(self.instance)
+
+
+class TitleFastSerializer(TimedSerializerMixin, FastReadSerializer):
+    """
+    Быстрый вариант TitleSerializer. Жанрам нужен prefetch,
+    поэтому работает с объектами, а не с .values(). Категория
+    и жанры берутся готовыми из NestedObjectCache, для ответа через
+    orjson - уже закодированными фрагментами JSON.
+    """
+
+    category_objects = NestedObjectCache(Category, ('name', 'slug'))
+    genre_objects = NestedObjectCache(Genre, ('name', 'slug'))
+
+    def to_representation(self, instance):
+        fragments = self.context.get('json_fragments')
+        if fragments is None:
+            fragments = renders_fragments(self.context.get('request'))
+        self._category = self.category_objects.getter(fragments)
+        self._genre = self.genre_objects.getter(fragments)
+        return super().to_representation(instance)
+
+    def to_row(self, title):
+        category = title.category
+        rating = title.rating
+        genre = self._genre
+        return {
+            'id': title.id,
+            'name': title.name,
+            'year': title.year,
+            'rating': None if rating is None else int(rating),
+            'description': title.description,
+            'genre': [genre(item) for item in title.genre.all()],
+            'category': None if category is None else self._category(
+                category
+            ),
+        }
+
+
+class TitleRankingSerializer(TitleFastSerializer):
+    """
+    Строка топа: произведение в формате TitleSerializer
+    и его оценка в топе (аннотация ranking_score).
+    """
+
+    def to_row(self, title):
+        row = super().to_row(title)
+        row['score'] = round(title.ranking_score, 3)
+        return row
+
+
+class ReviewFastSerializer(TimedSerializerMixin, FastReadSerializer):
+    """Быстрый вариант ReviewSerializer по строкам .values()."""
+
+    values_fields = ('id', 'text', 'author__username', 'score', 'pub_date')
+
+    def to_row(self, row):
+        return {
+            'id': row['id'],
+            'text': row['text'],
+            'author': row['author__username'],
+            'score': row['score'],
+            'pub_date': self.datetime_field.to_representation(
+                row['pub_date']
+            ),
+        }
+
+
+class CommentFastSerializer(TimedSerializerMixin, FastReadSerializer):
+    """Быстрый вариант CommentSerializer по строкам .values()."""
+
+    values_fields = ('id', 'text', 'author__username', 'pub_date')
+
+    def to_row(self, row):
+        return {
+            'id': row['id'],
+            'text': row['text'],
+            'author': row['author__username'],
+            'pub_date': self.datetime_field.to_representation(
+                row['pub_date']
+            ),
+        }
@@ -0,0 +1,152 @@
+from django.db import transaction
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+)
+from django.dispatch import receiver
+from reviews.models import Category, Comment, Genre, Review, Title, User
+from reviews.signals import deleting_ids
+
+from .authentication import remember_user_state, revoke_user
+from .cache import (
+    TITLES_NAMESPACE,
+    USERS_NAMESPACE,
+    bump_versions_on_commit,
+    comments_namespace,
+    reviews_namespace,
+    title_namespace,
+)
+
+# поля, которые не попадают в ответы API: их запись не сбрасывает кеш
+USER_PRIVATE_FIELDS = frozenset({'code', 'password', 'last_login'})
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def bump_reference_version(sender, **kwargs):
+    """
+    Сбрасывает кеши справочника (списки, SlugCache, NestedObjectCache)
+    при любом изменении категории или жанра: через API, админку
+    или shell. bulk_create сигналов не шлёт, поэтому команды
+    массовой загрузки увеличивают версии сами.
+    """
+    bump_versions_on_commit(sender._meta.label_lower)
+
+
+@receiver(post_save, sender=User)
+def remember_saved_user(sender, instance, **kwargs):
+    """
+    Обновляет роль и статус пользователя для JWT-аутентификации
+    после фиксации транзакции, откуда бы ни пришло изменение.
+    """
+    transaction.on_commit(lambda: remember_user_state(instance))
+
+
+@receiver(post_delete, sender=User)
+def revoke_deleted_user(sender, instance, **kwargs):
+    """Отзывает токены удалённого пользователя."""
+    user_id = instance.pk
+    transaction.on_commit(lambda: revoke_user(user_id))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def bump_user_version(sender, update_fields=None, **kwargs):
+    """
+    Имена авторов входят в ответы с отзывами и комментариями, поэтому
+    любое изменение пользователя сбрасывает версию пользователей.
+    Запись одного кода подтверждения кеш не трогает.
+    """
+    if update_fields and USER_PRIVATE_FIELDS.issuperset(update_fields):
+        return
+    bump_versions_on_commit(USERS_NAMESPACE)
+
+
+@receiver(post_save, sender=Title)
+def bump_saved_title_versions(sender, instance, **kwargs):
+    bump_versions_on_commit(TITLES_NAMESPACE, title_namespace(instance.pk))
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def bump_title_genre_versions(sender, instance, action, pk_set, **kwargs):
+    """Жанры произведения меняются отдельно от его сохранения."""
+    if not action.startswith('post_'):
+        return
+    if isinstance(instance, Title):
+        title_ids = (instance.pk,)
+    else:
+        # со стороны жанра post_clear не передаёт pk_set
+        title_ids = pk_set or ()
+    bump_versions_on_commit(
+        TITLES_NAMESPACE, *(title_namespace(pk) for pk in title_ids)
+    )
+
+
+@receiver(post_delete, sender=Title)
+def bump_deleted_title_versions(sender, instance, **kwargs):
+    bump_versions_on_commit(
+        TITLES_NAMESPACE,
+        title_namespace(instance.pk),
+        reviews_namespace(instance.pk),
+    )
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def bump_review_versions(sender, instance, **kwargs):
+    """
+    Отзыв меняет рейтинг, поэтому сбрасываются и версии произведения.
+    Каскад от произведения или автора пропускается: версии сбрасывают
+    их собственные сигналы, по разу на произведение.
+    """
+    if (
+        instance.title_id in deleting_ids(Title)
+        or instance.author_id in deleting_ids(User)
+    ):
+        return
+    bump_versions_on_commit(
+        reviews_namespace(instance.title_id),
+        title_namespace(instance.title_id),
+        comments_namespace(instance.pk),
+        TITLES_NAMESPACE,
+    )
+
+
+@receiver(pre_delete, sender=User)
+def bump_author_title_versions(sender, instance, **kwargs):
+    """
+    Удаление автора каскадно удаляет его отзывы: версии затронутых
+    произведений сбрасываются по разу на каждое.
+    """
+    title_ids = set(
+        Review.objects.filter(author_id=instance.pk)
+        .order_by()
+        .values_list('title_id', flat=True)
+        .distinct()
+    )
+    if not title_ids:
+        return
+    bump_versions_on_commit(
+        TITLES_NAMESPACE,
+        *(title_namespace(pk) for pk in title_ids),
+        *(reviews_namespace(pk) for pk in title_ids),
+    )
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def bump_comment_versions(sender, instance, **kwargs):
+    """
+    Комментарии, удалённые вместе с отзывом или автором, версии
+    не сбрасывают: это делают сигналы отзыва и пользователя.
+    """
+    if (
+        instance.review_id in deleting_ids(Review)
+        or instance.author_id in deleting_ids(User)
+    ):
+        return
+    bump_versions_on_commit(comments_namespace(instance.review_id))
@@ -0,0 +1,139 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+THROTTLE_KEY_TEMPLATE = 'throttle:{scope}:{ident}:{window}'
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """
+    Ограничение частоты запросов скользящим окном: число запросов
+    в текущем окне складывается с долей предыдущего окна, ещё
+    попадающей в последние duration секунд. Счётчики окон хранятся
+    в кеше THROTTLE_CACHE и увеличиваются атомарно (add/incr), поэтому
+    при общем кеше лимит действует на все процессы. Отклонённые
+    запросы не увеличивают счётчик и стоят одного обращения к кешу.
+    Проверка идёт в APIView.initial, до обращения к БД.
+    methods - методы, к которым применяется лимит (None - все).
+    """
+
+    methods = None
+
+    @property
+    def cache(self):
+        return caches[settings.THROTTLE_CACHE]
+
+    def get_rate(self):
+        # ставки читаются при каждом запросе, чтобы работал override_settings
+        try:
+            return api_settings.DEFAULT_THROTTLE_RATES[self.scope]
+        except KeyError:
+            raise ImproperlyConfigured(
+                f'Не задан DEFAULT_THROTTLE_RATES для scope {self.scope}'
+            )
+
+    def get_ident_key(self, request):
+        """Ключ клиента: id пользователя или IP для анонимов."""
+        if request.user and request.user.is_authenticated:
+            return f'user:{request.user.pk}'
+        return f'ip:{self.get_ident(request)}'
+
+    def get_cache_key(self, request, view):
+        if self.methods is not None and request.method not in self.methods:
+            return None
+        return self.get_ident_key(request)
+
+    def _window_key(self, window):
+        return THROTTLE_KEY_TEMPLATE.format(
+            scope=self.scope, ident=self.key, window=window
+        )
+
+    def _estimate(self, previous, current):
+        return previous * (1 - self.elapsed) + current
+
+    def _increment(self, key):
+        # окно хранится два периода: оно ещё нужно как предыдущее
+        timeout = self.duration * 2
+        if self.cache.add(key, 1, timeout=timeout):
+            return 1
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            # ключ истёк между add и incr
+            self.cache.add(key, 1, timeout=timeout)
+            return 1
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        now = self.timer()
+        window, offset = divmod(now, self.duration)
+        window = int(window)
+        self.elapsed = offset / self.duration
+        previous_key = self._window_key(window - 1)
+        current_key = self._window_key(window)
+        counters = self.cache.get_many([previous_key, current_key])
+        self.previous = counters.get(previous_key, 0)
+        self.current = counters.get(current_key, 0)
+        if self._estimate(self.previous, self.current) >= self.num_requests:
+            return False
+        self.current = self._increment(current_key)
+        # параллельные запросы других процессов уже могли занять лимит
+        return self._estimate(self.previous, self.current) <= (
+            self.num_requests
+        )
+
+    def wait(self):
+        """Через сколько секунд в окне освободится место для запроса."""
+        remaining = (1 - self.elapsed) * self.duration
+        room = self.num_requests - self.current - 1
+        if room < 0 or not self.previous:
+            return remaining
+        needed = 1 - room / self.previous
+        return max((needed - self.elapsed) * self.duration, 0)
+
+
+class SignupThrottle(SlidingWindowThrottle):
+    """Регистрация и повторная отправка кода: лимит на IP."""
+
+    scope = 'signup'
+
+    def get_ident_key(self, request):
+        return f'ip:{self.get_ident(request)}'
+
+
+class TokenThrottle(SignupThrottle):
+    """Получение токена: лимит на IP."""
+
+    scope = 'token'
+
+
+class ReviewWriteThrottle(SlidingWindowThrottle):
+    """Создание, изменение и удаление отзывов: лимит на пользователя."""
+
+    scope = 'review-write'
+    methods = ('POST', 'PUT', 'PATCH', 'DELETE')
+
+
+class CommentWriteThrottle(ReviewWriteThrottle):
+    """Создание, изменение и удаление комментариев."""
+
+    scope = 'comment-write'
+
+
+class AnonymousReadThrottle(SlidingWindowThrottle):
+    """Чтение анонимами: лимит на IP, авторизованных не ограничивает."""
+
+    scope = 'anonymous-read'
+    methods = SAFE_METHODS
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return None
+        return super().get_cache_key(request, view)
@@ -1,5 +1,7 @@
+from django.conf import settings
 from django.urls import include, path
 
+from .async_views import async_read
 from .views import (
     CategoryViewSet,
     CommentViewSet,
@@ -7,6 +9,11 @@ from .views import (
     GenreViewSet,
     ObtainTokenView,
     ReviewViewSet,
+    TitleBatchCreateView,
+    TitleExportView,
+    TitleRatingDistributionViewSet,
+    TitleTopViewSet,
+    TitleTrendingViewSet,
     TitleViewSetDetail,
     TitleViewSetListCreate,
     UserViewSet,
@@ -14,6 +21,12 @@ from .views import (
 
 app_name = 'api_v1'
 
+
+def hot_read(view):
+    """Горячие эндпоинты чтения под ASGI отдаются асинхронно."""
+    return async_read(view) if settings.ASYNC_READ_VIEWS else view
+
+
 users = [
     path('auth/signup/', CreateUserView.as_view()),
     path('auth/token/', ObtainTokenView.as_view()),
@@ -92,11 +105,13 @@ genre = [
 comment = [
     path(
         'titles/<int:title_id>/reviews/<int:review_id>/comments/',
-        CommentViewSet.as_view(
-            {
-                'get': 'list',
-                'post': 'create',
-            }
+        hot_read(
+            CommentViewSet.as_view(
+                {
+                    'get': 'list',
+                    'post': 'create',
+                }
+            )
         ),
     ),
     path(
@@ -116,11 +131,13 @@ comment = [
 review = [
     path(
         'titles/<int:title_id>/reviews/',
-        ReviewViewSet.as_view(
-            {
-                'get': 'list',
-                'post': 'create',
-            }
+        hot_read(
+            ReviewViewSet.as_view(
+                {
+                    'get': 'list',
+                    'post': 'create',
+                }
+            )
         ),
     ),
     path(
@@ -136,23 +153,35 @@ review = [
 ]
 
 title = [
+    path('titles/batch/', TitleBatchCreateView.as_view()),
+    path('titles/export/', TitleExportView.as_view()),
+    path('titles/top/', TitleTopViewSet.as_view({'get': 'list'})),
+    path('titles/trending/', TitleTrendingViewSet.as_view({'get': 'list'})),
+    path(
+        'titles/<int:title_id>/rating-distribution/',
+        TitleRatingDistributionViewSet.as_view({'get': 'retrieve'}),
+    ),
     path(
         'titles/',
-        TitleViewSetListCreate.as_view(
-            {
-                'get': 'list',
-                'post': 'create',
-            }
+        hot_read(
+            TitleViewSetListCreate.as_view(
+                {
+                    'get': 'list',
+                    'post': 'create',
+                }
+            )
         ),
     ),
     path(
         'titles/<int:title_id>/',
-        TitleViewSetDetail.as_view(
-            {
-                'get': 'retrieve',
-                'patch': 'partial_update',
-                'delete': 'destroy',
-            }
+        hot_read(
+            TitleViewSetDetail.as_view(
+                {
+                    'get': 'retrieve',
+                    'patch': 'partial_update',
+                    'delete': 'destroy',
+                }
+            )
         ),
     ),
 ]
@@ -1,8 +1,12 @@
+import csv
+import json
+from itertools import islice
 from secrets import token_hex
 
-from django.db.models import Avg
 from django.contrib.auth import get_user_model
-from django.core.mail import send_mail
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F, Max
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import (
@@ -14,23 +18,60 @@ from rest_framework import (
     viewsets,
 )
 from rest_framework.exceptions import ValidationError
-from rest_framework.filters import SearchFilter
-from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.relations import SlugRelatedField
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
-from reviews.models import Category, Genre, Review, Title
-
-from .filters import TitleFilter
+from reviews.models import (
+    SCORES,
+    Category,
+    Comment,
+    Genre,
+    OutboxEmail,
+    Review,
+    Title,
+    score_count_field,
+)
+from reviews.search import get_search_backend
+
+from .authentication import RoleAccessToken
+from .cache import (
+    CATEGORIES_NAMESPACE,
+    GENRES_NAMESPACE,
+    RANKINGS_NAMESPACE,
+    TITLES_NAMESPACE,
+    USERS_NAMESPACE,
+    CachedListMixin,
+    ConditionalGetMixin,
+    bump_versions_on_commit,
+    comments_namespace,
+    get_slug_cache,
+    reviews_namespace,
+    title_namespace,
+)
+from .filters import TitleFilter, TitleRankingFilter, TitleSearchFilter
+from .pagination import PubDatePagination, TitlePagination, TopPagination
 from .permissions import AdminOnlyExceptUpdateDestroy, IsOwnerOrModerOrAdmin
 from .serializers import (
     CategorySerializer,
+    CommentFastSerializer,
     CommentSerializer,
     GenreSerializer,
+    ReviewFastSerializer,
     ReviewSerializer,
+    TitleBatchItemSerializer,
     TitleCreateSerializer,
+    TitleFastSerializer,
+    TitleRankingSerializer,
+    TitleRatingDistributionSerializer,
     TitleSerializer,
     UserSerializer,
 )
+from .throttling import (
+    AnonymousReadThrottle,
+    CommentWriteThrottle,
+    ReviewWriteThrottle,
+    SignupThrottle,
+    TokenThrottle,
+)
 from .utils import (
     check_admin_permission,
     check_authentication,
@@ -40,16 +81,33 @@ from .utils import (
 User = get_user_model()
 
 
+def get_title_queryset():
+    """
+    Queryset произведений для чтения: категория подтягивается JOIN-ом,
+    жанры одним дополнительным запросом, рейтинг хранится в самой модели.
+    """
+    return (
+        Title.objects.select_related('category')
+        .prefetch_related('genre')
+        .order_by('id')
+    )
+
+
 class CreateUserView(views.APIView):
     """Класс для регистрации пользователей в проекте."""
 
+    throttle_classes = (SignupThrottle,)
+
     def _manage_code(self, username, email):
-        """Отправка кода подтверждения и привязка его к пользователю."""
+        """
+        Привязка кода подтверждения к пользователю и постановка
+        письма с кодом в очередь на отправку.
+        """
         code = token_hex(16)
         user = User.objects.get(username=username, email=email)
         user.code = code
-        user.save()
-        send_mail('Регистрация на YamDB', f'{code}', None, [email])
+        user.save(update_fields=['code'])
+        OutboxEmail.enqueue('Регистрация на YamDB', f'{code}', email)
 
     def post(self, request):
         """Логика регистрации нового пользователя."""
@@ -78,6 +136,8 @@ class CreateUserView(views.APIView):
 class ObtainTokenView(views.APIView):
     """Класс для получения JWT токена."""
 
+    throttle_classes = (TokenThrottle,)
+
     def post(self, request):
         """Логика получения токена."""
         username = request.data.get('username')
@@ -89,10 +149,10 @@ class ObtainTokenView(views.APIView):
         if obj.code != code:
             return Response(status=status.HTTP_400_BAD_REQUEST)
 
-        token = RefreshToken.for_user(obj)
+        token = RoleAccessToken.for_user(obj)
         return Response(
             data={
-                'token': str(token.access_token),
+                'token': str(token),
             },
         )
 
@@ -139,8 +199,11 @@ class UserViewSet(viewsets.ModelViewSet):
         return super().destroy(request, username)
 
 
-class CategoryGenreBaseViewSet(viewsets.ModelViewSet):
-    """Базовый ViewSet для категорий и жанров."""
+class CategoryGenreBaseViewSet(CachedListMixin, viewsets.ModelViewSet):
+    """
+    Базовый ViewSet для категорий и жанров.
+    Списки кешируются до изменения справочника.
+    """
 
     filter_backends = (filters.SearchFilter,)
     search_fields = ('name',)
@@ -189,31 +252,112 @@ class GenreViewSet(CategoryGenreBaseViewSet):
     search_fields = ('name',)
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class MemoizedObjectMixin:
+    """
+    Запоминает объект, найденный get_object, до конца запроса:
+    проверка автора, права и сам миксин DRF используют один объект.
+    """
+
+    _object = None
+
+    def get_object(self):
+        if self._object is None:
+            self._object = super().get_object()
+        return self._object
+
+
+class FastListMixin:
+    """
+    Включает для GET-списка лёгкий сериализатор fast_list_serializer_class
+    (наследник FastReadSerializer): queryset после фильтров готовится
+    им же, например переводится в .values(). None - обычный путь DRF.
+    """
+
+    fast_list_serializer_class = None
+
+    def _use_fast_list(self):
+        return (
+            self.fast_list_serializer_class is not None
+            and self.action == 'list'
+            and self.request.method in ('GET', 'HEAD')
+        )
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self._use_fast_list():
+            return self.fast_list_serializer_class.prepare_queryset(queryset)
+        return queryset
+
+    def get_serializer_class(self):
+        if self._use_fast_list():
+            return self.fast_list_serializer_class
+        return super().get_serializer_class()
+
+
+class ReviewViewSet(
+    ConditionalGetMixin,
+    FastListMixin,
+    MemoizedObjectMixin,
+    viewsets.ModelViewSet,
+):
     """ViewSet для отзывов."""
 
     serializer_class = ReviewSerializer
+    fast_list_serializer_class = ReviewFastSerializer
+    throttle_classes = (AnonymousReadThrottle, ReviewWriteThrottle)
     lookup_url_kwarg = 'review_id'
+    pagination_class = PubDatePagination
+
+    _title = None
 
     def _get_special_title(self):
-        """Логика получения произведения."""
-        return get_object_or_404(Title, pk=self.kwargs.get('title_id'))
+        """Логика получения произведения (один раз за запрос)."""
+        if self._title is None:
+            self._title = get_object_or_404(
+                Title, pk=self.kwargs.get('title_id')
+            )
+        return self._title
 
     def get_queryset(self):
-        """Логика получения отзывов."""
-        return self._get_special_title().reviews.all()
+        """
+        Логика получения отзывов. Отдельный запрос произведения нужен
+        только списку, чтобы вернуть 404; отзыв ищется сразу по title_id.
+        Имя автора подтягивается в том же запросе, без лишних колонок.
+        """
+        if self.action == 'list':
+            self._get_special_title()
+        return (
+            Review.objects.filter(title_id=self.kwargs.get('title_id'))
+            .select_related('author')
+            .only(
+                'id',
+                'text',
+                'score',
+                'pub_date',
+                'title_id',
+                'author',
+                'author__username',
+            )
+        )
+
+    def get_etag_namespaces(self):
+        return (reviews_namespace(self.kwargs['title_id']), USERS_NAMESPACE)
 
     def perform_create(self, serializer):
         """
-        Логика создания отзыва.
+        Логика создания отзыва. Рейтинг произведения и версии кеша
+        обновляют сигналы сохранения отзыва.
         """
         title = self._get_special_title()
-        if title.reviews.filter(author=self.request.user).exists():
+        try:
+            with transaction.atomic():
+                serializer.save(author=self.request.user, title=title)
+        except IntegrityError:
+            # повторный отзыв отсекает ограничение unique_review
             raise ValidationError(
                 detail='Вы уже имеете отзыв на это произведение!',
                 code=status.HTTP_400_BAD_REQUEST,
             )
-        serializer.save(author=self.request.user, title=title)
 
     def create(self, request, *args, **kwargs):
         """
@@ -258,20 +402,66 @@ class ReviewViewSet(viewsets.ModelViewSet):
         return super().destroy(request, *args, **kwargs)
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(
+    ConditionalGetMixin,
+    FastListMixin,
+    MemoizedObjectMixin,
+    viewsets.ModelViewSet,
+):
     """ViewSet для комментариев."""
 
     serializer_class = CommentSerializer
+    fast_list_serializer_class = CommentFastSerializer
+    throttle_classes = (AnonymousReadThrottle, CommentWriteThrottle)
     lookup_url_kwarg = 'comment_id'
+    pagination_class = PubDatePagination
     permission_classes = (IsOwnerOrModerOrAdmin,)
 
+    _review = None
+
     def _get_special_review(self):
-        """Логика получения отзыва."""
-        return get_object_or_404(Review, pk=self.kwargs.get('review_id'))
+        """
+        Логика получения отзыва (один раз за запрос).
+        Отзыв должен относиться к произведению из URL.
+        """
+        if self._review is None:
+            self._review = get_object_or_404(
+                Review,
+                pk=self.kwargs.get('review_id'),
+                title_id=self.kwargs.get('title_id'),
+            )
+        return self._review
 
     def get_queryset(self):
-        """Логика получения комментариев."""
-        return self._get_special_review().comments.all()
+        """
+        Логика получения комментариев. Принадлежность отзыва
+        произведению проверяется в том же запросе через JOIN,
+        туда же подтягивается имя автора.
+        """
+        if self.action == 'list':
+            self._get_special_review()
+        return (
+            Comment.objects.filter(
+                review_id=self.kwargs.get('review_id'),
+                review__title_id=self.kwargs.get('title_id'),
+            )
+            .select_related('author')
+            .only(
+                'id',
+                'text',
+                'pub_date',
+                'review_id',
+                'author',
+                'author__username',
+            )
+        )
+
+    def get_etag_namespaces(self):
+        return (
+            comments_namespace(self.kwargs['review_id']),
+            reviews_namespace(self.kwargs['title_id']),
+            USERS_NAMESPACE,
+        )
 
     def perform_create(self, serializer):
         """Логика создания комментария."""
@@ -310,6 +500,7 @@ class CommentViewSet(viewsets.ModelViewSet):
 
 
 class TitleViewSetDetail(
+    ConditionalGetMixin,
     mixins.RetrieveModelMixin,
     mixins.DestroyModelMixin,
     mixins.UpdateModelMixin,
@@ -319,9 +510,18 @@ class TitleViewSetDetail(
     и для изменения произведения.
     """
 
-    queryset = Title.objects.annotate(rating=Avg('reviews__score'))
     lookup_url_kwarg = 'title_id'
 
+    def get_queryset(self):
+        return get_title_queryset()
+
+    def get_etag_namespaces(self):
+        return (
+            title_namespace(self.kwargs['title_id']),
+            CATEGORIES_NAMESPACE,
+            GENRES_NAMESPACE,
+        )
+
     def update(self, request, *args, **kwargs):
         if kwargs.get('partial') is False:
             return Response(
@@ -343,7 +543,83 @@ class TitleViewSetDetail(
         return TitleCreateSerializer
 
 
+class TitleRatingDistributionViewSet(
+    ConditionalGetMixin,
+    mixins.RetrieveModelMixin,
+    viewsets.GenericViewSet,
+):
+    """
+    Распределение оценок произведения. Отдаётся из счётчиков
+    score_N_count самого произведения одним запросом по первичному
+    ключу, отзывы не читаются.
+    """
+
+    serializer_class = TitleRatingDistributionSerializer
+    lookup_url_kwarg = 'title_id'
+
+    def get_queryset(self):
+        return Title.objects.only(
+            'id',
+            'rating',
+            'reviews_count',
+            *(score_count_field(score) for score in SCORES),
+        )
+
+    def get_etag_namespaces(self):
+        return (title_namespace(self.kwargs['title_id']),)
+
+
+class TitleLeaderboardViewSet(
+    ConditionalGetMixin,
+    mixins.ListModelMixin,
+    viewsets.GenericViewSet,
+):
+    """
+    Топ произведений по материализованной таблице TitleRanking
+    (refresh_title_rankings): на запросе нет агрегации по отзывам,
+    только JOIN и сортировка по готовой оценке score_field.
+    Фильтры по категории и жанру, размер - `?limit=`.
+    """
+
+    serializer_class = TitleRankingSerializer
+    pagination_class = TopPagination
+    filter_backends = (DjangoFilterBackend,)
+    filterset_class = TitleRankingFilter
+    score_field = None
+
+    def get_queryset(self):
+        score = f'ranking__{self.score_field}'
+        return (
+            get_title_queryset()
+            .filter(**{f'{score}__isnull': False})
+            .annotate(ranking_score=F(score))
+            .order_by(f'-{score}', 'id')
+        )
+
+    def get_etag_namespaces(self):
+        return (
+            RANKINGS_NAMESPACE,
+            TITLES_NAMESPACE,
+            CATEGORIES_NAMESPACE,
+            GENRES_NAMESPACE,
+        )
+
+
+class TitleTopViewSet(TitleLeaderboardViewSet):
+    """Лучшие произведения по байесовскому среднему всех оценок."""
+
+    score_field = 'top_score'
+
+
+class TitleTrendingViewSet(TitleLeaderboardViewSet):
+    """Лучшие произведения по оценкам за последние дни."""
+
+    score_field = 'trending_score'
+
+
 class TitleViewSetListCreate(
+    ConditionalGetMixin,
+    FastListMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     viewsets.GenericViewSet,
@@ -352,15 +628,20 @@ class TitleViewSetListCreate(
     и для создания произведений.
     """
 
-    queryset = Title.objects.all()
     permissions = (AdminOnlyExceptUpdateDestroy,)
-    pagination_class = LimitOffsetPagination
+    pagination_class = TitlePagination
+    fast_list_serializer_class = TitleFastSerializer
     filter_backends = (
         DjangoFilterBackend,
-        SearchFilter,
+        TitleSearchFilter,
     )
     filterset_class = TitleFilter
-    search_fields = ('category', 'genre', 'name', 'year')
+
+    def get_queryset(self):
+        return get_title_queryset()
+
+    def get_etag_namespaces(self):
+        return (TITLES_NAMESPACE, CATEGORIES_NAMESPACE, GENRES_NAMESPACE)
 
     def get_serializer_class(self):
         """Метод определяющий какой сериализатор использовать."""
@@ -373,3 +654,267 @@ class TitleViewSetListCreate(
         if resp_error := check_admin_permission(request):
             return resp_error
         return super().create(request, *args, **kwargs)
+
+
+class TitleBatchCreateView(views.APIView):
+    """
+    Пакетное создание произведений одним запросом.
+    Слаги категорий и жанров разрешаются через кеш слагов,
+    произведения и их связи с жанрами вставляются через bulk_create
+    в одной транзакции. Ошибки возвращаются по каждому элементу,
+    корректные элементы создаются. Только для администраторов.
+    """
+
+    max_batch_size = 10000
+
+    @staticmethod
+    def _does_not_exist(value):
+        message = SlugRelatedField.default_error_messages['does_not_exist']
+        return message.format(slug_name='slug', value=value)
+
+    @staticmethod
+    def _resolve(model, slugs):
+        """Разрешает slug в объекты через SlugCache: {slug: объект}."""
+        return get_slug_cache(model).get_many(slugs)
+
+    def _validate(self, items):
+        """
+        Проверяет элементы пакета.
+        :return: (список (индекс, данные), список ошибок, категории, жанры)
+        """
+        valid, errors = [], []
+        for index, item in enumerate(items):
+            serializer = TitleBatchItemSerializer(data=item)
+            if serializer.is_valid():
+                valid.append((index, serializer.validated_data))
+            else:
+                errors.append({'index': index, 'errors': serializer.errors})
+        categories = self._resolve(
+            Category, {data['category'] for _, data in valid}
+        )
+        genres = self._resolve(
+            Genre, {slug for _, data in valid for slug in data['genre']}
+        )
+        resolved = []
+        for index, data in valid:
+            item_errors = {}
+            if data['category'] not in categories:
+                item_errors['category'] = [
+                    self._does_not_exist(data['category'])
+                ]
+            missing = [slug for slug in data['genre'] if slug not in genres]
+            if missing:
+                item_errors['genre'] = [
+                    self._does_not_exist(slug) for slug in missing
+                ]
+            if item_errors:
+                errors.append({'index': index, 'errors': item_errors})
+            else:
+                resolved.append((index, data))
+        errors.sort(key=lambda error: error['index'])
+        return resolved, errors, categories, genres
+
+    @staticmethod
+    def _bulk_insert(titles):
+        """
+        Вставляет произведения и проставляет им id. Если СУБД не умеет
+        возвращать id из bulk insert (SQLite), id назначаются заранее
+        от Max(id) под блокировкой записи, иначе параллельные пакеты
+        получили бы одинаковые id. Вызывается внутри транзакции.
+        """
+        if not connection.features.can_return_rows_from_bulk_insert:
+            with connection.cursor() as cursor:
+                # пустой UPDATE берёт блокировку записи SQLite до конца
+                # транзакции: остальные пакеты ждут её здесь
+                cursor.execute(
+                    'UPDATE {table} SET id = id WHERE 0'.format(
+                        table=connection.ops.quote_name(Title._meta.db_table)
+                    )
+                )
+            start = (Title.objects.aggregate(max_id=Max('id'))['max_id'] or 0)
+            for offset, title in enumerate(titles, 1):
+                title.id = start + offset
+        return Title.objects.bulk_create(titles)
+
+    def post(self, request):
+        """Логика пакетного создания произведений."""
+        if resp_error := check_admin_permission(request):
+            return resp_error
+        items = request.data
+        if not isinstance(items, list) or not items:
+            return Response(
+                {'detail': 'Ожидается непустой список произведений.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(items) > self.max_batch_size:
+            return Response(
+                {'detail': f'Не больше {self.max_batch_size} за запрос.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        resolved, errors, categories, genres = self._validate(items)
+        created = []
+        if resolved:
+            titles = [
+                Title(
+                    name=data['name'],
+                    year=data['year'],
+                    description=data.get('description'),
+                    category=categories[data['category']],
+                )
+                for _, data in resolved
+            ]
+            try:
+                with transaction.atomic():
+                    titles = self._bulk_insert(titles)
+                    Title.genre.through.objects.bulk_create(
+                        Title.genre.through(
+                            title_id=title.pk, genre_id=genres[slug].pk
+                        )
+                        for title, (_, data) in zip(titles, resolved)
+                        for slug in dict.fromkeys(data['genre'])
+                    )
+                    get_search_backend().index_many(titles)
+            except IntegrityError:
+                # например, справочник удалили между проверкой и вставкой
+                return Response(
+                    {'detail': 'Конфликт при записи, повторите запрос.'},
+                    status=status.HTTP_409_CONFLICT,
+                )
+            bump_versions_on_commit(TITLES_NAMESPACE)
+            created = [
+                {
+                    'index': index,
+                    'id': title.pk,
+                    'name': title.name,
+                    'year': title.year,
+                    'description': title.description,
+                    'genre': list(dict.fromkeys(data['genre'])),
+                    'category': data['category'],
+                }
+                for title, (index, data) in zip(titles, resolved)
+            ]
+        return Response(
+            {'created': created, 'errors': errors},
+            status=(
+                status.HTTP_201_CREATED
+                if created
+                else status.HTTP_400_BAD_REQUEST
+            ),
+        )
+
+
+class Echo:
+    """Псевдо-буфер для csv.writer: возвращает записанную строку."""
+
+    def write(self, value):
+        return value
+
+
+class TitleExportView(views.APIView):
+    """
+    Выгрузка всех произведений с категорией, жанрами и рейтингом
+    потоком NDJSON или CSV. Произведения читаются курсором пачками,
+    жанры подгружаются одним запросом на пачку, поэтому память
+    не зависит от размера каталога. Только для администраторов.
+    """
+
+    chunk_size = 2000
+    formats = ('ndjson', 'csv')
+    csv_header = (
+        'id',
+        'name',
+        'year',
+        'rating',
+        'description',
+        'category',
+        'genre',
+    )
+
+    def _iter_titles(self):
+        """Отдаёт словари произведений в формате TitleSerializer."""
+        titles = (
+            Title.objects.order_by('id')
+            .values(
+                'id',
+                'name',
+                'year',
+                'rating',
+                'description',
+                'category__name',
+                'category__slug',
+            )
+            .iterator(chunk_size=self.chunk_size)
+        )
+        while True:
+            chunk = list(islice(titles, self.chunk_size))
+            if not chunk:
+                return
+            genres = {}
+            links = (
+                Title.genre.through.objects.filter(
+                    title_id__in=[title['id'] for title in chunk]
+                )
+                .order_by('genre_id')
+                .values_list('title_id', 'genre__name', 'genre__slug')
+            )
+            for title_id, name, slug in links:
+                genres.setdefault(title_id, []).append(
+                    {'name': name, 'slug': slug}
+                )
+            for title in chunk:
+                category_slug = title.pop('category__slug')
+                category_name = title.pop('category__name')
+                rating = title['rating']
+                title['rating'] = None if rating is None else int(rating)
+                title['genre'] = genres.get(title['id'], [])
+                title['category'] = (
+                    None
+                    if category_slug is None
+                    else {'name': category_name, 'slug': category_slug}
+                )
+                yield title
+
+    def _ndjson_rows(self):
+        for title in self._iter_titles():
+            yield json.dumps(title, ensure_ascii=False) + '\n'
+
+    def _csv_rows(self):
+        writer = csv.writer(Echo())
+        yield writer.writerow(self.csv_header)
+        for title in self._iter_titles():
+            category = title['category']
+            yield writer.writerow(
+                (
+                    title['id'],
+                    title['name'],
+                    title['year'],
+                    title['rating'],
+                    title['description'],
+                    category and category['slug'],
+                    ','.join(genre['slug'] for genre in title['genre']),
+                )
+            )
+
+    def get(self, request):
+        """Логика выгрузки произведений."""
+        if resp_error := check_admin_permission(request):
+            return resp_error
+        export_format = request.query_params.get('export_format', 'ndjson')
+        if export_format not in self.formats:
+            return Response(
+                {'export_format': f'Допустимые значения: {self.formats}'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if export_format == 'csv':
+            response = StreamingHttpResponse(
+                self._csv_rows(), content_type='text/csv; charset=utf-8'
+            )
+        else:
+            response = StreamingHttpResponse(
+                self._ndjson_rows(),
+                content_type='application/x-ndjson; charset=utf-8',
+            )
+        response['Content-Disposition'] = (
+            f'attachment; filename="titles.{export_format}"'
+        )
+        return response
@@ -1,3 +1,4 @@
+import os
 from datetime import timedelta
 from pathlib import Path
 
@@ -27,6 +28,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.metrics.metrics_middleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -58,13 +60,89 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 
-DATABASES = {
+
+def env_bool(name, default=False):
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.lower() in ('1', 'true', 'yes', 'on')
+
+
+# DB_ENGINE=postgresql - продакшен-профиль, по умолчанию SQLite для разработки
+DB_ENGINE = os.getenv('DB_ENGINE', 'sqlite3')
+
+if DB_ENGINE == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.getenv('DB_NAME', 'yamdb'),
+            'USER': os.getenv('POSTGRES_USER', 'postgres'),
+            'PASSWORD': os.getenv('POSTGRES_PASSWORD', ''),
+            'HOST': os.getenv('DB_HOST', 'localhost'),
+            'PORT': os.getenv('DB_PORT', '5432'),
+            # постоянные соединения: секунды жизни, 0 - закрывать после запроса
+            'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 60)),
+            # проверка соединения перед первым запросом к БД (reviews.signals)
+            'CONN_HEALTH_CHECKS': env_bool('DB_CONN_HEALTH_CHECKS', True),
+            # пулер (pgbouncer, transaction mode) не держит серверные курсоры
+            'DISABLE_SERVER_SIDE_CURSORS': env_bool('DB_POOLER'),
+            'OPTIONS': {
+                'connect_timeout': int(os.getenv('DB_CONNECT_TIMEOUT', 5)),
+            },
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.getenv('DB_NAME', BASE_DIR / 'db.sqlite3'),
+            'OPTIONS': {
+                # ожидание блокировки вместо "database is locked", секунды
+                'timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT', 20)),
+            },
+        }
+    }
+
+# Для нескольких процессов нужен общий кеш (например, memcached):
+# на нём держатся лимиты запросов и версии кешей ответов
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'yamdb'),
     }
 }
 
+# Кеш счётчиков ограничения частоты запросов (api.throttling)
+THROTTLE_CACHE = 'default'
+
+REFERENCE_CACHE_TIMEOUT = 60 * 15
+
+# Сколько секунд роль и статус пользователя из кеша считаются свежими,
+# после этого JWT-аутентификация перечитывает их из БД
+USER_STATE_TIMEOUT = 60
+
+# Асинхронные эндпоинты чтения (включаются в asgi.py) и размер их пула потоков
+ASYNC_READ_VIEWS = env_bool('ASYNC_READ_VIEWS')
+ASYNC_READ_WORKERS = int(os.getenv('ASYNC_READ_WORKERS', 8))
+
+# Топы произведений (refresh_title_rankings): вес априорной средней
+# оценки в байесовском среднем и окно трендов в днях
+RANKING_PRIOR_WEIGHT = 10
+RANKING_TRENDING_DAYS = 7
+
+# Доступ к /metrics/: по токену (заголовок `Authorization: Bearer <токен>`)
+# или с перечисленных адресов. За обратным прокси все запросы приходят
+# с его адреса, поэтому там нужен токен, а не список адресов
+METRICS_TOKEN = os.getenv('METRICS_TOKEN')
+METRICS_ALLOWED_IPS = [
+    ip for ip in os.getenv('METRICS_ALLOWED_IPS', '').split(',') if ip
+]
+
+# SQL-запросы дольше порога (мс) пишутся в лог api.metrics, None - выключено
+SLOW_QUERY_THRESHOLD_MS = None
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -99,8 +177,25 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.AllowAny',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.StatelessJWTAuthentication',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_THROTTLE_CLASSES': [
+        'api.throttling.AnonymousReadThrottle',
+    ],
+    'DEFAULT_THROTTLE_RATES': {
+        'signup': os.getenv('THROTTLE_SIGNUP', '10/hour'),
+        'token': os.getenv('THROTTLE_TOKEN', '30/min'),
+        'review-write': os.getenv('THROTTLE_REVIEW_WRITE', '30/hour'),
+        'comment-write': os.getenv('THROTTLE_COMMENT_WRITE', '120/hour'),
+        'anonymous-read': os.getenv('THROTTLE_ANONYMOUS_READ', '600/min'),
+    },
+    # число доверенных прокси перед приложением: при 0 IP для лимитов
+    # берётся из REMOTE_ADDR, а подделанный X-Forwarded-For игнорируется
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', 0)),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
     'PAGE_SIZE': 10,
 }
@@ -1,6 +1,15 @@
 from django.contrib import admin
 
-from .models import Category, Comment, Genre, Review, Title, User
+from .models import (
+    Category,
+    Comment,
+    Genre,
+    OutboxEmail,
+    Review,
+    Title,
+    TitleRanking,
+    User,
+)
 
 admin.site.register(User)
 admin.site.register(Category)
@@ -8,3 +17,5 @@ admin.site.register(Comment)
 admin.site.register(Genre)
 admin.site.register(Review)
 admin.site.register(Title)
+admin.site.register(TitleRanking)
+admin.site.register(OutboxEmail)
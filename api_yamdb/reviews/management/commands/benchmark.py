@@ -0,0 +1,290 @@
+import json
+import platform
+import random
+import subprocess
+from statistics import mean, quantiles
+from time import perf_counter
+
+import django
+from api.authentication import RoleAccessToken
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import (
+    CaptureQueriesContext,
+    override_settings,
+    setup_databases,
+    teardown_databases,
+)
+from reviews.models import Category, Comment, Genre, Review, Title, User
+
+from .generate_data import TITLE_WORDS
+
+# лимиты запросов остаются включёнными, но не срабатывают
+UNLIMITED_RATE = f'{10 ** 9}/sec'
+
+
+class Command(BaseCommand):
+    """
+    Регистрация кастомной django-admin команды.
+    Она генерирует синтетические данные командой generate_data,
+    прогоняет основные эндпоинты API через тестовый клиент Django
+    в том же процессе и выводит p50/p95/p99, пропускную способность
+    и количество SQL-запросов по каждому сценарию в JSON.
+
+    По умолчанию создаётся отдельная тестовая БД, рабочие данные
+    не затрагиваются.
+
+    Находясь тут:
+    ~/api_yamdb/api_yamdb/
+
+    Запускаем так:
+    python3 manage.py benchmark --reviews=100000 --output=bench.json
+    """
+
+    help = 'Нагрузочный прогон основных эндпоинтов API'
+
+    def add_arguments(self, parser):
+        """
+        Добавляем опциональные аргументы командной строки.
+        :param parser: Собственно, сами аргументы парсера.
+        """
+        for name, default, help_text in (
+            ('users', 200, 'Сколько пользователей сгенерировать'),
+            ('titles', 500, 'Сколько произведений сгенерировать'),
+            ('genres', 20, 'Сколько жанров сгенерировать'),
+            ('categories', 5, 'Сколько категорий сгенерировать'),
+            ('reviews', 10000, 'Сколько отзывов сгенерировать'),
+            ('comments', 5000, 'Сколько комментариев сгенерировать'),
+            ('requests', 200, 'Сколько запросов на каждый сценарий'),
+            ('warmup', 20, 'Сколько запросов прогрева не учитывать'),
+            ('batch_size', 5000, 'Размер пачки для bulk_create'),
+            ('seed', 42, 'Зерно генератора случайных чисел'),
+        ):
+            parser.add_argument(
+                f'--{name}', type=int, default=default, help=help_text
+            )
+        parser.add_argument(
+            '--zipf',
+            type=float,
+            default=1.1,
+            help='Показатель распределения Ципфа для отзывов',
+        )
+        parser.add_argument(
+            '--scenarios',
+            nargs='+',
+            default=None,
+            help='Запустить только эти сценарии',
+        )
+        parser.add_argument(
+            '--use_existing_db',
+            action='store_true',
+            help='Работать в текущей БД вместо временной тестовой',
+        )
+        parser.add_argument(
+            '--output',
+            type=str,
+            default=None,
+            help='Файл для JSON-отчёта (по умолчанию stdout)',
+        )
+
+    def _generate(self, options, prefix):
+        """
+        Генерирует данные командой generate_data.
+        :return: количество строк в основных таблицах
+        """
+        call_command(
+            'generate_data',
+            **{
+                name: options[name]
+                for name in (
+                    'users',
+                    'titles',
+                    'genres',
+                    'categories',
+                    'reviews',
+                    'comments',
+                    'zipf',
+                    'batch_size',
+                    'seed',
+                )
+            },
+            prefix=prefix,
+            stdout=self.stderr,
+        )
+        return {
+            name: model.objects.count()
+            for name, model in (
+                ('users', User),
+                ('titles', Title),
+                ('genres', Genre),
+                ('categories', Category),
+                ('reviews', Review),
+                ('comments', Comment),
+            )
+        }
+
+    def _scenarios(self, rnd, prefix):
+        """
+        Сценарии нагрузки: имя -> функция (клиент) -> ответ.
+        Отзывы и комментарии берутся у самого популярного произведения.
+        """
+        title = Title.objects.order_by('-reviews_count', 'id').first()
+        review = Review.objects.filter(title=title).first()
+        genre = Genre.objects.filter(slug__startswith=prefix).first()
+        author = User.objects.filter(username__startswith=prefix).first()
+        if title is None or review is None or genre is None:
+            raise CommandError('Недостаточно данных для прогона')
+        token = f'Bearer {RoleAccessToken.for_user(author)}'
+        title_ids = list(Title.objects.values_list('pk', flat=True)[:1000])
+        reviews_url = f'/api/v1/titles/{title.pk}/reviews/'
+        comments_url = f'{reviews_url}{review.pk}/comments/'
+        return {
+            'titles_list': lambda client: client.get('/api/v1/titles/'),
+            'titles_by_genre': lambda client: client.get(
+                '/api/v1/titles/', {'genre': genre.slug}
+            ),
+            'titles_search': lambda client: client.get(
+                '/api/v1/titles/', {'name': rnd.choice(TITLE_WORDS)[:3]}
+            ),
+            'title_detail': lambda client: client.get(
+                f'/api/v1/titles/{rnd.choice(title_ids)}/'
+            ),
+            'titles_top': lambda client: client.get('/api/v1/titles/top/'),
+            'titles_trending': lambda client: client.get(
+                '/api/v1/titles/trending/', {'genre': genre.slug}
+            ),
+            'categories_list': lambda client: client.get(
+                '/api/v1/categories/'
+            ),
+            'genres_list': lambda client: client.get('/api/v1/genres/'),
+            'reviews_list': lambda client: client.get(reviews_url),
+            'review_detail': lambda client: client.get(
+                f'{reviews_url}{review.pk}/'
+            ),
+            'comments_list': lambda client: client.get(comments_url),
+            'comment_create': lambda client: client.post(
+                comments_url,
+                {'text': 'bench'},
+                HTTP_AUTHORIZATION=token,
+            ),
+        }
+
+    @staticmethod
+    def _percentile(cut_points, percent):
+        return round(cut_points[percent - 1] * 1000, 3)
+
+    def _run(self, request, amount, warmup):
+        """
+        Прогоняет один сценарий.
+        :return: словарь с задержками, пропускной способностью
+            и количеством SQL-запросов
+        """
+        client = Client()
+        for _ in range(warmup):
+            request(client)
+        latencies = []
+        queries = 0
+        statuses = {}
+        started = perf_counter()
+        for _ in range(amount):
+            with CaptureQueriesContext(connection) as context:
+                request_started = perf_counter()
+                response = request(client)
+                latencies.append(perf_counter() - request_started)
+            queries += len(context.captured_queries)
+            code = str(response.status_code)
+            statuses[code] = statuses.get(code, 0) + 1
+        elapsed = perf_counter() - started
+        cut_points = quantiles(latencies, n=100, method='inclusive')
+        return {
+            'requests': amount,
+            'p50_ms': self._percentile(cut_points, 50),
+            'p95_ms': self._percentile(cut_points, 95),
+            'p99_ms': self._percentile(cut_points, 99),
+            'mean_ms': round(mean(latencies) * 1000, 3),
+            'throughput_rps': round(amount / elapsed, 1),
+            'queries_per_request': round(queries / amount, 2),
+            'status_codes': statuses,
+        }
+
+    @staticmethod
+    def _commit():
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    def _meta(self, options, dataset):
+        return {
+            'commit': self._commit(),
+            'database': connection.vendor,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'seed': options['seed'],
+            'dataset': dataset,
+        }
+
+    def _benchmark(self, options):
+        prefix = f'bench{options["seed"]}'
+        dataset = self._generate(options, prefix)
+        cache.clear()
+        rnd = random.Random(options['seed'])
+        scenarios = self._scenarios(rnd, prefix)
+        selected = options['scenarios'] or list(scenarios)
+        unknown = set(selected) - set(scenarios)
+        if unknown:
+            raise CommandError(f'Неизвестные сценарии: {sorted(unknown)}')
+        rest_settings = settings.REST_FRAMEWORK
+        rates = dict.fromkeys(
+            rest_settings.get('DEFAULT_THROTTLE_RATES', {}), UNLIMITED_RATE
+        )
+        results = {}
+        with override_settings(
+            REST_FRAMEWORK={**rest_settings, 'DEFAULT_THROTTLE_RATES': rates}
+        ):
+            for name in selected:
+                self.stderr.write(f'Сценарий {name}...')
+                results[name] = self._run(
+                    scenarios[name],
+                    max(options['requests'], 2),
+                    options['warmup'],
+                )
+        return {
+            'meta': self._meta(options, dataset),
+            'results': results,
+        }
+
+    def handle(self, *args, **options):
+        """
+        Хендлер django-admin, который запускает прогон.
+        :param args: Неименованные аргументы.
+        :param options: Именованные аргументы.
+        """
+        if options['use_existing_db']:
+            report = self._benchmark(options)
+        else:
+            old_config = setup_databases(
+                verbosity=0, interactive=False, aliases={'default'}
+            )
+            try:
+                report = self._benchmark(options)
+            finally:
+                teardown_databases(old_config, verbosity=0)
+        output = json.dumps(report, ensure_ascii=False, indent=2)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                file.write(output)
+            self.stderr.write(
+                self.style.SUCCESS(f'Отчёт сохранён в {options["output"]}')
+            )
+        else:
+            self.stdout.write(output)
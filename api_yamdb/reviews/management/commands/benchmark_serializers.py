@@ -0,0 +1,171 @@
+from statistics import mean, median
+from time import perf_counter
+
+from api.serializers import (
+    CommentFastSerializer,
+    CommentSerializer,
+    ReviewFastSerializer,
+    ReviewSerializer,
+    TitleFastSerializer,
+    TitleSerializer,
+)
+from api.renderers import FRAGMENTS, FastJSONRenderer
+from api.views import get_title_queryset
+from django.core.management.base import CommandError
+from rest_framework.renderers import JSONRenderer
+from reviews.models import Comment, Review
+
+from .benchmark import Command as BenchmarkCommand
+
+
+class Command(BenchmarkCommand):
+    """
+    Регистрация кастомной django-admin команды.
+    Она сравнивает обычные сериализаторы DRF с JSONRenderer и быстрые
+    (FastReadSerializer) с FastJSONRenderer на страницах из --rows
+    строк: время выборки, сериализации и рендеринга каждого пути
+    и совпадение JSON.
+    Данные генерируются командой generate_data, по умолчанию
+    во временной тестовой БД.
+
+    Находясь тут:
+    ~/api_yamdb/api_yamdb/
+
+    Запускаем так:
+    python3 manage.py benchmark_serializers --rows=1000 --output=ser.json
+    """
+
+    help = 'Сравнение обычных и быстрых сериализаторов списков'
+
+    def add_arguments(self, parser):
+        """
+        Добавляем опциональные аргументы командной строки.
+        :param parser: Собственно, сами аргументы парсера.
+        """
+        for name, default, help_text in (
+            ('users', 200, 'Сколько пользователей сгенерировать'),
+            ('titles', 1000, 'Сколько произведений сгенерировать'),
+            ('genres', 20, 'Сколько жанров сгенерировать'),
+            ('categories', 5, 'Сколько категорий сгенерировать'),
+            ('reviews', 5000, 'Сколько отзывов сгенерировать'),
+            ('comments', 2000, 'Сколько комментариев сгенерировать'),
+            ('rows', 1000, 'Сколько строк на странице'),
+            ('repeat', 20, 'Сколько раз сериализовать каждую страницу'),
+            ('batch_size', 5000, 'Размер пачки для bulk_create'),
+            ('seed', 42, 'Зерно генератора случайных чисел'),
+        ):
+            parser.add_argument(
+                f'--{name}', type=int, default=default, help=help_text
+            )
+        parser.add_argument(
+            '--zipf',
+            type=float,
+            default=1.1,
+            help='Показатель распределения Ципфа для отзывов',
+        )
+        parser.add_argument(
+            '--use_existing_db',
+            action='store_true',
+            help='Работать в текущей БД вместо временной тестовой',
+        )
+        parser.add_argument(
+            '--output',
+            type=str,
+            default=None,
+            help='Файл для JSON-отчёта (по умолчанию stdout)',
+        )
+
+    @staticmethod
+    def _pages():
+        """
+        Страницы: имя -> (queryset как во ViewSet, обычный
+        сериализатор, быстрый сериализатор).
+        """
+        return {
+            'titles': (
+                get_title_queryset(),
+                TitleSerializer,
+                TitleFastSerializer,
+            ),
+            'reviews': (
+                Review.objects.select_related('author').order_by(
+                    '-pub_date', '-id'
+                ),
+                ReviewSerializer,
+                ReviewFastSerializer,
+            ),
+            'comments': (
+                Comment.objects.select_related('author').order_by(
+                    '-pub_date', '-id'
+                ),
+                CommentSerializer,
+                CommentFastSerializer,
+            ),
+        }
+
+    @staticmethod
+    def _measure(queryset, serializer_class, renderer, rows, repeat,
+                 context=None):
+        """
+        Выборка, сериализация и рендеринг одной страницы repeat раз.
+        :return: (времена по этапам, JSON последнего прогона)
+        """
+        times = {'fetch': [], 'serialize': [], 'render': []}
+        for _ in range(repeat):
+            started = perf_counter()
+            page = list(queryset[:rows])
+            times['fetch'].append(perf_counter() - started)
+            started = perf_counter()
+            data = serializer_class(page, many=True, context=context).data
+            times['serialize'].append(perf_counter() - started)
+            started = perf_counter()
+            content = renderer.render(data)
+            times['render'].append(perf_counter() - started)
+        return times, content
+
+    @staticmethod
+    def _summary(times):
+        return {
+            'median_ms': round(median(times) * 1000, 3),
+            'mean_ms': round(mean(times) * 1000, 3),
+        }
+
+    def _benchmark(self, options):
+        rows, repeat = options['rows'], max(options['repeat'], 1)
+        if rows < 1:
+            raise CommandError('rows должен быть больше нуля')
+        dataset = self._generate(options, f'bench{options["seed"]}')
+        results = {}
+        for name, (queryset, drf_class, fast_class) in self._pages().items():
+            self.stderr.write(f'Страница {name}...')
+            drf_times, drf_json = self._measure(
+                queryset, drf_class, JSONRenderer(), rows, repeat
+            )
+            fast_times, fast_json = self._measure(
+                fast_class.prepare_queryset(queryset),
+                fast_class,
+                FastJSONRenderer(),
+                rows,
+                repeat,
+                # как в ответе API: вложенные объекты - фрагменты orjson
+                context={'json_fragments': FRAGMENTS},
+            )
+            drf_total = sum(median(times) for times in drf_times.values())
+            fast_total = sum(median(times) for times in fast_times.values())
+            results[name] = {
+                'rows': queryset[:rows].count(),
+                'drf': {
+                    stage: self._summary(times)
+                    for stage, times in drf_times.items()
+                },
+                'fast': {
+                    stage: self._summary(times)
+                    for stage, times in fast_times.items()
+                },
+                'speedup': round(drf_total / fast_total, 2),
+                'identical': drf_json == fast_json,
+            }
+        return {
+            'meta': self._meta(options, dataset),
+            'results': results,
+        }
@@ -0,0 +1,170 @@
+from time import perf_counter
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import setup_databases, teardown_databases
+from reviews.models import Comment, Genre, Review, Title
+
+TITLE_GENRE_INDEX = 'title_genre_genre_title_idx'
+
+
+class Command(BaseCommand):
+    """
+    Регистрация кастомной django-admin команды.
+    Она показывает планы основных запросов API без индексов
+    из миграции 0003 и с ними.
+
+    По умолчанию данные генерируются командой generate_data
+    во временной тестовой БД. С --use_existing_db команда работает
+    в текущей БД: индексы удаляются внутри транзакции, которая
+    затем откатывается, поэтому при любой ошибке они остаются
+    на месте. На время замеров таблицы заблокированы, поэтому
+    на рабочей БД так запускать нельзя. В текущую БД данные
+    генерируются, только если --reviews передан явно.
+
+    Находясь тут:
+    ~/api_yamdb/api_yamdb/
+
+    Запускаем так:
+    python3 manage.py explain_indexes --reviews=1000000
+    """
+
+    help = 'Сравнивает планы запросов API до и после добавления индексов'
+
+    def add_arguments(self, parser):
+        """
+        Добавляем опциональные аргументы командной строки.
+        :param parser: Собственно, сами аргументы парсера.
+        """
+        parser.add_argument(
+            '--reviews',
+            type=int,
+            default=None,
+            help='Сколько отзывов сгенерировать перед замерами '
+            '(0 - использовать текущие данные; по умолчанию 100000 '
+            'во временной БД и 0 с --use_existing_db)',
+        )
+        parser.add_argument(
+            '--batch_size',
+            type=int,
+            default=10000,
+            help='Размер пачки для bulk_create при генерации',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help='Зерно генератора случайных чисел',
+        )
+        parser.add_argument(
+            '--use_existing_db',
+            action='store_true',
+            help='Работать в текущей БД вместо временной тестовой',
+        )
+
+    def _generate(self, options):
+        """
+        Генерирует данные командой generate_data: около ста отзывов
+        на произведение, как на популярных страницах.
+        """
+        titles = max(options['reviews'] // 100, 1)
+        users = max(options['reviews'] // titles, 1)
+        call_command(
+            'generate_data',
+            users=users,
+            titles=titles,
+            reviews=options['reviews'],
+            comments=max(options['reviews'] // 10, 1),
+            batch_size=options['batch_size'],
+            seed=options['seed'],
+            prefix=f'explain{options["seed"]}',
+            stdout=self.stderr,
+        )
+
+    @staticmethod
+    def _index_names():
+        """Имена индексов миграции 0003."""
+        return [
+            index.name
+            for model in (Title, Review, Comment)
+            for index in model._meta.indexes
+        ] + [TITLE_GENRE_INDEX]
+
+    def _queries(self):
+        """Запросы, которые выполняют основные эндпоинты API."""
+        title = Title.objects.filter(reviews__isnull=False).first()
+        review = Review.objects.filter(comments__isnull=False).first()
+        genre = Genre.objects.first()
+        if title is None or review is None or genre is None:
+            raise CommandError(
+                'Недостаточно данных, запустите команду с --reviews'
+            )
+        return {
+            'reviews of title': title.reviews.all()[:10],
+            'comments of review': review.comments.all()[:10],
+            'titles by year': Title.objects.filter(year=title.year)[:10],
+            'titles by genre': Title.objects.filter(
+                genre__slug=genre.slug
+            )[:10],
+        }
+
+    def _explain(self, label):
+        self.stdout.write(self.style.WARNING(f'=== {label} ==='))
+        for name, queryset in self._queries().items():
+            started = perf_counter()
+            list(queryset)
+            elapsed = (perf_counter() - started) * 1000
+            self.stdout.write(
+                self.style.SUCCESS(f'--- {name} ({elapsed:.2f} мс)')
+            )
+            self.stdout.write(queryset.explain())
+
+    def _explain_without_indexes(self):
+        """
+        Замеры без индексов: DROP INDEX в транзакции, которая
+        откатывается, поэтому индексы возвращаются и при ошибке.
+        """
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                for name in self._index_names():
+                    cursor.execute(
+                        f'DROP INDEX {connection.ops.quote_name(name)}'
+                    )
+            self._explain('Без индексов')
+            transaction.set_rollback(True)
+
+    def _compare(self, options):
+        if options['reviews']:
+            self._generate(options)
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+        self._explain_without_indexes()
+        self._explain('С индексами')
+
+    def handle(self, *args, **options):
+        """
+        Хендлер django-admin, который сравнивает планы запросов.
+        :param args: Неименованные аргументы.
+        :param options: Именованные аргументы.
+        """
+        if not connection.features.can_rollback_ddl:
+            raise CommandError(
+                'СУБД не откатывает DDL, индексы нельзя удалить безопасно'
+            )
+        if options['use_existing_db']:
+            # без явного --reviews в текущую БД ничего не пишется
+            if options['reviews'] is None:
+                options['reviews'] = 0
+            self._compare(options)
+            return
+        if options['reviews'] is None:
+            options['reviews'] = 100000
+        old_config = setup_databases(
+            verbosity=0, interactive=False, aliases={'default'}
+        )
+        try:
+            self._compare(options)
+        finally:
+            teardown_databases(old_config, verbosity=0)
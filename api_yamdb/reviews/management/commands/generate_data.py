@@ -0,0 +1,304 @@
+import random
+from datetime import timedelta
+from itertools import islice
+
+from api.cache import (
+    BULK_NAMESPACE,
+    CATEGORIES_NAMESPACE,
+    GENRES_NAMESPACE,
+    bump_versions_on_commit,
+)
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+from reviews.models import Category, Comment, Genre, Review, Title, User
+
+from .import_csv import keep_source_dates
+
+TitleGenre = Title.genre.through
+
+TITLE_WORDS = (
+    'Война', 'Мир', 'Звёзды', 'Тень', 'Город', 'Море', 'Дорога', 'Ночь',
+    'Огонь', 'Сад', 'Время', 'Небо', 'Остров', 'Зима', 'Песня', 'Ветер',
+)
+
+
+def zipf_weights(amount, exponent):
+    """Веса рангов 1..amount по закону Ципфа."""
+    return [1 / rank ** exponent for rank in range(1, amount + 1)]
+
+
+def distribute(total, weights, cap):
+    """
+    Раскладывает total по корзинам пропорционально весам,
+    не больше cap в корзине. Излишек отдаётся следующим корзинам.
+    :return: список количеств той же длины, что и weights
+    """
+    weights_sum = sum(weights)
+    counts = [
+        min(int(total * weight / weights_sum), cap) for weight in weights
+    ]
+    leftover = total - sum(counts)
+    for idx in range(len(counts)):
+        if leftover <= 0:
+            break
+        extra = min(leftover, cap - counts[idx])
+        counts[idx] += extra
+        leftover -= extra
+    return counts
+
+
+class Command(BaseCommand):
+    """
+    Регистрация кастомной django-admin команды.
+    Она генерирует синтетические данные для нагрузочного
+    тестирования: пользователей, категории, жанры, произведения,
+    связи с жанрами, отзывы и комментарии. Количество отзывов
+    на произведение распределено по закону Ципфа, популярность
+    жанров и категорий тоже. Данные вставляются через bulk_create
+    пачками с заранее назначенными id, поэтому память не зависит
+    от объёма, а результат при одном seed одинаков.
+
+    Находясь тут:
+    ~/api_yamdb/api_yamdb/
+
+    Запускаем так:
+    python3 manage.py generate_data --users=1000000 --titles=100000 \
+        --reviews=5000000 --comments=2000000 --seed=42
+    """
+
+    help = 'Генерирует синтетические данные для нагрузочного тестирования'
+
+    def add_arguments(self, parser):
+        """
+        Добавляем опциональные аргументы командной строки.
+        :param parser: Собственно, сами аргументы парсера.
+        """
+        for name, default, help_text in (
+            ('users', 10000, 'Количество пользователей'),
+            ('titles', 1000, 'Количество произведений'),
+            ('genres', 30, 'Количество жанров'),
+            ('categories', 10, 'Количество категорий'),
+            ('reviews', 100000, 'Количество отзывов'),
+            ('comments', 50000, 'Количество комментариев'),
+            ('max_genres', 3, 'Максимум жанров у произведения'),
+            ('days', 365, 'За сколько последних дней даты публикаций'),
+            ('batch_size', 5000, 'Количество строк в одном bulk_create'),
+            ('seed', 42, 'Зерно генератора случайных чисел'),
+        ):
+            parser.add_argument(
+                f'--{name}', type=int, default=default, help=help_text
+            )
+        parser.add_argument(
+            '--zipf',
+            type=float,
+            default=1.1,
+            help='Показатель распределения Ципфа',
+        )
+        parser.add_argument(
+            '--prefix',
+            type=str,
+            default='gen',
+            help='Префикс имён пользователей, слагов и названий',
+        )
+
+    @staticmethod
+    def _next_id(model):
+        return (model.objects.aggregate(max_id=Max('id'))['max_id'] or 0) + 1
+
+    def _insert(self, model, objects, batch_size):
+        """
+        Вставляет объекты пачками, каждую в своей транзакции.
+        :return: количество вставленных строк
+        """
+        total = 0
+        objects = iter(objects)
+        with keep_source_dates(model):
+            while True:
+                batch = list(islice(objects, batch_size))
+                if not batch:
+                    break
+                with transaction.atomic():
+                    model.objects.bulk_create(batch)
+                total += len(batch)
+        self.stdout.write(
+            self.style.SUCCESS(f'{model._meta.db_table}: вставлено {total}')
+        )
+        return total
+
+    def _reset_sequences(self):
+        """Сдвигает последовательности id после вставки явных id."""
+        models = [User, Category, Genre, Title, TitleGenre, Review, Comment]
+        statements = connection.ops.sequence_reset_sql(no_style(), models)
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+    def _random_date(self, rnd, now, days):
+        return now - timedelta(seconds=rnd.randrange(days * 24 * 60 * 60))
+
+    def _check_options(self, options):
+        for name in ('users', 'titles', 'genres', 'categories'):
+            if options[name] < 1:
+                raise CommandError(f'{name} должен быть больше нуля')
+        if options['batch_size'] < 1:
+            raise CommandError('batch_size должен быть больше нуля')
+        if User.objects.filter(
+            username__startswith=f'{options["prefix"]}_'
+        ).exists():
+            raise CommandError(
+                f'Данные с префиксом {options["prefix"]} уже есть, '
+                'укажите другой --prefix'
+            )
+
+    def handle(self, *args, **options):
+        """
+        Хендлер django-admin, который генерирует данные.
+        :param args: Неименованные аргументы.
+        :param options: Именованные аргументы.
+        """
+        self._check_options(options)
+        rnd = random.Random(options['seed'])
+        prefix = options['prefix']
+        batch_size = options['batch_size']
+        now = timezone.now()
+        days = max(options['days'], 1)
+        users, titles = options['users'], options['titles']
+
+        user_start = self._next_id(User)
+        password = make_password(None)
+        self._insert(
+            User,
+            (
+                User(
+                    id=user_start + idx,
+                    username=f'{prefix}_{idx}',
+                    email=f'{prefix}_{idx}@yamdb.fake',
+                    password=password,
+                )
+                for idx in range(users)
+            ),
+            batch_size,
+        )
+
+        category_start = self._next_id(Category)
+        self._insert(
+            Category,
+            (
+                Category(
+                    id=category_start + idx,
+                    name=f'Категория {prefix} {idx}',
+                    slug=f'{prefix}-cat-{idx}',
+                )
+                for idx in range(options['categories'])
+            ),
+            batch_size,
+        )
+        genre_start = self._next_id(Genre)
+        self._insert(
+            Genre,
+            (
+                Genre(
+                    id=genre_start + idx,
+                    name=f'Жанр {prefix} {idx}',
+                    slug=f'{prefix}-genre-{idx}',
+                )
+                for idx in range(options['genres'])
+            ),
+            batch_size,
+        )
+
+        title_start = self._next_id(Title)
+        category_ids = range(
+            category_start, category_start + options['categories']
+        )
+        category_weights = zipf_weights(options['categories'], 1)
+        self._insert(
+            Title,
+            (
+                Title(
+                    id=title_start + idx,
+                    name=' '.join(rnd.sample(TITLE_WORDS, 2)) + f' {idx}',
+                    year=rnd.randint(1900, now.year),
+                    category_id=rnd.choices(
+                        category_ids, weights=category_weights
+                    )[0],
+                )
+                for idx in range(titles)
+            ),
+            batch_size,
+        )
+
+        genre_ids = range(genre_start, genre_start + options['genres'])
+        genre_weights = zipf_weights(options['genres'], 1)
+        max_genres = max(min(options['max_genres'], options['genres']), 1)
+
+        def title_genres():
+            for title_id in range(title_start, title_start + titles):
+                chosen = set(
+                    rnd.choices(
+                        genre_ids,
+                        weights=genre_weights,
+                        k=rnd.randint(1, max_genres),
+                    )
+                )
+                for genre_id in sorted(chosen):
+                    yield TitleGenre(title_id=title_id, genre_id=genre_id)
+
+        self._insert(TitleGenre, title_genres(), batch_size)
+
+        # популярность не совпадает с порядком id: ранги перемешаны
+        ranked_titles = list(range(title_start, title_start + titles))
+        rnd.shuffle(ranked_titles)
+        review_counts = distribute(
+            options['reviews'],
+            zipf_weights(titles, options['zipf']),
+            users,
+        )
+        review_start = self._next_id(Review)
+
+        def reviews():
+            review_id = review_start
+            for title_id, amount in zip(ranked_titles, review_counts):
+                for author_idx in rnd.sample(range(users), amount):
+                    yield Review(
+                        id=review_id,
+                        title_id=title_id,
+                        author_id=user_start + author_idx,
+                        text=f'Отзыв {review_id}',
+                        score=min(max(round(rnd.gauss(7, 2)), 1), 10),
+                        pub_date=self._random_date(rnd, now, days),
+                    )
+                    review_id += 1
+
+        reviews_total = self._insert(Review, reviews(), batch_size)
+
+        comment_start = self._next_id(Comment)
+        comments_total = options['comments'] if reviews_total else 0
+        self._insert(
+            Comment,
+            (
+                Comment(
+                    id=comment_start + idx,
+                    review_id=review_start + rnd.randrange(reviews_total),
+                    author_id=user_start + rnd.randrange(users),
+                    text=f'Комментарий {idx}',
+                    pub_date=self._random_date(rnd, now, days),
+                )
+                for idx in range(comments_total)
+            ),
+            batch_size,
+        )
+
+        self._reset_sequences()
+        # bulk_create не шлёт сигналов: кеши и ETag сбрасываем сами
+        bump_versions_on_commit(
+            BULK_NAMESPACE, CATEGORIES_NAMESPACE, GENRES_NAMESPACE
+        )
+        call_command('recalculate_ratings', stdout=self.stdout)
+        call_command('rebuild_search_index', stdout=self.stdout)
+        call_command('refresh_title_rankings', stdout=self.stdout)
@@ -0,0 +1,219 @@
+import csv
+from contextlib import contextmanager
+from itertools import islice
+from os.path import isfile, join
+
+from api.cache import (
+    BULK_NAMESPACE,
+    CATEGORIES_NAMESPACE,
+    GENRES_NAMESPACE,
+    bump_versions_on_commit,
+)
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from reviews.models import Category, Comment, Genre, Review, Title, User
+
+TitleGenre = Title.genre.through
+
+
+def nullable(value):
+    """Пустая строка в CSV означает NULL."""
+    return value or None
+
+
+def make_user(row):
+    return User(
+        id=row['id'],
+        username=row['username'],
+        email=row['email'],
+        role=row['role'],
+        bio=nullable(row.get('bio')),
+        first_name=nullable(row.get('first_name')),
+        last_name=row.get('last_name') or '',
+        password=make_password(None),
+    )
+
+
+def make_category(row):
+    return Category(id=row['id'], name=row['name'], slug=row['slug'])
+
+
+def make_genre(row):
+    return Genre(id=row['id'], name=row['name'], slug=row['slug'])
+
+
+def make_title(row):
+    return Title(
+        id=row['id'],
+        name=row['name'],
+        year=row['year'],
+        description=nullable(row.get('description')),
+        category_id=nullable(row.get('category')),
+    )
+
+
+def make_title_genre(row):
+    return TitleGenre(
+        id=row['id'], title_id=row['title_id'], genre_id=row['genre_id']
+    )
+
+
+def make_review(row):
+    return Review(
+        id=row['id'],
+        title_id=row['title_id'],
+        text=row['text'],
+        author_id=row['author'],
+        score=row['score'],
+        pub_date=row['pub_date'],
+    )
+
+
+def make_comment(row):
+    return Comment(
+        id=row['id'],
+        review_id=row['review_id'],
+        text=row['text'],
+        author_id=row['author'],
+        pub_date=row['pub_date'],
+    )
+
+
+# порядок важен: сначала таблицы, на которые ссылаются внешние ключи
+IMPORT_PLAN = (
+    ('users.csv', User, make_user),
+    ('category.csv', Category, make_category),
+    ('genre.csv', Genre, make_genre),
+    ('titles.csv', Title, make_title),
+    ('genre_title.csv', TitleGenre, make_title_genre),
+    ('review.csv', Review, make_review),
+    ('comments.csv', Comment, make_comment),
+)
+
+
+@contextmanager
+def keep_source_dates(model):
+    """
+    Временно отключает auto_now_add, чтобы bulk_create
+    сохранил pub_date из CSV, а не текущее время.
+    """
+    fields = [
+        field
+        for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+class Command(BaseCommand):
+    """
+    Регистрация кастомной django-admin команды.
+    Она потоково загружает CSV файлы прямо в БД через bulk_create,
+    сохраняя id из файлов. Память не зависит от размера файлов:
+    в памяти держится только одна пачка строк.
+
+    Находясь тут:
+    ~/api_yamdb/api_yamdb/
+
+    Запускаем так:
+    python3 manage.py import_csv --csv_path='static/data/' --batch_size=5000
+    """
+
+    help = 'Загружает CSV файлы в БД пачками через bulk_create'
+
+    def add_arguments(self, parser):
+        """
+        Добавляем опциональные аргументы командной строки.
+        :param parser: Собственно, сами аргументы парсера.
+        """
+        parser.add_argument(
+            '--csv_path',
+            type=str,
+            default='static/data/',
+            help='Относительный путь к директории CSV файлов',
+        )
+        parser.add_argument(
+            '--batch_size',
+            type=int,
+            default=5000,
+            help='Количество строк в одной транзакции bulk_create',
+        )
+        parser.add_argument(
+            '--ignore_conflicts',
+            action='store_true',
+            help='Пропускать строки, которые уже есть в БД',
+        )
+
+    def _import_file(self, path, model, make_object, options):
+        """
+        Загружает один CSV файл пачками.
+        :param path: путь к CSV файлу
+        :param model: модель Django
+        :param make_object: функция, создающая объект модели из строки
+        :param options: именованные аргументы команды
+        :return: количество загруженных строк
+        """
+        total = 0
+        with open(path, encoding='utf-8', newline='') as csv_file:
+            objects = map(make_object, csv.DictReader(csv_file))
+            with keep_source_dates(model):
+                while True:
+                    batch = list(islice(objects, options['batch_size']))
+                    if not batch:
+                        break
+                    with transaction.atomic():
+                        model.objects.bulk_create(
+                            batch,
+                            ignore_conflicts=options['ignore_conflicts'],
+                        )
+                    total += len(batch)
+        return total
+
+    def _reset_sequences(self):
+        """Сдвигает последовательности id после вставки явных id."""
+        models = [model for _, model, _ in IMPORT_PLAN]
+        statements = connection.ops.sequence_reset_sql(no_style(), models)
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+    def handle(self, *args, **options):
+        """
+        Хендлер django-admin, который загружает CSV файлы по порядку.
+        :param args: Неименованные аргументы.
+        :param options: Именованные аргументы.
+        """
+        csv_path = options['csv_path']
+        if options['batch_size'] < 1:
+            raise CommandError('batch_size должен быть больше нуля')
+        for file_name, model, make_object in IMPORT_PLAN:
+            path = join(csv_path, file_name)
+            if not isfile(path):
+                self.stderr.write(
+                    self.style.ERROR(f'Файл {path} не найден, пропускаем')
+                )
+                continue
+            total = self._import_file(path, model, make_object, options)
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f'{file_name}: загружено строк {total} '
+                    f'в {model._meta.db_table}'
+                )
+            )
+        self._reset_sequences()
+        # bulk_create не шлёт сигналов: кеши и ETag сбрасываем сами
+        bump_versions_on_commit(
+            BULK_NAMESPACE, CATEGORIES_NAMESPACE, GENRES_NAMESPACE
+        )
+        call_command('recalculate_ratings', stdout=self.stdout)
+        call_command('rebuild_search_index', stdout=self.stdout)
+        call_command('refresh_title_rankings', stdout=self.stdout)
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from reviews.search import get_search_backend
+
+
+class Command(BaseCommand):
+    """
+    Регистрация кастомной django-admin команды.
+    Она перестраивает поисковый индекс произведений, например
+    после загрузки данных через bulk_create, минуя сигналы модели.
+
+    Находясь тут:
+    ~/api_yamdb/api_yamdb/
+
+    Запускаем так:
+    python3 manage.py rebuild_search_index
+    """
+
+    help = 'Перестраивает поисковый индекс произведений'
+
+    def handle(self, *args, **options):
+        """
+        Хендлер django-admin, который перестраивает индекс.
+        :param args: Неименованные аргументы.
+        :param options: Именованные аргументы.
+        """
+        backend = get_search_backend()
+        backend.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Поисковый индекс перестроен ({type(backend).__name__})'
+            )
+        )
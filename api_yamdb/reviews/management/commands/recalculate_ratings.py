@@ -0,0 +1,97 @@
+from api.cache import BULK_NAMESPACE, bump_versions_on_commit
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, FloatField, OuterRef, Subquery, Sum
+from django.db.models.functions import Cast, Coalesce, NullIf
+from reviews.models import SCORES, Review, Title, score_count_field
+
+
+class Command(BaseCommand):
+    """
+    Регистрация кастомной django-admin команды.
+    Она пересчитывает денормализованные поля рейтинга произведений
+    (rating, reviews_count, score_sum и счётчики оценок
+    score_N_count) по таблице отзывов.
+
+    Находясь тут:
+    ~/api_yamdb/api_yamdb/
+
+    Запускаем так:
+    python3 manage.py recalculate_ratings --batch_size=5000
+    """
+
+    help = (
+        'Пересчитывает рейтинг, количество, сумму и распределение '
+        'оценок произведений'
+    )
+
+    def add_arguments(self, parser):
+        """
+        Добавляем опциональные аргументы командной строки.
+        :param parser: Собственно, сами аргументы парсера.
+        """
+        parser.add_argument(
+            '--batch_size',
+            type=int,
+            default=1000,
+            help='Количество произведений, обновляемых за одну транзакцию',
+        )
+
+    def _recalculate_batch(self, first_pk, last_pk):
+        """
+        Пересчитывает поля рейтинга и счётчики оценок
+        для диапазона id произведений.
+        :param first_pk: первый id диапазона (включительно)
+        :param last_pk: последний id диапазона (включительно)
+        :return: количество обработанных произведений
+        """
+        reviews = Review.objects.filter(title=OuterRef('pk')).values('title')
+        titles = Title.objects.filter(pk__gte=first_pk, pk__lte=last_pk)
+        with transaction.atomic():
+            titles.update(
+                reviews_count=Coalesce(
+                    Subquery(reviews.annotate(c=Count('pk')).values('c')), 0
+                ),
+                score_sum=Coalesce(
+                    Subquery(reviews.annotate(s=Sum('score')).values('s')), 0
+                ),
+                **{
+                    score_count_field(score): Coalesce(
+                        Subquery(
+                            reviews.filter(score=score)
+                            .annotate(c=Count('pk'))
+                            .values('c')
+                        ),
+                        0,
+                    )
+                    for score in SCORES
+                },
+            )
+            return titles.update(
+                rating=Cast('score_sum', FloatField())
+                / NullIf('reviews_count', 0)
+            )
+
+    def handle(self, *args, **options):
+        """
+        Хендлер django-admin, который пересчитывает рейтинги пачками.
+        :param args: Неименованные аргументы.
+        :param options: Именованные аргументы.
+        """
+        batch_size = options['batch_size']
+        pks = Title.objects.order_by('pk').values_list('pk', flat=True)
+        processed = 0
+        batch = []
+        for pk in pks.iterator(chunk_size=batch_size):
+            batch.append(pk)
+            if len(batch) == batch_size:
+                processed += self._recalculate_batch(batch[0], batch[-1])
+                batch = []
+        if batch:
+            processed += self._recalculate_batch(batch[0], batch[-1])
+        bump_versions_on_commit(BULK_NAMESPACE)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Рейтинги пересчитаны, обработано произведений: {processed}'
+            )
+        )
@@ -0,0 +1,127 @@
+from datetime import timedelta
+from itertools import islice
+
+from api.cache import RANKINGS_NAMESPACE, bump_versions_on_commit
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.utils import timezone
+from reviews.models import Review, Title, TitleRanking
+
+
+def bayesian_average(score_sum, count, prior_mean, prior_weight):
+    """
+    Байесовское среднее: к отзывам добавляется prior_weight
+    воображаемых отзывов со средней оценкой prior_mean.
+    """
+    return (prior_mean * prior_weight + score_sum) / (prior_weight + count)
+
+
+class Command(BaseCommand):
+    """
+    Регистрация кастомной django-admin команды.
+    Она пересчитывает таблицу TitleRanking для /titles/top/
+    и /titles/trending/: байесовское среднее всех оценок
+    и оценок за последние --trending_days дней. В рейтинг попадают
+    произведения с отзывами. Таблица заменяется целиком в одной
+    транзакции, читатели видят старый или новый рейтинг.
+    Запускается периодически (cron), оценки берутся из
+    денормализованных полей произведения, а недавние - одним
+    сгруппированным запросом по отзывам.
+
+    Находясь тут:
+    ~/api_yamdb/api_yamdb/
+
+    Запускаем так:
+    python3 manage.py refresh_title_rankings --trending_days=7
+    """
+
+    help = 'Пересчитывает рейтинги произведений для топов и трендов'
+
+    def add_arguments(self, parser):
+        """
+        Добавляем опциональные аргументы командной строки.
+        :param parser: Собственно, сами аргументы парсера.
+        """
+        parser.add_argument(
+            '--prior_weight',
+            type=float,
+            default=settings.RANKING_PRIOR_WEIGHT,
+            help='Сколько воображаемых средних отзывов добавлять',
+        )
+        parser.add_argument(
+            '--trending_days',
+            type=int,
+            default=settings.RANKING_TRENDING_DAYS,
+            help='За сколько последних дней считать тренды',
+        )
+        parser.add_argument(
+            '--batch_size',
+            type=int,
+            default=5000,
+            help='Количество строк в одном bulk_create',
+        )
+
+    def _rankings(self, options, now):
+        totals = Title.objects.aggregate(
+            score_sum=Sum('score_sum'), reviews_count=Sum('reviews_count')
+        )
+        if not totals['reviews_count']:
+            return
+        prior_mean = totals['score_sum'] / totals['reviews_count']
+        prior_weight = options['prior_weight']
+        recent = {
+            row['title_id']: (row['score_sum'], row['reviews_count'])
+            for row in Review.objects.filter(
+                pub_date__gte=now - timedelta(days=options['trending_days'])
+            )
+            .values('title_id')
+            .annotate(score_sum=Sum('score'), reviews_count=Count('pk'))
+            .order_by()
+        }
+        titles = (
+            Title.objects.filter(reviews_count__gt=0)
+            .order_by('pk')
+            .values_list('pk', 'score_sum', 'reviews_count')
+        )
+        for title_id, score_sum, reviews_count in titles.iterator(
+            chunk_size=options['batch_size']
+        ):
+            recent_sum, recent_count = recent.get(title_id, (0, 0))
+            yield TitleRanking(
+                title_id=title_id,
+                top_score=bayesian_average(
+                    score_sum, reviews_count, prior_mean, prior_weight
+                ),
+                recent_reviews_count=recent_count,
+                trending_score=bayesian_average(
+                    recent_sum, recent_count, prior_mean, prior_weight
+                ) if recent_count else None,
+                refreshed_at=now,
+            )
+
+    def handle(self, *args, **options):
+        """
+        Хендлер django-admin, который пересчитывает рейтинги.
+        :param args: Неименованные аргументы.
+        :param options: Именованные аргументы.
+        """
+        if options['prior_weight'] < 0:
+            raise CommandError('prior_weight не может быть отрицательным')
+        if options['batch_size'] < 1:
+            raise CommandError('batch_size должен быть больше нуля')
+        rankings = self._rankings(options, timezone.now())
+        total = 0
+        with transaction.atomic():
+            TitleRanking.objects.all().delete()
+            while True:
+                batch = list(islice(rankings, options['batch_size']))
+                if not batch:
+                    break
+                TitleRanking.objects.bulk_create(batch)
+                total += len(batch)
+            bump_versions_on_commit(RANKINGS_NAMESPACE)
+        self.stdout.write(
+            self.style.SUCCESS(f'Рейтинги топов пересчитаны: {total}')
+        )
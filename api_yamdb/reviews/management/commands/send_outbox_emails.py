@@ -0,0 +1,196 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from time import sleep
+
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+from reviews.models import OutboxEmail
+
+
+class Command(BaseCommand):
+    """
+    Регистрация кастомной django-admin команды.
+    Она отправляет письма из очереди OutboxEmail пачками,
+    с ограниченным числом параллельных SMTP-соединений
+    и повторными попытками с экспоненциальной задержкой.
+
+    Находясь тут:
+    ~/api_yamdb/api_yamdb/
+
+    Запускаем так (однократно):
+    python3 manage.py send_outbox_emails
+
+    , либо воркером:
+    python3 manage.py send_outbox_emails --loop --interval=5
+    """
+
+    help = 'Отправляет письма из очереди'
+
+    def add_arguments(self, parser):
+        """
+        Добавляем опциональные аргументы командной строки.
+        :param parser: Собственно, сами аргументы парсера.
+        """
+        parser.add_argument(
+            '--batch_size',
+            type=int,
+            default=100,
+            help='Сколько писем забирать из очереди за раз',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='Максимум параллельных SMTP-соединений',
+        )
+        parser.add_argument(
+            '--max_attempts',
+            type=int,
+            default=5,
+            help='После стольких неудач письмо помечается как неотправленное',
+        )
+        parser.add_argument(
+            '--retry_delay',
+            type=int,
+            default=60,
+            help='Базовая задержка повторной попытки в секундах',
+        )
+        parser.add_argument(
+            '--lease',
+            type=int,
+            default=300,
+            help='На сколько секунд письмо скрывается от других воркеров',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Работать постоянно, опрашивая очередь',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Пауза между опросами пустой очереди в секундах',
+        )
+
+    def _claim(self, batch_size, lease, after_pk):
+        """
+        Забирает пачку готовых к отправке писем и откладывает их
+        следующую попытку на время аренды, чтобы их не взял другой воркер.
+        :param batch_size: размер пачки
+        :param lease: время аренды в секундах
+        :param after_pk: брать письма с id больше этого (один проход)
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            emails = OutboxEmail.objects.filter(
+                status=OutboxEmail.Statuses.PENDING,
+                next_attempt_at__lte=now,
+                pk__gt=after_pk,
+            ).order_by('id')
+            if connection.features.has_select_for_update_skip_locked:
+                emails = emails.select_for_update(skip_locked=True)
+            emails = list(emails[:batch_size])
+            OutboxEmail.objects.filter(
+                pk__in=[email.pk for email in emails]
+            ).update(
+                attempts=F('attempts') + 1,
+                next_attempt_at=now + timedelta(seconds=lease),
+            )
+        for email in emails:
+            email.attempts += 1
+        return emails
+
+    @staticmethod
+    def _send_chunk(emails):
+        """
+        Отправляет письма через одно SMTP-соединение.
+        Выполняется в потоке и не обращается к БД.
+        :param emails: список писем
+        :return: словарь {id письма: текст ошибки или None}
+        """
+        results = {}
+        try:
+            with get_connection() as mail_connection:
+                for email in emails:
+                    message = EmailMessage(
+                        email.subject,
+                        email.body,
+                        email.from_email,
+                        [email.recipient],
+                        connection=mail_connection,
+                    )
+                    try:
+                        message.send()
+                        results[email.pk] = None
+                    except Exception as error:
+                        results[email.pk] = repr(error)
+        except Exception as error:
+            for email in emails:
+                results.setdefault(email.pk, repr(error))
+        return results
+
+    def _save_results(self, emails, results, max_attempts, retry_delay):
+        """Сохраняет статусы отправки, неудачные письма планирует заново."""
+        now = timezone.now()
+        sent = [pk for pk, error in results.items() if error is None]
+        OutboxEmail.objects.filter(pk__in=sent).update(
+            status=OutboxEmail.Statuses.SENT, sent_at=now, last_error=''
+        )
+        for email in emails:
+            error = results.get(email.pk)
+            if error is None:
+                continue
+            if email.attempts >= max_attempts:
+                update = {'status': OutboxEmail.Statuses.FAILED}
+            else:
+                delay = retry_delay * 2 ** (email.attempts - 1)
+                update = {'next_attempt_at': now + timedelta(seconds=delay)}
+            OutboxEmail.objects.filter(pk=email.pk).update(
+                last_error=error, **update
+            )
+        return len(sent), len(results) - len(sent)
+
+    def _process_batch(self, options, after_pk):
+        """
+        Отправляет одну пачку писем.
+        :return: id последнего письма пачки или None, если очередь пуста
+        """
+        emails = self._claim(
+            options['batch_size'], options['lease'], after_pk
+        )
+        if not emails:
+            return None
+        workers = max(min(options['workers'], len(emails)), 1)
+        chunks = [emails[idx::workers] for idx in range(workers)]
+        results = {}
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for chunk_results in executor.map(self._send_chunk, chunks):
+                results.update(chunk_results)
+        sent, failed = self._save_results(
+            emails, results, options['max_attempts'], options['retry_delay']
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f'Отправлено писем: {sent}, ошибок: {failed}')
+        )
+        return emails[-1].pk
+
+    def handle(self, *args, **options):
+        """
+        Хендлер django-admin, который разбирает очередь писем.
+        :param args: Неименованные аргументы.
+        :param options: Именованные аргументы.
+        """
+        last_pk = 0
+        while True:
+            processed_pk = self._process_batch(options, last_pk)
+            if processed_pk is not None:
+                last_pk = processed_pk
+                continue
+            if not options['loop']:
+                break
+            last_pk = 0
+            sleep(options['interval'])
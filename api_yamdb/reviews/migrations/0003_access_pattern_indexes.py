@@ -0,0 +1,34 @@
+# Generated by Django 3.2 on 2026-10-18 04:37
+
+from django.db import migrations, models
+
+TITLE_GENRE_INDEX = 'title_genre_genre_title_idx'
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0002_title_rating'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['review', '-pub_date'], name='comment_review_pub_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['title', '-pub_date'], name='review_title_pub_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['year'], name='title_year_idx'),
+        ),
+        migrations.RunSQL(
+            sql=(
+                f'CREATE INDEX {TITLE_GENRE_INDEX} '
+                'ON reviews_title_genre (genre_id, title_id);'
+            ),
+            reverse_sql=f'DROP INDEX {TITLE_GENRE_INDEX};',
+        ),
+    ]
@@ -0,0 +1,47 @@
+from django.db import migrations
+
+FTS_TABLE = 'reviews_title_fts'
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(
+            f'CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5('
+            "name, tokenize = 'unicode61 remove_diacritics 2')"
+        )
+        schema_editor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, name) '
+            'SELECT id, name FROM reviews_title'
+        )
+    elif vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        schema_editor.execute(
+            'CREATE INDEX title_name_trgm_idx ON reviews_title '
+            'USING gin (name gin_trgm_ops)'
+        )
+        schema_editor.execute(
+            'CREATE INDEX title_name_tsv_idx ON reviews_title USING gin '
+            "(to_tsvector('simple'::regconfig, "
+            "COALESCE((name)::text, ''::text)))"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE {FTS_TABLE}')
+    elif vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX title_name_trgm_idx')
+        schema_editor.execute('DROP INDEX title_name_tsv_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_access_pattern_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 3.2 on 2026-10-18 04:45
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_title_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxEmail',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject', models.CharField(help_text='Тема письма', max_length=256, verbose_name='Тема')),
+                ('body', models.TextField(help_text='Текст письма', verbose_name='Текст')),
+                ('from_email', models.EmailField(default=None, help_text='Адрес отправителя, по умолчанию DEFAULT_FROM_EMAIL', max_length=254, null=True, verbose_name='Отправитель')),
+                ('recipient', models.EmailField(help_text='Адрес получателя', max_length=254, verbose_name='Получатель')),
+                ('status', models.CharField(choices=[('pending', 'В очереди'), ('sent', 'Отправлено'), ('failed', 'Не отправлено')], default='pending', help_text='Статус отправки письма', max_length=7, verbose_name='Статус')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, help_text='Количество попыток отправки', verbose_name='Попытки')),
+                ('last_error', models.TextField(blank=True, default='', help_text='Текст последней ошибки отправки', verbose_name='Ошибка')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='Дата постановки письма в очередь', verbose_name='Дата создания')),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now, help_text='Не раньше этого времени письмо будет отправлено', verbose_name='Следующая попытка')),
+                ('sent_at', models.DateTimeField(default=None, help_text='Дата успешной отправки письма', null=True, verbose_name='Дата отправки')),
+            ],
+            options={
+                'verbose_name': 'Письмо в очереди',
+                'verbose_name_plural': 'Очередь писем',
+                'ordering': ('id',),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='outboxemail',
+            index=models.Index(fields=['status', 'next_attempt_at'], name='outbox_status_next_idx'),
+        ),
+    ]
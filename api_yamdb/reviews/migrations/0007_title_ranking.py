@@ -0,0 +1,37 @@
+# Generated by Django 3.2 on 2026-10-18 05:23
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_title_score_counts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleRanking',
+            fields=[
+                ('title', models.OneToOneField(help_text='Произведение, для которого посчитан рейтинг', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='ranking', serialize=False, to='reviews.title', verbose_name='Произведение')),
+                ('top_score', models.FloatField(help_text='Байесовское среднее всех оценок произведения', verbose_name='Оценка для топа')),
+                ('recent_reviews_count', models.PositiveIntegerField(default=0, help_text='Количество отзывов за последние дни', verbose_name='Недавних отзывов')),
+                ('trending_score', models.FloatField(default=None, help_text='Байесовское среднее недавних оценок, пусто без них', null=True, verbose_name='Оценка для трендов')),
+                ('refreshed_at', models.DateTimeField(default=django.utils.timezone.now, help_text='Когда рейтинг был пересчитан', verbose_name='Дата пересчёта')),
+            ],
+            options={
+                'verbose_name': 'Рейтинг произведения',
+                'verbose_name_plural': 'Рейтинги произведений',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='titleranking',
+            index=models.Index(fields=['-top_score', 'title'], name='ranking_top_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='titleranking',
+            index=models.Index(fields=['-trending_score', 'title'], name='ranking_trending_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+from django.db import migrations
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS title_name_trgm_idx')
+
+
+def create_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE INDEX title_name_trgm_idx ON reviews_title '
+            'USING gin (name gin_trgm_ops)'
+        )
+
+
+# триграммный индекс из 0004 поиск не использует (он идёт по tsvector),
+# а запись в reviews_title он замедляет
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0007_title_ranking'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_trigram_index, create_trigram_index),
+    ]
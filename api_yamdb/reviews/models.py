@@ -1,3 +1,4 @@
+from collections import Counter
 from enum import Enum
 
 from django.contrib.auth.models import AbstractUser
@@ -6,12 +7,23 @@ from django.core.validators import (
     MinValueValidator,
     RegexValidator,
 )
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, FloatField, IntegerField
+from django.db.models.functions import Cast, Greatest, NullIf
+from django.utils import timezone
 
 USER_NAME_LENGTH = 150
 EMAIL_LENGTH = 254
 NAME_LENGTH = 256
 SLUG_LENGTH = 50
+MIN_SCORE = 1
+MAX_SCORE = 10
+SCORES = range(MIN_SCORE, MAX_SCORE + 1)
+
+
+def score_count_field(score):
+    """Имя поля Title со счётчиком отзывов с оценкой score."""
+    return f'score_{score}_count'
 
 
 class UserCustomRoles(Enum):
@@ -143,14 +155,196 @@ class Title(models.Model):
         verbose_name='Жанр',
         help_text='Жанр произведения',
     )
+    rating = models.FloatField(
+        null=True,
+        default=None,
+        verbose_name='Рейтинг',
+        help_text='Средняя оценка произведения по отзывам',
+    )
+    reviews_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество отзывов',
+        help_text='Количество отзывов на произведение',
+    )
+    score_sum = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Сумма оценок',
+        help_text='Сумма оценок всех отзывов на произведение',
+    )
+    score_1_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Оценок 1',
+        help_text='Количество отзывов с оценкой 1',
+    )
+    score_2_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Оценок 2',
+        help_text='Количество отзывов с оценкой 2',
+    )
+    score_3_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Оценок 3',
+        help_text='Количество отзывов с оценкой 3',
+    )
+    score_4_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Оценок 4',
+        help_text='Количество отзывов с оценкой 4',
+    )
+    score_5_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Оценок 5',
+        help_text='Количество отзывов с оценкой 5',
+    )
+    score_6_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Оценок 6',
+        help_text='Количество отзывов с оценкой 6',
+    )
+    score_7_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Оценок 7',
+        help_text='Количество отзывов с оценкой 7',
+    )
+    score_8_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Оценок 8',
+        help_text='Количество отзывов с оценкой 8',
+    )
+    score_9_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Оценок 9',
+        help_text='Количество отзывов с оценкой 9',
+    )
+    score_10_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Оценок 10',
+        help_text='Количество отзывов с оценкой 10',
+    )
 
     class Meta:
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
+        indexes = [
+            models.Index(fields=['year'], name='title_year_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
+    @classmethod
+    def shift_rating(cls, title_id, added_score=None, removed_score=None):
+        """
+        Инкрементально обновляет рейтинг и счётчики оценок произведения
+        одним UPDATE. Вызывается в той же транзакции, что и изменение
+        отзыва; при изменении оценки передаются обе.
+        :param title_id: id произведения
+        :param added_score: оценка добавленного отзыва (новая оценка)
+        :param removed_score: оценка удалённого отзыва (прежняя оценка)
+        """
+        counts = Counter()
+        if added_score is not None:
+            counts[added_score] += 1
+        if removed_score is not None:
+            counts[removed_score] -= 1
+        cls.shift_scores(title_id, counts)
+
+    @classmethod
+    def shift_scores(cls, title_id, counts):
+        """
+        Сдвигает рейтинг и счётчики оценок произведения одним UPDATE
+        сразу на несколько отзывов. Счётчики не опускаются ниже нуля:
+        отзывы, загруженные в обход сигналов (loaddata), не ломают
+        удаление, а точные значения восстанавливает recalculate_ratings.
+        :param title_id: id произведения
+        :param counts: {оценка: изменение количества отзывов с ней}
+        """
+        counts = {score: delta for score, delta in counts.items() if delta}
+        if not counts:
+            return
+
+        def clamp(expression):
+            return Greatest(expression, 0, output_field=IntegerField())
+
+        new_sum = clamp(
+            F('score_sum')
+            + sum(score * delta for score, delta in counts.items())
+        )
+        new_count = clamp(F('reviews_count') + sum(counts.values()))
+        counters = {
+            score_count_field(score): clamp(
+                F(score_count_field(score)) + delta
+            )
+            for score, delta in counts.items()
+        }
+        cls.objects.filter(pk=title_id).update(
+            score_sum=new_sum,
+            reviews_count=new_count,
+            rating=Cast(new_sum, FloatField()) / NullIf(new_count, 0),
+            **counters,
+        )
+
+    def score_distribution(self):
+        """Количество отзывов по каждой оценке: {оценка: количество}."""
+        return {
+            score: getattr(self, score_count_field(score))
+            for score in SCORES
+        }
+
+
+class TitleRanking(models.Model):
+    """
+    Материализованный рейтинг произведения для топов. Пересчитывается
+    командой refresh_title_rankings, на запросах только читается.
+    Оценки - байесовское среднее: оценки произведения с малым числом
+    отзывов притягиваются к средней оценке по всем отзывам.
+    """
+
+    title = models.OneToOneField(
+        Title,
+        primary_key=True,
+        related_name='ranking',
+        on_delete=models.CASCADE,
+        verbose_name='Произведение',
+        help_text='Произведение, для которого посчитан рейтинг',
+    )
+    top_score = models.FloatField(
+        verbose_name='Оценка для топа',
+        help_text='Байесовское среднее всех оценок произведения',
+    )
+    recent_reviews_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Недавних отзывов',
+        help_text='Количество отзывов за последние дни',
+    )
+    trending_score = models.FloatField(
+        null=True,
+        default=None,
+        verbose_name='Оценка для трендов',
+        help_text='Байесовское среднее недавних оценок, пусто без них',
+    )
+    refreshed_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Дата пересчёта',
+        help_text='Когда рейтинг был пересчитан',
+    )
+
+    class Meta:
+        verbose_name = 'Рейтинг произведения'
+        verbose_name_plural = 'Рейтинги произведений'
+        indexes = [
+            models.Index(
+                fields=['-top_score', 'title'], name='ranking_top_idx'
+            ),
+            models.Index(
+                fields=['-trending_score', 'title'],
+                name='ranking_trending_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.title_id}: {self.top_score:.2f}'
+
 
 class Genre(models.Model):
     """Модель, которая описывает жанр произведения."""
@@ -185,8 +379,8 @@ class Review(models.Model):
     )
     score = models.PositiveSmallIntegerField(
         validators=[
-            MinValueValidator(1),
-            MaxValueValidator(10),
+            MinValueValidator(MIN_SCORE),
+            MaxValueValidator(MAX_SCORE),
         ],
         verbose_name='Оценка',
         help_text='Оценка произведения от 1 до 10',
@@ -215,6 +409,11 @@ class Review(models.Model):
         verbose_name = 'Обзор'
         verbose_name_plural = 'Обзоры'
         ordering = ('-pub_date',)
+        indexes = [
+            models.Index(
+                fields=['title', '-pub_date'], name='review_title_pub_date_idx'
+            ),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=['author', 'title'], name='unique_review'
@@ -224,6 +423,14 @@ class Review(models.Model):
     def __str__(self):
         return self.text[:10]
 
+    def save(self, *args, **kwargs):
+        """
+        Сохраняет отзыв в одной транзакции с обновлением рейтинга
+        произведения, которое делают сигналы сохранения.
+        """
+        with transaction.atomic(using=kwargs.get('using'), savepoint=False):
+            super().save(*args, **kwargs)
+
 
 class Comment(models.Model):
     """Модель, которая описывает комментарий к обзору."""
@@ -256,6 +463,110 @@ class Comment(models.Model):
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
         ordering = ('-pub_date',)
+        indexes = [
+            models.Index(
+                fields=['review', '-pub_date'],
+                name='comment_review_pub_date_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.text[:10]
+
+
+class OutboxEmail(models.Model):
+    """
+    Модель, которая описывает письмо в очереди на отправку.
+    Письма отправляет команда send_outbox_emails вне цикла запроса.
+    """
+
+    class Statuses(models.TextChoices):
+        PENDING = 'pending', 'В очереди'
+        SENT = 'sent', 'Отправлено'
+        FAILED = 'failed', 'Не отправлено'
+
+    subject = models.CharField(
+        max_length=NAME_LENGTH,
+        verbose_name='Тема',
+        help_text='Тема письма',
+    )
+    body = models.TextField(
+        verbose_name='Текст',
+        help_text='Текст письма',
+    )
+    from_email = models.EmailField(
+        max_length=EMAIL_LENGTH,
+        null=True,
+        default=None,
+        verbose_name='Отправитель',
+        help_text='Адрес отправителя, по умолчанию DEFAULT_FROM_EMAIL',
+    )
+    recipient = models.EmailField(
+        max_length=EMAIL_LENGTH,
+        verbose_name='Получатель',
+        help_text='Адрес получателя',
+    )
+    status = models.CharField(
+        max_length=7,
+        choices=Statuses.choices,
+        default=Statuses.PENDING,
+        verbose_name='Статус',
+        help_text='Статус отправки письма',
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Попытки',
+        help_text='Количество попыток отправки',
+    )
+    last_error = models.TextField(
+        blank=True,
+        default='',
+        verbose_name='Ошибка',
+        help_text='Текст последней ошибки отправки',
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата создания',
+        help_text='Дата постановки письма в очередь',
+    )
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Следующая попытка',
+        help_text='Не раньше этого времени письмо будет отправлено',
+    )
+    sent_at = models.DateTimeField(
+        null=True,
+        default=None,
+        verbose_name='Дата отправки',
+        help_text='Дата успешной отправки письма',
+    )
+
+    class Meta:
+        verbose_name = 'Письмо в очереди'
+        verbose_name_plural = 'Очередь писем'
+        ordering = ('id',)
+        indexes = [
+            models.Index(
+                fields=['status', 'next_attempt_at'],
+                name='outbox_status_next_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
+
+    @classmethod
+    def enqueue(cls, subject, body, recipient, from_email=None):
+        """
+        Ставит письмо в очередь на отправку.
+        :param subject: тема письма
+        :param body: текст письма
+        :param recipient: адрес получателя
+        :param from_email: адрес отправителя
+        """
+        return cls.objects.create(
+            subject=subject,
+            body=body,
+            recipient=recipient,
+            from_email=from_email,
+        )
@@ -0,0 +1,187 @@
+import re
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import FloatField
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+from .models import Title
+
+FTS_TABLE = 'reviews_title_fts'
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def tokenize(query):
+    """
+    Разбивает поисковую строку на слова, отбрасывая спецсимволы.
+    :param query: поисковая строка
+    :return: список слов в нижнем регистре
+    """
+    return TOKEN_PATTERN.findall(query.lower())
+
+
+class BaseTitleSearchBackend:
+    """
+    Базовый поисковый бэкенд произведений.
+    Каждое слово запроса ищется по префиксу (автодополнение),
+    результаты сортируются по релевантности.
+    """
+
+    def search(self, queryset, query):
+        """
+        Фильтрует и сортирует queryset произведений по запросу.
+        :param queryset: исходный queryset произведений
+        :param query: поисковая строка
+        """
+        raise NotImplementedError
+
+    def index(self, title):
+        """Обновляет поисковый индекс после сохранения произведения."""
+
+    def index_many(self, titles):
+        """Добавляет в индекс произведения, созданные через bulk_create."""
+        for title in titles:
+            self.index(title)
+
+    def remove(self, title_id):
+        """Удаляет произведение из поискового индекса."""
+
+    def rebuild(self):
+        """Полностью перестраивает поисковый индекс."""
+
+
+class IContainsSearchBackend(BaseTitleSearchBackend):
+    """Запасной бэкенд для СУБД без полнотекстового поиска."""
+
+    def search(self, queryset, query):
+        for token in tokenize(query):
+            queryset = queryset.filter(name__icontains=token)
+        return queryset
+
+
+class SQLiteFTSSearchBackend(BaseTitleSearchBackend):
+    """
+    Поиск через виртуальную таблицу SQLite FTS5, rowid которой
+    совпадает с id произведения. Ранжирование по bm25.
+    """
+
+    def _match_expression(self, tokens):
+        return ' '.join(f'"{token}"*' for token in tokens)
+
+    def search(self, queryset, query):
+        tokens = tokenize(query)
+        if not tokens:
+            return queryset.none()
+        match = self._match_expression(tokens)
+        title_id = '{table}.{column}'.format(
+            table=connection.ops.quote_name(Title._meta.db_table),
+            column=connection.ops.quote_name('id'),
+        )
+        return (
+            queryset.filter(
+                id__in=RawSQL(
+                    f'SELECT rowid FROM {FTS_TABLE} '
+                    f'WHERE {FTS_TABLE} MATCH %s',
+                    (match,),
+                )
+            )
+            .annotate(
+                search_rank=RawSQL(
+                    f'SELECT rank FROM {FTS_TABLE} '
+                    f'WHERE {FTS_TABLE} MATCH %s AND rowid = {title_id}',
+                    (match,),
+                    output_field=FloatField(),
+                )
+            )
+            .order_by('search_rank', 'id')
+        )
+
+    def index(self, title):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [title.pk]
+            )
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, name) VALUES (%s, %s)',
+                [title.pk, title.name],
+            )
+
+    def index_many(self, titles):
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid = %s',
+                [(title.pk,) for title in titles],
+            )
+            cursor.executemany(
+                f'INSERT INTO {FTS_TABLE} (rowid, name) VALUES (%s, %s)',
+                [(title.pk, title.name) for title in titles],
+            )
+
+    def remove(self, title_id):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [title_id]
+            )
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, name) '
+                f'SELECT id, name FROM {Title._meta.db_table}'
+            )
+
+
+class PostgresSearchBackend(BaseTitleSearchBackend):
+    """
+    Поиск через tsvector с префиксными лексемами и ранжированием
+    ts_rank. Индекс функциональный (GIN), поэтому синхронизируется
+    самой СУБД и отдельная поддержка при сохранении не нужна.
+    """
+
+    config = 'simple'
+
+    def search(self, queryset, query):
+        from django.contrib.postgres.search import (
+            SearchQuery,
+            SearchRank,
+            SearchVector,
+        )
+
+        tokens = tokenize(query)
+        if not tokens:
+            return queryset.none()
+        vector = SearchVector('name', config=self.config)
+        search_query = SearchQuery(
+            ' & '.join(f'{token}:*' for token in tokens),
+            config=self.config,
+            search_type='raw',
+        )
+        return (
+            queryset.annotate(
+                search_vector=vector,
+                search_rank=SearchRank(vector, search_query),
+            )
+            .filter(search_vector=search_query)
+            .order_by('-search_rank', 'id')
+        )
+
+
+VENDOR_BACKENDS = {
+    'sqlite': SQLiteFTSSearchBackend,
+    'postgresql': PostgresSearchBackend,
+}
+
+
+@lru_cache(maxsize=None)
+def get_search_backend():
+    """
+    Возвращает поисковый бэкенд из настройки TITLE_SEARCH_BACKEND,
+    а если она не задана - по типу текущей СУБД.
+    """
+    path = getattr(settings, 'TITLE_SEARCH_BACKEND', None)
+    if path:
+        return import_string(path)()
+    return VENDOR_BACKENDS.get(connection.vendor, IContainsSearchBackend)()
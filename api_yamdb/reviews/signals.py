@@ -0,0 +1,196 @@
+from collections import Counter, defaultdict
+from threading import local
+
+from django.core.signals import request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.db.models import Count
+from django.db.models.signals import (
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from .models import Review, Title, User
+from .search import get_search_backend
+
+
+@receiver(post_save, sender=Title)
+def index_title(sender, instance, **kwargs):
+    """Синхронизирует поисковый индекс после сохранения произведения."""
+    get_search_backend().index(instance)
+
+
+@receiver(post_delete, sender=Title)
+def unindex_title(sender, instance, **kwargs):
+    """Удаляет произведение из поискового индекса."""
+    get_search_backend().remove(instance.pk)
+
+
+_deleting = local()
+
+
+def deleting_ids(model):
+    """
+    pk объектов model, которые удаляются в текущем потоке прямо сейчас.
+    Зависимые объекты удаляются раньше родителя, и их сигналы
+    по этому множеству узнают, что родитель уходит вместе с ними.
+    """
+    return _deleting.__dict__.setdefault(model, set())
+
+
+@receiver(pre_delete, sender=Title)
+@receiver(pre_delete, sender=User)
+@receiver(pre_delete, sender=Review)
+def mark_deleting(sender, instance, **kwargs):
+    deleting_ids(sender).add(instance.pk)
+
+
+@receiver(post_delete, sender=Title)
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=Review)
+def unmark_deleting(sender, instance, **kwargs):
+    deleting_ids(sender).discard(instance.pk)
+
+
+@receiver(request_started)
+def forget_deleting(**kwargs):
+    """Отметки удаления, оборванного ошибкой, не переживают запрос."""
+    _deleting.__dict__.clear()
+
+
+@receiver(pre_save, sender=Review)
+def remember_review_score(sender, instance, raw, **kwargs):
+    """
+    Запоминает прежние произведение и оценку изменяемого отзыва.
+    Строка читается под блокировкой (Review.save открывает
+    транзакцию), иначе параллельные изменения посчитают сдвиг
+    от одной и той же оценки.
+    """
+    instance._previous_rating = None
+    if raw or instance.pk is None:
+        return
+    instance._previous_rating = (
+        Review.objects.select_for_update()
+        .filter(pk=instance.pk)
+        .values_list('title_id', 'score')
+        .first()
+    )
+
+
+@receiver(post_save, sender=Review)
+def rate_saved_review(sender, instance, created, raw, **kwargs):
+    """
+    Учитывает созданный или изменённый отзыв в рейтинге произведения
+    откуда бы ни пришло сохранение: API, админка, shell. Отзывы
+    из фикстур (raw) не учитываются, рейтинг после loaddata
+    пересчитывает recalculate_ratings.
+    """
+    if raw:
+        return
+    previous = getattr(instance, '_previous_rating', None)
+    if created or previous is None:
+        Title.shift_rating(instance.title_id, added_score=instance.score)
+        return
+    title_id, score = previous
+    if title_id == instance.title_id:
+        Title.shift_rating(
+            title_id, added_score=instance.score, removed_score=score
+        )
+        return
+    Title.shift_rating(title_id, removed_score=score)
+    Title.shift_rating(instance.title_id, added_score=instance.score)
+
+
+@receiver(pre_delete, sender=User)
+def unrate_author_reviews(sender, instance, **kwargs):
+    """
+    Вычитает оценки удаляемого автора: один запрос с группировкой
+    и один UPDATE на произведение вместо UPDATE на каждый отзыв.
+    """
+    rows = (
+        Review.objects.filter(author_id=instance.pk)
+        .exclude(title_id__in=deleting_ids(Title))
+        .order_by()
+        .values('title_id', 'score')
+        .annotate(count=Count('pk'))
+        .values_list('title_id', 'score', 'count')
+    )
+    scores = defaultdict(Counter)
+    for title_id, score, count in rows:
+        scores[title_id][score] -= count
+    for title_id, counts in scores.items():
+        Title.shift_scores(title_id, counts)
+
+
+@receiver(post_delete, sender=Review)
+def unrate_deleted_review(sender, instance, **kwargs):
+    """
+    Вычитает оценку удалённого отзыва из рейтинга произведения
+    в той же транзакции. Каскад от произведения пропускается
+    (произведение удаляется целиком), каскад от автора уже учтён
+    в unrate_author_reviews.
+    """
+    if (
+        instance.title_id in deleting_ids(Title)
+        or instance.author_id in deleting_ids(User)
+    ):
+        return
+    Title.shift_rating(instance.title_id, removed_score=instance.score)
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    """
+    Включает для SQLite журнал WAL: читатели не блокируют писателя
+    и наоборот. Ожидание блокировки задаётся OPTIONS['timeout'].
+    """
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA synchronous=NORMAL')
+
+
+def _checked_ensure_connection(connection):
+    """
+    ensure_connection, который один раз за запрос проверяет постоянное
+    соединение перед первым обращением к БД, как в Django 4.1.
+    """
+    ensure_connection = connection.ensure_connection
+
+    def checked_ensure_connection():
+        if connection.health_check_pending:
+            connection.health_check_pending = False
+            if (
+                connection.connection is not None
+                and not connection.in_atomic_block
+                and not connection.is_usable()
+            ):
+                connection.close()
+        ensure_connection()
+
+    return checked_ensure_connection
+
+
+@receiver(request_started)
+def check_connections_health(**kwargs):
+    """
+    Помечает для проверки постоянные соединения (CONN_MAX_AGE) баз
+    с CONN_HEALTH_CHECKS. Сама проверка выполняется лениво, перед первым
+    обращением к БД: ответы из кеша и 304 обходятся без лишнего
+    запроса, а оборванное соединение закрывается и открывается заново.
+    """
+    for connection in connections.all():
+        if (
+            not connection.settings_dict.get('CONN_HEALTH_CHECKS')
+            or connection.connection is None
+        ):
+            continue
+        if not hasattr(connection, 'health_check_pending'):
+            connection.ensure_connection = _checked_ensure_connection(
+                connection
+            )
+        connection.health_check_pending = True
@@ -0,0 +1,26 @@
+from django.urls import include, path
+
+from api import urls
+from api.async_views import async_read
+
+
+def _async_patterns(patterns):
+    result = []
+    for pattern in patterns:
+        if hasattr(pattern, 'url_patterns'):
+            result.append(
+                path(
+                    str(pattern.pattern),
+                    include(_async_patterns(pattern.url_patterns)),
+                )
+            )
+        else:
+            result.append(
+                path(str(pattern.pattern), async_read(pattern.callback))
+            )
+    return result
+
+
+urlpatterns = [
+    path('api/', include((_async_patterns(urls.urlpatterns), 'api_v1'))),
+]
@@ -0,0 +1,204 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Review, Title, User
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def test_01_rating_follows_review_writes(self, admin_client, admin,
+                                             user_client, user):
+        author_map = {admin: admin_client, user: user_client}
+        reviews, titles = create_reviews(admin_client, author_map)
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.reviews_count, title.score_sum, title.rating) == (
+            2, 10, 5.0
+        ), (
+            'Проверьте, что при создании отзыва обновляются количество, '
+            'сумма оценок и рейтинг произведения.'
+        )
+
+        review_url = self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[1]['id']
+        )
+        response = user_client.patch(review_url, data={'score': 9})
+        assert response.status_code == HTTPStatus.OK
+        title.refresh_from_db()
+        assert (title.reviews_count, title.score_sum, title.rating) == (
+            2, 14, 7.0
+        ), (
+            'Проверьте, что при изменении оценки отзыва пересчитывается '
+            'рейтинг произведения.'
+        )
+
+        response = user_client.delete(review_url)
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        title.refresh_from_db()
+        assert (title.reviews_count, title.score_sum, title.rating) == (
+            1, 5, 5.0
+        ), (
+            'Проверьте, что при удалении отзыва пересчитывается рейтинг '
+            'произведения.'
+        )
+
+        response = admin_client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        )
+        assert response.json().get('rating') == 5
+
+    def test_02_recalculate_ratings_command(self, admin_client, admin,
+                                            user_client, user):
+        author_map = {admin: admin_client, user: user_client}
+        _, titles = create_reviews(admin_client, author_map)
+        Title.objects.update(rating=None, reviews_count=0, score_sum=0)
+
+        call_command('recalculate_ratings', batch_size=1)
+
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.reviews_count, title.score_sum, title.rating) == (
+            2, 10, 5.0
+        ), (
+            'Проверьте, что команда `recalculate_ratings` восстанавливает '
+            'денормализованные поля рейтинга.'
+        )
+        empty_title = Title.objects.get(pk=titles[1]['id'])
+        assert empty_title.rating is None
+
+    def test_03_rating_follows_cascade_delete(self, admin_client, admin,
+                                              user_client, user):
+        author_map = {admin: admin_client, user: user_client}
+        reviews, titles = create_reviews(admin_client, author_map)
+        title_url = self.TITLE_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        admin_client.get(title_url)
+
+        response = admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        title = Title.objects.get(pk=titles[0]['id'])
+        remaining = 10 - reviews[1]['score']
+        assert (title.reviews_count, title.score_sum, title.rating) == (
+            1, remaining, float(remaining)
+        ), (
+            'Проверьте, что отзывы, удалённые каскадно вместе с автором, '
+            'вычитаются из рейтинга произведения.'
+        )
+        assert sum(title.score_distribution().values()) == 1
+        assert admin_client.get(title_url).json()['rating'] == remaining
+
+    def test_04_rating_follows_orm_writes(self, admin_client, admin,
+                                          user_client, user):
+        author_map = {admin: admin_client}
+        _, titles = create_reviews(admin_client, author_map)
+        title = Title.objects.get(pk=titles[0]['id'])
+        other_title = Title.objects.get(pk=titles[1]['id'])
+        review = Review.objects.create(
+            author=user, title=title, text='shell', score=9
+        )
+        title.refresh_from_db()
+        assert (title.reviews_count, title.score_sum, title.rating) == (
+            2, 14, 7.0
+        ), (
+            'Проверьте, что отзыв, созданный в обход API (админка, shell), '
+            'тоже учитывается в рейтинге произведения.'
+        )
+
+        review.title = other_title
+        review.score = 3
+        review.save()
+        title.refresh_from_db()
+        other_title.refresh_from_db()
+        assert (title.reviews_count, title.score_sum) == (1, 5)
+        assert (other_title.reviews_count, other_title.rating) == (1, 3.0)
+
+        response = admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        other_title.refresh_from_db()
+        assert (other_title.reviews_count, other_title.rating) == (0, None)
+        assert sum(other_title.score_distribution().values()) == 0
+
+    def test_05_rating_counters_never_go_negative(self, admin_client, admin,
+                                                  user_client, user):
+        author_map = {admin: admin_client, user: user_client}
+        reviews, titles = create_reviews(admin_client, author_map)
+        Title.objects.update(
+            rating=None, reviews_count=0, score_sum=0, score_5_count=0
+        )
+
+        response = user_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=titles[0]['id'], review_id=reviews[1]['id']
+            )
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT, (
+            'Проверьте, что удаление отзыва, не учтённого в счётчиках '
+            '(например, загруженного loaddata), не падает на ограничении.'
+        )
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.reviews_count, title.score_sum, title.rating) == (
+            0, 0, None
+        )
+
+    def test_06_cascades_update_each_title_once(self, admin_client, admin,
+                                                user_client, user):
+        author_map = {admin: admin_client}
+        _, titles = create_reviews(admin_client, author_map)
+        for idx in range(20):
+            author = User.objects.create(
+                username=f'rater{idx}', email=f'rater{idx}@yamdb.fake'
+            )
+            for title_data in titles:
+                Review.objects.create(
+                    author=author,
+                    title_id=title_data['id'],
+                    text='bulk',
+                    score=idx % 10 + 1,
+                )
+        Review.objects.create(
+            author=user, title_id=titles[0]['id'], text='a', score=2
+        )
+        Review.objects.create(
+            author=user, title_id=titles[1]['id'], text='b', score=4
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.delete(
+                f'/api/v1/users/{user.username}/'
+            )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        title_updates = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('UPDATE "reviews_title"')
+        ]
+        assert len(title_updates) == 2, (
+            'Проверьте, что при удалении автора оценки вычитаются одним '
+            'UPDATE на произведение, а не на каждый отзыв.'
+        )
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.reviews_count, title.score_sum) == (21, 5 + 110)
+
+        title_url = self.TITLE_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.delete(title_url)
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert not any(
+            query['sql'].startswith('UPDATE "reviews_title"')
+            for query in context.captured_queries
+        ), (
+            'Проверьте, что при удалении произведения его рейтинг '
+            'не пересчитывается для каждого каскадно удалённого отзыва.'
+        )
+        assert not Review.objects.filter(title_id=titles[0]['id']).exists()
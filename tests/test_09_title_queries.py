@@ -0,0 +1,43 @@
+import pytest
+
+from reviews.models import Category, Genre, Title
+from tests.utils import check_constant_query_count
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09TitleQueries:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    @staticmethod
+    def _create_titles(amount):
+        genres = [
+            Genre.objects.create(name=f'Жанр {idx}', slug=f'genre-{idx}')
+            for idx in range(3)
+        ]
+        category = Category.objects.create(name='Фильм', slug='films')
+        Title.objects.bulk_create(
+            Title(name=f'Произведение {idx}', year=2000, category=category)
+            for idx in range(amount)
+        )
+        titles = list(Title.objects.all())
+        for title in titles:
+            title.genre.set(genres)
+        return titles
+
+    def test_01_title_list_constant_queries(self, client):
+        self._create_titles(30)
+        queries = check_constant_query_count(client, self.TITLES_URL)
+        assert queries <= 3, (
+            f'Проверьте, что список `{self.TITLES_URL}` загружает категории '
+            'и жанры без дополнительных запросов на каждую запись. '
+            f'Сейчас запросов: {queries}'
+        )
+
+    def test_02_title_detail_queries(self, client, django_assert_num_queries):
+        titles = self._create_titles(1)
+        with django_assert_num_queries(2):
+            client.get(
+                self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[0].pk)
+            )
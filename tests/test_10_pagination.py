@@ -0,0 +1,141 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from reviews.models import Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10Pagination:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    @staticmethod
+    def _create_reviews(django_user_model, amount):
+        title = Title.objects.create(name='Терминатор', year=1984)
+        for idx in range(amount):
+            author = django_user_model.objects.create_user(
+                username=f'author{idx}', email=f'author{idx}@yamdb.fake'
+            )
+            Review.objects.create(
+                title=title, author=author, text=f'review {idx}', score=5
+            )
+        return title
+
+    def test_01_cursor_pagination(self, client, django_user_model):
+        title = self._create_reviews(django_user_model, 5)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.pk)
+
+        response = client.get(url, {'pagination': 'cursor', 'limit': 2})
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert 'count' not in data, (
+            'Проверьте, что в курсорном режиме пагинации не считается '
+            'общее количество объектов.'
+        )
+        seen = [review['id'] for review in data['results']]
+        while data['next']:
+            data = client.get(data['next']).json()
+            seen.extend(review['id'] for review in data['results'])
+        expected = list(
+            Review.objects.order_by('-pub_date', '-id')
+            .values_list('id', flat=True)
+        )
+        assert seen == expected, (
+            f'Проверьте, что курсорная пагинация `{url}` возвращает все '
+            'отзывы в порядке убывания даты публикации без повторов.'
+        )
+
+        response = client.get(
+            url, {'limit': 2}, HTTP_X_PAGINATION='cursor'
+        )
+        assert 'count' not in response.json(), (
+            'Проверьте, что курсорный режим включается заголовком '
+            '`X-Pagination: cursor`.'
+        )
+
+    def test_02_limit_offset_without_count(self, client, django_user_model):
+        title = self._create_reviews(django_user_model, 3)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.pk)
+
+        data = client.get(url, {'limit': 2, 'count': 'false'}).json()
+        assert data['count'] is None
+        assert len(data['results']) == 2
+        assert data['next'] is not None
+
+        data = client.get(data['next']).json()
+        assert len(data['results']) == 1
+        assert data['next'] is None
+
+        data = client.get(url, {'limit': 2}).json()
+        assert data['count'] == 3, (
+            'Проверьте, что по умолчанию пагинация limit/offset '
+            'возвращает общее количество объектов.'
+        )
+
+    def test_03_title_cursor_pagination(self, client):
+        Title.objects.bulk_create(
+            Title(name=f'Произведение {idx}', year=2000) for idx in range(3)
+        )
+        data = client.get(
+            self.TITLES_URL, {'pagination': 'cursor', 'limit': 2}
+        ).json()
+        assert len(data['results']) == 2
+        data = client.get(data['next']).json()
+        assert len(data['results']) == 1
+        assert data['next'] is None
+
+    def test_04_cursor_pagination_with_equal_pub_dates(
+        self, client, django_user_model
+    ):
+        title = Title.objects.create(name='Терминатор', year=1984)
+        django_user_model.objects.bulk_create(
+            django_user_model(
+                username=f'author{idx}', email=f'author{idx}@yamdb.fake'
+            )
+            for idx in range(1100)
+        )
+        authors = django_user_model.objects.order_by('id')
+        Review.objects.bulk_create(
+            Review(title=title, author=author, text='review', score=5)
+            for author in authors
+        )
+        Review.objects.update(pub_date=timezone.now())
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.pk)
+
+        data = client.get(url, {'pagination': 'cursor', 'limit': 100}).json()
+        pages = [[review['id'] for review in data['results']]]
+        while data['next']:
+            with CaptureQueriesContext(connection) as context:
+                data = client.get(data['next']).json()
+            pages.append([review['id'] for review in data['results']])
+        assert not any(
+            'OFFSET' in query['sql'] for query in context.captured_queries
+        ), (
+            'Проверьте, что курсор отзывов сравнивает кортеж '
+            '(pub_date, id), а не пропускает совпавшие даты через OFFSET.'
+        )
+        expected = list(
+            Review.objects.order_by('-pub_date', '-id')
+            .values_list('id', flat=True)
+        )
+        assert sum(pages, []) == expected, (
+            'Проверьте, что курсорная пагинация проходит все отзывы '
+            'с одинаковой датой публикации без повторов и пропусков.'
+        )
+
+        back = []
+        while data['previous']:
+            data = client.get(data['previous']).json()
+            back.append([review['id'] for review in data['results']])
+        assert back == pages[-2::-1], (
+            'Проверьте, что ссылка `previous` возвращает предыдущие '
+            'страницы курсора.'
+        )
+        # позиция курсора - не список значений полей сортировки
+        response = client.get(url, {'cursor': 'cD1nYXJiYWdl'})
+        assert response.status_code == HTTPStatus.NOT_FOUND
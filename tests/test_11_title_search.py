@@ -0,0 +1,64 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Category, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11TitleSearch:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @staticmethod
+    def _names(response):
+        assert response.status_code == HTTPStatus.OK
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_prefix_search(self, client):
+        category = Category.objects.create(name='Фильм', slug='films')
+        Title.objects.create(name='Крепкий орешек', year=1988)
+        Title.objects.create(
+            name='Терминатор', year=1984, category=category
+        )
+        Title.objects.create(name='Терминатор 2', year=1991)
+
+        names = self._names(client.get(self.TITLES_URL, {'search': 'терм'}))
+        assert sorted(names) == ['Терминатор', 'Терминатор 2'], (
+            f'Проверьте, что `{self.TITLES_URL}?search=` ищет произведения '
+            'по префиксу слов названия без учёта регистра.'
+        )
+        names = self._names(client.get(self.TITLES_URL, {'name': 'ОРЕШ'}))
+        assert names == ['Крепкий орешек'], (
+            f'Проверьте, что фильтр `{self.TITLES_URL}?name=` использует '
+            'полнотекстовый поиск.'
+        )
+        response = client.get(
+            self.TITLES_URL, {'search': 'терм', 'category': 'films'}
+        )
+        assert self._names(response) == ['Терминатор']
+        assert response.json()['count'] == 1
+
+    def test_02_index_follows_title_writes(self, client):
+        title = Title.objects.create(name='Терминатор', year=1984)
+        title.name = 'Чужой'
+        title.save()
+        assert self._names(
+            client.get(self.TITLES_URL, {'search': 'терм'})
+        ) == [], 'Проверьте, что поисковый индекс обновляется при сохранении.'
+        assert self._names(
+            client.get(self.TITLES_URL, {'search': 'чуж'})
+        ) == ['Чужой']
+
+        title.delete()
+        assert self._names(
+            client.get(self.TITLES_URL, {'search': 'чуж'})
+        ) == [], 'Проверьте, что поисковый индекс очищается при удалении.'
+
+    def test_03_rebuild_search_index(self, client):
+        Title.objects.bulk_create([Title(name='Матрица', year=1999)])
+        call_command('rebuild_search_index')
+        assert self._names(
+            client.get(self.TITLES_URL, {'search': 'матр'})
+        ) == ['Матрица']
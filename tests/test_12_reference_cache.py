@@ -0,0 +1,125 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Genre
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12ReferenceCache:
+
+    CATEGORY_URL = '/api/v1/categories/'
+    GENRE_URL = '/api/v1/genres/'
+
+    def test_01_list_served_from_cache(self, client,
+                                       django_assert_num_queries):
+        Category.objects.create(name='Фильм', slug='films')
+        first = client.get(self.CATEGORY_URL).json()
+        with django_assert_num_queries(0):
+            second = client.get(self.CATEGORY_URL).json()
+        assert first == second, (
+            f'Проверьте, что повторный GET-запрос к `{self.CATEGORY_URL}` '
+            'возвращает те же данные из кеша.'
+        )
+        with django_assert_num_queries(2):
+            client.get(self.CATEGORY_URL, {'search': 'Фил'})
+
+    def test_02_cache_invalidated_on_write(self, admin_client, client):
+        Genre.objects.create(name='Драма', slug='drama')
+        assert client.get(self.GENRE_URL).json()['count'] == 1
+
+        admin_client.post(self.GENRE_URL, data={'name': 'Ужасы',
+                                                'slug': 'horror'})
+        assert client.get(self.GENRE_URL).json()['count'] == 2, (
+            f'Проверьте, что кеш `{self.GENRE_URL}` сбрасывается при '
+            'создании жанра.'
+        )
+        assert client.get(self.CATEGORY_URL).json()['count'] == 0
+
+        admin_client.delete(f'{self.GENRE_URL}drama/')
+        data = client.get(self.GENRE_URL).json()
+        assert [genre['slug'] for genre in data['results']] == ['horror'], (
+            f'Проверьте, что кеш `{self.GENRE_URL}` сбрасывается при '
+            'удалении жанра.'
+        )
+
+    def test_03_title_slugs_resolved_from_cache(self, admin_client):
+        Category.objects.create(name='Фильм', slug='films')
+        Genre.objects.create(name='Драма', slug='drama')
+        Genre.objects.create(name='Ужасы', slug='horror')
+        data = {
+            'name': 'Поехали!',
+            'year': 2000,
+            'category': 'films',
+            'genre': ['drama', 'horror'],
+        }
+        admin_client.post('/api/v1/titles/', data=data)
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post('/api/v1/titles/', data=data)
+            admin_client.patch(
+                f'/api/v1/titles/{response.json()["id"]}/',
+                data={'category': 'films', 'genre': ['drama']},
+            )
+        slug_queries = [
+            query['sql'] for query in context.captured_queries
+            if '."slug" =' in query['sql'] or '."slug" IN' in query['sql']
+        ]
+        assert response.status_code == HTTPStatus.CREATED
+        assert slug_queries == [], (
+            'Проверьте, что слаги категорий и жанров при создании и '
+            'изменении произведения берутся из кеша, без запросов в БД.'
+        )
+
+    def test_04_slug_cache_invalidated_on_write(self, admin_client):
+        Category.objects.create(name='Фильм', slug='films')
+        data = {'name': 'Поехали!', 'year': 2000, 'category': 'films',
+                'genre': ['western']}
+        response = admin_client.post('/api/v1/titles/', data=data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+        admin_client.post(self.GENRE_URL, data={'name': 'Вестерн',
+                                                'slug': 'western'})
+        response = admin_client.post('/api/v1/titles/', data=data)
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что кеш слагов сбрасывается при создании жанра.'
+        )
+
+        admin_client.delete(f'{self.GENRE_URL}western/')
+        response = admin_client.post('/api/v1/titles/', data=data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что кеш слагов сбрасывается при удалении жанра.'
+        )
+
+    def test_05_slug_cache_falls_back_to_db(self, admin_client):
+        Category.objects.create(name='Фильм', slug='films')
+        data = {'name': 'Поехали!', 'year': 2000, 'category': 'films',
+                'genre': []}
+        response = admin_client.post('/api/v1/titles/', data=data)
+        assert response.status_code == HTTPStatus.CREATED
+
+        # bulk_create не шлёт сигналов, версия кеша не меняется
+        Category.objects.bulk_create([Category(name='Книга', slug='books')])
+        response = admin_client.post(
+            '/api/v1/titles/', data={**data, 'category': 'books'}
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что slug, которого нет в кеше, ищется в БД.'
+        )
+        assert response.json()['category'] == 'books'
+
+    def test_06_cache_invalidated_on_orm_write(self, client):
+        Category.objects.create(name='Фильм', slug='films')
+        assert client.get(self.CATEGORY_URL).json()['count'] == 1
+
+        category = Category.objects.create(name='Книга', slug='books')
+        assert client.get(self.CATEGORY_URL).json()['count'] == 2, (
+            'Проверьте, что кеш категорий сбрасывается при сохранении '
+            'категории не через API (админка, shell).'
+        )
+        category.delete()
+        assert client.get(self.CATEGORY_URL).json()['count'] == 1, (
+            'Проверьте, что кеш категорий сбрасывается при удалении '
+            'категории не через API.'
+        )
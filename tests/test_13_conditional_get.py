@@ -0,0 +1,194 @@
+import time
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from api import cache
+from reviews.models import Review, Title
+from tests.utils import create_comments, create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13ConditionalGet:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def test_01_not_modified(self, client, admin_client, admin,
+                             django_assert_num_queries, monkeypatch):
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        client.get(url)
+        # последняя запись была больше секунды назад
+        monkeypatch.setattr(cache, 'time', lambda: time.time() + 2)
+
+        response = client.get(url)
+        etag = response['ETag']
+        assert etag and response['Last-Modified'], (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+            'заголовки `ETag` и `Last-Modified`.'
+        )
+        with django_assert_num_queries(0):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с актуальным '
+            '`If-None-Match` возвращает ответ со статусом 304.'
+        )
+        response = client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    def test_02_etag_changes_on_write(self, client, admin_client, admin,
+                                      user_client, user):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        title_url = self.TITLE_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        title_etag = client.get(title_url)['ETag']
+        reviews_etag = client.get(reviews_url)['ETag']
+
+        admin_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=titles[0]['id'], review_id=reviews[0]['id']
+            ),
+            data={'score': 1},
+        )
+        response = client.get(title_url, HTTP_IF_NONE_MATCH=title_etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение отзыва сбрасывает `ETag` произведения, '
+            'так как меняется его рейтинг.'
+        )
+        assert response.json()['rating'] == 1
+        response = client.get(reviews_url, HTTP_IF_NONE_MATCH=reviews_etag)
+        assert response.status_code == HTTPStatus.OK
+
+        admin_client.delete(title_url)
+        response = client.get(reviews_url, HTTP_IF_NONE_MATCH=reviews_etag)
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что после удаления произведения условный GET-запрос '
+            'к его отзывам не возвращает 304.'
+        )
+
+    def test_03_no_last_modified_in_write_second(self, client, admin_client,
+                                                 admin, monkeypatch):
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        url = self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        client.get(url)
+        now = time.time()
+        monkeypatch.setattr(cache, 'time', lambda: now + 2)
+        last_modified = client.get(url)['Last-Modified']
+
+        monkeypatch.setattr(cache, 'time', lambda: now + 2.5)
+        admin_client.patch(url, data={'name': 'Новое название'})
+        response = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что запись в ту же секунду, что и предыдущий '
+            'GET-запрос, не скрывается ответом 304 на `If-Modified-Since`.'
+        )
+        assert response.json()['name'] == 'Новое название'
+        assert not response.has_header('Last-Modified'), (
+            'Проверьте, что `Last-Modified` не отдаётся, пока не прошла '
+            'секунда последней записи.'
+        )
+
+    def test_04_etag_depends_on_format_and_pagination(self, client,
+                                                      admin_client, admin):
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        response = client.get(url)
+        etag = response['ETag']
+        vary = {header.strip() for header in response['Vary'].split(',')}
+        assert {'Accept', 'X-Pagination', 'X-Pagination-Count'} <= vary, (
+            'Проверьте, что ответ содержит `Vary` по заголовкам, '
+            'от которых зависит тело ответа.'
+        )
+        for headers in (
+            {'HTTP_X_PAGINATION': 'cursor'},
+            {'HTTP_X_PAGINATION_COUNT': 'false'},
+            {'HTTP_ACCEPT': 'text/html'},
+        ):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag, **headers)
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что `ETag` зависит от заголовков {headers}.'
+            )
+            assert response['ETag'] != etag
+
+    def test_05_etag_changes_after_bulk_commands(self, client, admin_client,
+                                                 admin):
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        url = self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        etag = client.get(url)['ETag']
+        Title.objects.filter(pk=titles[0]['id']).update(rating=None)
+        call_command('recalculate_ratings')
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что `recalculate_ratings` сбрасывает `ETag` '
+            'произведений.'
+        )
+
+    def test_06_etag_changes_on_orm_writes(self, client, admin_client, admin,
+                                           user_client, user):
+        author_map = {admin: admin_client, user: user_client}
+        _, reviews, titles = create_comments(admin_client, author_map)
+        title_url = self.TITLE_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        comments_url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        title_etag = client.get(title_url)['ETag']
+        list_etag = client.get('/api/v1/titles/')['ETag']
+        title = Title.objects.get(pk=titles[0]['id'])
+        title.name = 'Терминатор 2'
+        title.save()
+        assert client.get(
+            title_url, HTTP_IF_NONE_MATCH=title_etag
+        ).status_code == HTTPStatus.OK, (
+            'Проверьте, что сохранение произведения в обход API '
+            '(админка, shell) сбрасывает `ETag` произведения.'
+        )
+        assert client.get(
+            '/api/v1/titles/', HTTP_IF_NONE_MATCH=list_etag
+        ).status_code == HTTPStatus.OK
+
+        reviews_etag = client.get(reviews_url)['ETag']
+        title_etag = client.get(title_url)['ETag']
+        Review.objects.get(pk=reviews[0]['id']).delete()
+        assert client.get(
+            reviews_url, HTTP_IF_NONE_MATCH=reviews_etag
+        ).status_code == HTTPStatus.OK
+        assert client.get(
+            title_url, HTTP_IF_NONE_MATCH=title_etag
+        ).json()['rating'] == 5
+
+    def test_07_etag_changes_on_cascaded_comment_delete(
+        self, client, admin_client, admin, user_client, user
+    ):
+        author_map = {admin: admin_client, user: user_client}
+        _, reviews, titles = create_comments(admin_client, author_map)
+        comments_url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        etag = client.get(comments_url)['ETag']
+
+        user.delete()
+        response = client.get(comments_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что комментарии, удалённые каскадно вместе '
+            'с автором, сбрасывают `ETag` списка комментариев.'
+        )
+        assert response.json()['count'] == 1
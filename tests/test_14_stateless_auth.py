@@ -0,0 +1,128 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from api.authentication import USER_STATE_KEY_TEMPLATE
+from reviews.models import Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14StatelessAuth:
+
+    TOKEN_URL = '/api/v1/auth/token/'
+    CATEGORY_URL = '/api/v1/categories/'
+    USER_DETAIL_URL_TEMPLATE = '/api/v1/users/{username}/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def _client_for(self, user):
+        user.code = 'secret'
+        user.save()
+        response = APIClient().post(
+            self.TOKEN_URL,
+            data={'username': user.username, 'confirmation_code': 'secret'},
+        )
+        assert response.status_code == HTTPStatus.OK
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {response.json()["token"]}'
+        )
+        return client
+
+    def test_01_no_user_lookup(self, user):
+        client = self._client_for(user)
+        title = Title.objects.create(name='Терминатор', year=1984)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.pk)
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(url, data={'text': 'Круто', 'score': 8})
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['author'] == user.username
+        user_table = user._meta.db_table
+        assert not [
+            query for query in context.captured_queries
+            if f'FROM "{user_table}"' in query['sql']
+        ], (
+            'Проверьте, что аутентификация по токену из '
+            f'`{self.TOKEN_URL}` не загружает пользователя из БД.'
+        )
+
+    def test_02_role_change_applies(self, admin_client, moderator):
+        moderator.role = 'admin'
+        moderator.save()
+        client = self._client_for(moderator)
+        data = {'name': 'Фильм', 'slug': 'films'}
+        response = client.post(self.CATEGORY_URL, data=data)
+        assert response.status_code == HTTPStatus.CREATED
+
+        admin_client.patch(
+            self.USER_DETAIL_URL_TEMPLATE.format(
+                username=moderator.username
+            ),
+            data={'role': 'user'},
+        )
+        data = {'name': 'Книги', 'slug': 'books'}
+        response = client.post(self.CATEGORY_URL, data=data)
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что понижение роли пользователя применяется к уже '
+            'выданным токенам.'
+        )
+
+        admin_client.delete(
+            self.USER_DETAIL_URL_TEMPLATE.format(
+                username=moderator.username
+            )
+        )
+        response = client.get(self.CATEGORY_URL)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что токены удалённого пользователя перестают '
+            'действовать.'
+        )
+
+    def test_03_changes_outside_api_apply(self, moderator):
+        moderator.role = 'admin'
+        moderator.save()
+        client = self._client_for(moderator)
+        response = client.post(self.CATEGORY_URL,
+                               data={'name': 'Фильм', 'slug': 'films'})
+        assert response.status_code == HTTPStatus.CREATED
+
+        moderator.role = 'user'
+        moderator.save()
+        response = client.post(self.CATEGORY_URL,
+                               data={'name': 'Книги', 'slug': 'books'})
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что изменение роли через админку или shell '
+            'применяется к уже выданным токенам.'
+        )
+
+        moderator.is_active = False
+        moderator.save()
+        response = client.get(self.CATEGORY_URL)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что токены деактивированного пользователя '
+            'перестают действовать.'
+        )
+
+    def test_04_stale_state_reread_from_db(self, moderator):
+        moderator.role = 'admin'
+        moderator.save()
+        client = self._client_for(moderator)
+
+        # update() не шлёт сигналов, как и запись из другого процесса
+        type(moderator).objects.filter(pk=moderator.pk).update(role='user')
+        cache.delete(USER_STATE_KEY_TEMPLATE.format(user_id=moderator.pk))
+        response = client.post(self.CATEGORY_URL,
+                               data={'name': 'Фильм', 'slug': 'films'})
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что устаревшее состояние пользователя '
+            'перечитывается из БД.'
+        )
+
+        type(moderator).objects.filter(pk=moderator.pk).delete()
+        cache.delete(USER_STATE_KEY_TEMPLATE.format(user_id=moderator.pk))
+        response = client.get(self.CATEGORY_URL)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
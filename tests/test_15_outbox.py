@@ -0,0 +1,49 @@
+from unittest import mock
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+
+from reviews.models import OutboxEmail
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15Outbox:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    def test_01_signup_only_enqueues(self, client):
+        outbox_before_count = len(mail.outbox)
+        valid_data = {'email': 'valid@yamdb.fake', 'username': 'valid'}
+        client.post(self.URL_SIGNUP, data=valid_data)
+        assert len(mail.outbox) == outbox_before_count, (
+            f'Проверьте, что `{self.URL_SIGNUP}` не отправляет письмо '
+            'в цикле запроса.'
+        )
+        email = OutboxEmail.objects.get()
+        assert email.recipient == valid_data['email']
+        assert email.status == OutboxEmail.Statuses.PENDING
+
+        call_command('send_outbox_emails', workers=2)
+        email.refresh_from_db()
+        assert email.status == OutboxEmail.Statuses.SENT
+        assert len(mail.outbox) == outbox_before_count + 1
+
+    def test_02_failed_delivery_is_retried(self):
+        email = OutboxEmail.enqueue('Тема', 'Текст', 'to@yamdb.fake')
+        with mock.patch(
+            'django.core.mail.EmailMessage.send',
+            side_effect=ConnectionError('smtp down'),
+        ):
+            call_command('send_outbox_emails', max_attempts=2, retry_delay=0)
+            email.refresh_from_db()
+            assert email.status == OutboxEmail.Statuses.PENDING
+            assert email.attempts == 1
+            assert 'smtp down' in email.last_error
+
+            call_command('send_outbox_emails', max_attempts=2, retry_delay=0)
+        email.refresh_from_db()
+        assert email.status == OutboxEmail.Statuses.FAILED, (
+            'Проверьте, что после исчерпания попыток письмо помечается '
+            'как неотправленное.'
+        )
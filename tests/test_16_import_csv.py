@@ -0,0 +1,46 @@
+import csv
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+
+from reviews.models import Comment, Genre, Review, Title, User
+
+CSV_PATH = settings.BASE_DIR / 'static' / 'data'
+
+
+def count_rows(file_name):
+    with open(CSV_PATH / file_name, encoding='utf-8', newline='') as file:
+        return sum(1 for _ in csv.DictReader(file))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16ImportCsv:
+
+    def test_01_import_csv(self):
+        call_command('import_csv', csv_path=str(CSV_PATH), batch_size=7)
+
+        assert User.objects.count() == count_rows('users.csv')
+        assert Title.objects.count() == count_rows('titles.csv')
+        assert Genre.objects.count() == count_rows('genre.csv')
+        assert Title.genre.through.objects.count() == count_rows(
+            'genre_title.csv'
+        )
+        assert Review.objects.count() == count_rows('review.csv')
+        assert Comment.objects.count() == count_rows('comments.csv')
+
+        with open(CSV_PATH / 'review.csv', encoding='utf-8',
+                  newline='') as file:
+            row = next(csv.DictReader(file))
+        review = Review.objects.get(pk=row['id'])
+        assert review.author_id == int(row['author'])
+        assert review.pub_date.isoformat().startswith(row['pub_date'][:19]), (
+            'Проверьте, что `import_csv` сохраняет `pub_date` из CSV.'
+        )
+        title = review.title
+        assert title.reviews_count == title.reviews.count(), (
+            'Проверьте, что после импорта пересчитывается рейтинг.'
+        )
+
+        new_title = Title.objects.create(name='Новое', year=2000)
+        assert new_title.pk > int(row['title_id'])
@@ -0,0 +1,55 @@
+import csv
+import json
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17TitleExport:
+
+    EXPORT_URL = '/api/v1/titles/export/'
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_export_permissions(self, client, user_client):
+        assert client.get(self.EXPORT_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
+        assert user_client.get(self.EXPORT_URL).status_code == (
+            HTTPStatus.FORBIDDEN
+        ), (
+            f'Проверьте, что `{self.EXPORT_URL}` доступен только '
+            'администраторам.'
+        )
+
+    def test_02_export_ndjson(self, admin_client, admin):
+        create_reviews(admin_client, {admin: admin_client})
+        response = admin_client.get(self.EXPORT_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert response.streaming
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        exported = [json.loads(line) for line in lines]
+        listed = admin_client.get(self.TITLES_URL).json()['results']
+        assert exported == listed, (
+            f'Проверьте, что `{self.EXPORT_URL}` выгружает произведения в '
+            f'том же виде, что и `{self.TITLES_URL}`.'
+        )
+
+    def test_03_export_csv(self, admin_client, admin):
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        response = admin_client.get(
+            self.EXPORT_URL, {'export_format': 'csv'}
+        )
+        content = b''.join(response.streaming_content).decode()
+        rows = list(csv.DictReader(content.splitlines()))
+        assert len(rows) == len(titles)
+        assert rows[0]['genre'] == ','.join(titles[0]['genre'])
+        assert rows[0]['category'] == titles[0]['category']
+        assert rows[0]['rating'] == '5'
+
+        response = admin_client.get(
+            self.EXPORT_URL, {'export_format': 'xml'}
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
@@ -0,0 +1,128 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import IntegrityError
+
+from api.views import TitleBatchCreateView
+from tests.utils import create_categories, create_genre
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18TitleBatch:
+
+    BATCH_URL = '/api/v1/titles/batch/'
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_batch_permissions(self, client, user_client):
+        data = [{'name': 'Поехали!', 'year': 2000, 'category': 'films',
+                 'genre': []}]
+        assert client.post(
+            self.BATCH_URL, data=data, content_type='application/json'
+        ).status_code == HTTPStatus.UNAUTHORIZED
+        assert user_client.post(
+            self.BATCH_URL, data=data, format='json'
+        ).status_code == HTTPStatus.FORBIDDEN, (
+            f'Проверьте, что `{self.BATCH_URL}` доступен только '
+            'администраторам.'
+        )
+
+    def test_02_batch_create(self, admin_client,
+                             django_assert_max_num_queries):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        data = [
+            {
+                'name': f'Произведение {idx}',
+                'year': 2000 + idx,
+                'genre': [genres[0]['slug'], genres[1]['slug']],
+                'category': categories[0]['slug'],
+            }
+            for idx in range(50)
+        ]
+        with django_assert_max_num_queries(15):
+            response = admin_client.post(
+                self.BATCH_URL, data=data, format='json'
+            )
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Проверьте, что POST-запрос администратора к `{self.BATCH_URL}` '
+            'с корректными данными возвращает статус 201.'
+        )
+        created = response.json()['created']
+        assert len(created) == len(data)
+        assert response.json()['errors'] == []
+
+        listed = admin_client.get(
+            self.TITLES_URL, {'limit': 100}
+        ).json()['results']
+        assert len(listed) == len(data)
+        title = admin_client.get(
+            f'{self.TITLES_URL}{created[7]["id"]}/'
+        ).json()
+        assert title['name'] == 'Произведение 7'
+        assert {genre['slug'] for genre in title['genre']} == {
+            genres[0]['slug'], genres[1]['slug']
+        }
+        assert title['category']['slug'] == categories[0]['slug']
+
+        found = admin_client.get(
+            self.TITLES_URL, {'name': 'Произведение'}
+        ).json()
+        assert found['count'] == len(data), (
+            'Проверьте, что произведения из пакета попадают в поиск.'
+        )
+
+    def test_03_batch_errors(self, admin_client):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        data = [
+            {
+                'name': 'Хорошее',
+                'year': 2000,
+                'genre': [genres[0]['slug']],
+                'category': categories[0]['slug'],
+            },
+            {
+                'name': 'Без категории',
+                'year': 2000,
+                'genre': [genres[0]['slug']],
+                'category': 'unknown',
+            },
+            {'name': 'Без года', 'genre': [], 'category': 'films'},
+        ]
+        response = admin_client.post(
+            self.BATCH_URL, data=data, format='json'
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        result = response.json()
+        assert [item['index'] for item in result['created']] == [0]
+        assert [error['index'] for error in result['errors']] == [1, 2]
+        assert 'category' in result['errors'][0]['errors']
+        assert 'year' in result['errors'][1]['errors']
+
+        response = admin_client.post(
+            self.BATCH_URL, data=data[1:], format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = admin_client.post(
+            self.BATCH_URL, data={}, format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_04_batch_conflict(self, admin_client, monkeypatch):
+        categories = create_categories(admin_client)
+        data = [{'name': 'Поехали!', 'year': 2000, 'genre': [],
+                 'category': categories[0]['slug']}]
+
+        def conflict(titles):
+            raise IntegrityError('UNIQUE constraint failed')
+
+        monkeypatch.setattr(
+            TitleBatchCreateView, '_bulk_insert', staticmethod(conflict)
+        )
+        response = admin_client.post(
+            self.BATCH_URL, data=data, format='json'
+        )
+        assert response.status_code == HTTPStatus.CONFLICT, (
+            'Проверьте, что конфликт при вставке пакета возвращает 409, '
+            'а не 500.'
+        )
@@ -0,0 +1,137 @@
+from http import HTTPStatus
+
+import pytest
+from rest_framework.test import APIClient
+
+from api.authentication import RoleAccessToken
+from reviews.models import Comment, Review, Title, User
+from tests.utils import check_constant_query_count
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19NestedQueries:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    @staticmethod
+    def _client_for(user):
+        """Клиент с токеном, не требующим запроса пользователя в БД."""
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {RoleAccessToken.for_user(user)}'
+        )
+        return client
+
+    def test_01_review_write_queries(self, user,
+                                     django_assert_max_num_queries):
+        client = self._client_for(user)
+        title = Title.objects.create(name='Терминатор', year=1984)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.pk)
+        with django_assert_max_num_queries(4):
+            response = client.post(url, data={'text': 'Круто', 'score': 8})
+        assert response.status_code == HTTPStatus.CREATED
+
+        # прежняя оценка перечитывается под блокировкой строки
+        with django_assert_max_num_queries(5):
+            response = client.patch(
+                f'{url}{response.json()["id"]}/', data={'score': 9}
+            )
+        assert response.status_code == HTTPStatus.OK
+
+        response = client.post(url, data={'text': 'Ещё раз', 'score': 1})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что повторный отзыв на произведение запрещён.'
+        )
+
+    def test_02_comment_write_queries(self, user,
+                                      django_assert_max_num_queries):
+        client = self._client_for(user)
+        title = Title.objects.create(name='Терминатор', year=1984)
+        review = Review.objects.create(
+            title=title, author=user, text='Круто', score=8
+        )
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=title.pk, review_id=review.pk
+        )
+        with django_assert_max_num_queries(2):
+            response = client.post(url, data={'text': 'Согласен'})
+        assert response.status_code == HTTPStatus.CREATED
+
+        comment_url = f'{url}{response.json()["id"]}/'
+        with django_assert_max_num_queries(2):
+            response = client.patch(comment_url, data={'text': 'Уже нет'})
+        assert response.status_code == HTTPStatus.OK
+
+        # удаление с сигналами (версии кеша) идёт в транзакции: + BEGIN
+        with django_assert_max_num_queries(3):
+            response = client.delete(comment_url)
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert not Comment.objects.exists()
+
+    def test_03_comment_checks_title(self, user):
+        client = self._client_for(user)
+        title = Title.objects.create(name='Терминатор', year=1984)
+        other_title = Title.objects.create(name='Чужой', year=1979)
+        review = Review.objects.create(
+            title=title, author=user, text='Круто', score=8
+        )
+        comment = Comment.objects.create(
+            review=review, author=user, text='Согласен'
+        )
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=other_title.pk, review_id=review.pk
+        )
+        assert client.get(url).status_code == HTTPStatus.NOT_FOUND
+        assert client.post(
+            url, data={'text': 'Согласен'}
+        ).status_code == HTTPStatus.NOT_FOUND
+        assert client.get(
+            f'{url}{comment.pk}/'
+        ).status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что комментарий ищется с учётом произведения из URL.'
+        )
+
+    @staticmethod
+    def _create_page_data(amount):
+        User.objects.bulk_create(
+            User(username=f'author_{idx}', email=f'author_{idx}@yamdb.fake')
+            for idx in range(amount)
+        )
+        authors = list(User.objects.filter(username__startswith='author_'))
+        title = Title.objects.create(name='Терминатор', year=1984)
+        Review.objects.bulk_create(
+            Review(title=title, author=author, text='Круто', score=8)
+            for author in authors
+        )
+        review = Review.objects.filter(title=title).first()
+        Comment.objects.bulk_create(
+            Comment(review=review, author=author, text='Согласен')
+            for author in authors
+        )
+        return title, review
+
+    def test_04_list_page_queries(self, client):
+        title, review = self._create_page_data(100)
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.pk)
+        queries = check_constant_query_count(client, reviews_url)
+        assert queries == 3, (
+            f'Проверьте, что страница `{reviews_url}` загружает авторов '
+            'в том же запросе, что и отзывы. '
+            f'Сейчас запросов: {queries}'
+        )
+        response = client.get(reviews_url, {'limit': 100}).json()
+        assert len(response['results']) == 100
+        assert response['results'][0]['author'].startswith('author_')
+
+        comments_url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=title.pk, review_id=review.pk
+        )
+        queries = check_constant_query_count(client, comments_url)
+        assert queries == 3, (
+            f'Проверьте, что страница `{comments_url}` загружает авторов '
+            'в том же запросе, что и комментарии. '
+            f'Сейчас запросов: {queries}'
+        )
@@ -0,0 +1,90 @@
+import logging
+from http import HTTPStatus
+
+import pytest
+from django.test import override_settings
+
+from api.metrics import registry
+from reviews.models import Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20Metrics:
+
+    METRICS_URL = '/metrics/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    @pytest.fixture(autouse=True)
+    def _reset_registry(self, settings):
+        settings.METRICS_TOKEN = 'secret'
+        registry.reset()
+
+    def test_01_endpoint_metrics(self, client):
+        title = Title.objects.create(name='Терминатор', year=1984)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.pk)
+        client.get(url)
+        client.get(url)
+
+        stats = registry.snapshot()[(
+            'api_v1:api.views.ReviewViewSet',
+            'api/v1/titles/<int:title_id>/reviews/',
+            'GET',
+        )]
+        assert stats.count == 2
+        assert stats.queries == 4, (
+            'Проверьте, что middleware считает SQL-запросы эндпоинта.'
+        )
+        assert stats.db_time > 0
+        assert stats.latency_sum > 0
+
+        response = client.get(
+            self.METRICS_URL, HTTP_AUTHORIZATION='Bearer secret'
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Type'].startswith('text/plain')
+        content = response.content.decode()
+        labels = (
+            'view="api_v1:api.views.ReviewViewSet",'
+            'route="api/v1/titles/<int:title_id>/reviews/",method="GET"'
+        )
+        assert (
+            f'yamdb_http_request_duration_seconds_count{{{labels}}} 2'
+            in content
+        )
+        assert f'yamdb_db_queries_total{{{labels}}} 4' in content
+        assert '# TYPE yamdb_serializer_duration_seconds_total counter' in (
+            content
+        )
+
+    def test_02_serializer_time(self, admin_client):
+        admin_client.post(
+            '/api/v1/categories/', data={'name': 'Фильм', 'slug': 'films'}
+        )
+        stats = registry.snapshot()[(
+            'api_v1:api.views.CategoryViewSet', 'api/v1/categories/', 'POST'
+        )]
+        assert stats.serializer_time > 0, (
+            'Проверьте, что middleware учитывает время сериализации.'
+        )
+
+    def test_03_metrics_access(self, client):
+        for headers in ({}, {'HTTP_AUTHORIZATION': 'Bearer wrong'}):
+            response = client.get(self.METRICS_URL, **headers)
+            assert response.status_code == HTTPStatus.FORBIDDEN, (
+                'Проверьте, что метрики без токена недоступны даже '
+                'с локального адреса (за обратным прокси).'
+            )
+        with override_settings(METRICS_ALLOWED_IPS=['10.0.0.1']):
+            response = client.get(self.METRICS_URL, REMOTE_ADDR='10.0.0.1')
+        assert response.status_code == HTTPStatus.OK
+
+    def test_04_slow_query_log(self, client, caplog):
+        title = Title.objects.create(name='Терминатор', year=1984)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.pk)
+        with override_settings(SLOW_QUERY_THRESHOLD_MS=0):
+            with caplog.at_level(logging.WARNING, logger='api.metrics'):
+                client.get(url)
+        assert any(
+            'reviews_title' in record.getMessage()
+            for record in caplog.records
+        ), 'Проверьте, что медленные SQL-запросы пишутся в лог.'
@@ -0,0 +1,53 @@
+import json
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21Benchmark:
+
+    def test_01_benchmark_report(self, tmp_path):
+        output = tmp_path / 'bench.json'
+        call_command(
+            'benchmark',
+            users=5,
+            titles=5,
+            genres=3,
+            categories=2,
+            reviews=20,
+            comments=10,
+            requests=5,
+            warmup=1,
+            use_existing_db=True,
+            output=str(output),
+        )
+        report = json.loads(output.read_text(encoding='utf-8'))
+        assert report['meta']['dataset']['titles'] == 5
+        assert report['meta']['dataset']['reviews'] == 20
+        assert set(report['results']) >= {
+            'titles_list', 'reviews_list', 'comments_list', 'comment_create'
+        }
+        for name, result in report['results'].items():
+            assert result['requests'] == 5
+            assert 0 < result['p50_ms'] <= result['p95_ms'] <= (
+                result['p99_ms']
+            )
+            assert result['throughput_rps'] > 0
+            assert result['queries_per_request'] >= 0
+            assert set(result['status_codes']) <= {'200', '201'}, (
+                f'Проверьте, что сценарий {name} отвечает без ошибок.'
+            )
+
+    def test_02_unknown_scenario(self):
+        with pytest.raises(CommandError, match='Неизвестные сценарии'):
+            call_command(
+                'benchmark',
+                users=2,
+                titles=2,
+                reviews=2,
+                comments=0,
+                scenarios=['nope'],
+                use_existing_db=True,
+            )
@@ -0,0 +1,69 @@
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Count
+
+from reviews.models import Comment, Review, Title, User
+
+
+def review_counts(prefix):
+    return list(
+        Title.objects.filter(category__slug__startswith=f'{prefix}-')
+        .order_by('id')
+        .values_list('reviews_count', flat=True)
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22GenerateData:
+
+    OPTIONS = {
+        'users': 60,
+        'titles': 40,
+        'genres': 5,
+        'categories': 3,
+        'reviews': 600,
+        'comments': 100,
+        'batch_size': 50,
+        'seed': 7,
+    }
+
+    def test_01_generate_data(self):
+        call_command('generate_data', prefix='a', **self.OPTIONS)
+        assert User.objects.filter(username__startswith='a_').count() == 60
+        assert Title.objects.count() == 40
+        assert Review.objects.count() == 600
+        assert Comment.objects.count() == 100
+        assert not Title.objects.annotate(
+            genres=Count('genre')
+        ).filter(genres=0).exists(), (
+            'Проверьте, что у каждого произведения есть жанры.'
+        )
+
+        counts = sorted(review_counts('a'), reverse=True)
+        assert sum(counts) == 600, (
+            'Проверьте, что после генерации пересчитаны рейтинги.'
+        )
+        assert counts[0] == 60
+        assert counts[0] > 5 * counts[len(counts) // 2], (
+            'Проверьте, что количество отзывов на произведение '
+            'распределено неравномерно (по Ципфу).'
+        )
+
+    def test_02_deterministic(self):
+        call_command('generate_data', prefix='a', **self.OPTIONS)
+        call_command('generate_data', prefix='b', **self.OPTIONS)
+        assert review_counts('a') == review_counts('b'), (
+            'Проверьте, что при одном seed данные генерируются одинаково.'
+        )
+
+        with pytest.raises(CommandError, match='уже есть'):
+            call_command('generate_data', prefix='a', **self.OPTIONS)
+
+    def test_03_explain_indexes_keeps_existing_db(self):
+        with pytest.raises(CommandError, match='Недостаточно данных'):
+            call_command('explain_indexes', use_existing_db=True)
+        assert not Review.objects.exists(), (
+            'Проверьте, что `explain_indexes --use_existing_db` без явного '
+            '`--reviews` не генерирует данные в текущей БД.'
+        )
@@ -0,0 +1,92 @@
+from django.db.backends.sqlite3.base import DatabaseWrapper
+
+from reviews import signals
+
+
+class FakeConnection:
+
+    def __init__(self, usable, health_checks=True):
+        self.settings_dict = {'CONN_HEALTH_CHECKS': health_checks}
+        self.connection = object()
+        self.in_atomic_block = False
+        self.usable = usable
+        self.checks = 0
+        self.connects = 0
+
+    def is_usable(self):
+        self.checks += 1
+        return self.usable
+
+    def close(self):
+        self.connection = None
+
+    def ensure_connection(self):
+        if self.connection is None:
+            self.connection = object()
+            self.connects += 1
+
+
+class FakeConnections:
+
+    def __init__(self, *items):
+        self.items = items
+
+    def all(self):
+        return list(self.items)
+
+
+class Test23Database:
+
+    def test_01_sqlite_wal_and_busy_timeout(self, tmp_path, settings,
+                                            django_db_blocker):
+        wrapper = DatabaseWrapper({
+            **settings.DATABASES['default'],
+            'NAME': str(tmp_path / 'db.sqlite3'),
+            'OPTIONS': {'timeout': 7},
+            'TIME_ZONE': None,
+            'CONN_MAX_AGE': 0,
+            'ATOMIC_REQUESTS': False,
+            'AUTOCOMMIT': True,
+        })
+        try:
+            with django_db_blocker.unblock(), wrapper.cursor() as cursor:
+                cursor.execute('PRAGMA journal_mode')
+                journal_mode = cursor.fetchone()[0]
+                cursor.execute('PRAGMA busy_timeout')
+                busy_timeout = cursor.fetchone()[0]
+        finally:
+            wrapper.close()
+        assert journal_mode == 'wal', (
+            'Проверьте, что для SQLite включается журнал WAL.'
+        )
+        assert busy_timeout == 7000, (
+            'Проверьте, что для SQLite задано ожидание блокировки.'
+        )
+
+    def test_02_health_check_runs_before_first_query(self, monkeypatch):
+        broken = FakeConnection(usable=False)
+        alive = FakeConnection(usable=True)
+        unchecked = FakeConnection(usable=False, health_checks=False)
+        monkeypatch.setattr(
+            signals, 'connections', FakeConnections(broken, alive, unchecked)
+        )
+        signals.check_connections_health(sender=None)
+        assert (broken.checks, alive.checks) == (0, 0), (
+            'Проверьте, что соединение проверяется не в начале запроса, '
+            'а перед первым обращением к БД: ответы из кеша обходятся '
+            'без лишнего запроса.'
+        )
+
+        broken.ensure_connection()
+        broken.ensure_connection()
+        assert (broken.checks, broken.connects) == (1, 1), (
+            'Проверьте, что оборванное соединение закрывается '
+            'и открывается заново перед первым запросом к БД, '
+            'а проверка выполняется один раз за запрос.'
+        )
+        unchecked.ensure_connection()
+        assert (unchecked.checks, unchecked.connects) == (0, 0)
+
+        signals.check_connections_health(sender=None)
+        alive.ensure_connection()
+        assert (alive.checks, alive.connects) == (1, 0)
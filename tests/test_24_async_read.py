@@ -0,0 +1,110 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.http import JsonResponse
+from django.test import AsyncClient
+
+from api import async_views
+from api.authentication import RoleAccessToken
+from api.metrics import registry
+from reviews.models import Category, Genre, Review, Title
+
+
+@pytest.mark.urls('tests.async_urls')
+@pytest.mark.django_db(transaction=True)
+class Test24AsyncRead:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @staticmethod
+    def _create_title():
+        category = Category.objects.create(name='Фильм', slug='films')
+        genre = Genre.objects.create(name='Драма', slug='drama')
+        title = Title.objects.create(
+            name='Терминатор', year=1984, category=category
+        )
+        title.genre.set([genre])
+        return title
+
+    def test_01_async_views_match_sync(self, client, user):
+        title = self._create_title()
+        Review.objects.create(title=title, author=user, text='Круто', score=8)
+        async_client = AsyncClient()
+        urls = (
+            self.TITLES_URL,
+            f'{self.TITLES_URL}{title.pk}/',
+            f'{self.TITLES_URL}{title.pk}/reviews/',
+        )
+        for url in urls:
+            response = async_to_sync(async_client.get)(url)
+            assert response.status_code == HTTPStatus.OK
+            assert response.json() == client.get(url).json(), (
+                f'Проверьте, что асинхронный `{url}` отвечает так же, '
+                'как синхронный.'
+            )
+        response = async_to_sync(async_client.get)(
+            f'{self.TITLES_URL}{title.pk + 100}/'
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_02_async_write_falls_back_to_sync(self, user):
+        title = self._create_title()
+        response = async_to_sync(AsyncClient().post)(
+            f'{self.TITLES_URL}{title.pk}/reviews/',
+            {'text': 'Круто', 'score': 8},
+            content_type='application/json',
+            authorization=f'Bearer {RoleAccessToken.for_user(user)}',
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert Review.objects.filter(title=title).count() == 1
+
+    def test_03_async_metrics_count_queries(self):
+        self._create_title()
+        registry.reset()
+        async_to_sync(AsyncClient().get)(self.TITLES_URL)
+        stats = [
+            stats for (view, _, method), stats in registry.snapshot().items()
+            if view.endswith('TitleViewSetListCreate') and method == 'GET'
+        ]
+        assert stats and stats[0].queries > 0, (
+            'Проверьте, что SQL-запросы асинхронных эндпоинтов '
+            'попадают в метрики.'
+        )
+
+
+def test_async_read_bounded_concurrency(monkeypatch):
+    workers = 2
+    monkeypatch.setattr(
+        async_views, '_executor', ThreadPoolExecutor(max_workers=workers)
+    )
+    lock = threading.Lock()
+    state = {'active': 0, 'peak': 0}
+
+    def slow_view(request):
+        with lock:
+            state['active'] += 1
+            state['peak'] = max(state['peak'], state['active'])
+        time.sleep(0.05)
+        with lock:
+            state['active'] -= 1
+        return JsonResponse({'ok': True})
+
+    view = async_views.async_read(slow_view)
+
+    class Request:
+        method = 'GET'
+
+    async def run():
+        return await asyncio.gather(*(view(Request()) for _ in range(8)))
+
+    responses = async_to_sync(run)()
+    assert all(response.status_code == HTTPStatus.OK for response in responses)
+    assert state['peak'] == workers, (
+        'Проверьте, что число одновременно выполняемых запросов '
+        'ограничено размером пула.'
+    )
@@ -0,0 +1,120 @@
+import json
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from api.views import CommentViewSet, ReviewViewSet, TitleViewSetListCreate
+from reviews.models import Category, Comment, Genre, Review, Title, User
+
+FAST_VIEWSETS = (CommentViewSet, ReviewViewSet, TitleViewSetListCreate)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25FastSerializers:
+
+    @staticmethod
+    def _create_data(user):
+        category = Category.objects.create(name='Фильм', slug='films')
+        genres = [
+            Genre.objects.create(name='Драма', slug='drama'),
+            Genre.objects.create(name='Комедия', slug='comedy'),
+        ]
+        titles = []
+        for idx in range(5):
+            title = Title.objects.create(
+                name=f'Терминатор {idx}',
+                year=1984 + idx,
+                description='Описание' if idx % 2 else None,
+                category=category if idx % 3 else None,
+            )
+            title.genre.set(genres[:idx % 3])
+            titles.append(title)
+        authors = [user] + [
+            User.objects.create(username=f'author_{idx}', email=f'{idx}@a.ru')
+            for idx in range(3)
+        ]
+        now = timezone.now()
+        reviews = []
+        for idx, author in enumerate(authors):
+            review = Review.objects.create(
+                title=titles[0], author=author, text=f'Отзыв {idx}',
+                score=idx + 5,
+            )
+            Review.objects.filter(pk=review.pk).update(
+                pub_date=now - timedelta(days=idx, microseconds=idx)
+            )
+            reviews.append(review)
+        for idx in range(4):
+            Comment.objects.create(
+                review=reviews[0], author=authors[idx], text=f'Коммент {idx}'
+            )
+        call_command('recalculate_ratings')
+        return titles[0], reviews[0]
+
+    def _urls(self, title, review):
+        reviews_url = f'/api/v1/titles/{title.pk}/reviews/'
+        comments_url = f'{reviews_url}{review.pk}/comments/'
+        return (
+            '/api/v1/titles/',
+            '/api/v1/titles/?genre=drama',
+            '/api/v1/titles/?name=Терм',
+            '/api/v1/titles/?limit=2&offset=1',
+            '/api/v1/titles/?pagination=cursor&limit=2',
+            reviews_url,
+            f'{reviews_url}?limit=2&count=false',
+            f'{reviews_url}?pagination=cursor&limit=2',
+            comments_url,
+            f'{comments_url}?pagination=cursor&limit=3',
+        )
+
+    def test_01_fast_lists_are_identical(self, client, user, monkeypatch):
+        title, review = self._create_data(user)
+        urls = self._urls(title, review)
+        fast = [client.get(url) for url in urls]
+        for viewset in FAST_VIEWSETS:
+            monkeypatch.setattr(viewset, 'fast_list_serializer_class', None)
+        for url, fast_response in zip(urls, fast):
+            response = client.get(url)
+            assert fast_response.status_code == response.status_code == 200
+            assert fast_response.content == response.content, (
+                f'Проверьте, что быстрый сериализатор `{url}` отдаёт '
+                'тот же JSON, что и обычный.'
+            )
+
+    def test_02_fast_lists_follow_cursor(self, client, user):
+        title, review = self._create_data(user)
+        url = f'/api/v1/titles/{title.pk}/reviews/?pagination=cursor&limit=2'
+        seen = []
+        while url:
+            data = client.get(url).json()
+            seen.extend(item['id'] for item in data['results'])
+            url = data['next']
+        assert sorted(seen) == sorted(
+            Review.objects.filter(title=title).values_list('pk', flat=True)
+        )
+
+    def test_03_benchmark_serializers(self, tmp_path):
+        output = tmp_path / 'ser.json'
+        call_command(
+            'benchmark_serializers',
+            users=5,
+            titles=10,
+            genres=3,
+            categories=2,
+            reviews=20,
+            comments=10,
+            rows=10,
+            repeat=2,
+            use_existing_db=True,
+            output=str(output),
+        )
+        report = json.loads(output.read_text(encoding='utf-8'))
+        assert set(report['results']) == {'titles', 'reviews', 'comments'}
+        for name, result in report['results'].items():
+            assert result['rows'] == 10
+            assert result['identical'], (
+                f'Проверьте, что JSON страницы {name} совпадает.'
+            )
+            assert result['speedup'] > 0
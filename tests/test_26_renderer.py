@@ -0,0 +1,121 @@
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import BrowsableAPIRenderer, JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict
+
+from api import cache, renderers
+from api.renderers import FastJSONRenderer, renders_fragments
+from api.serializers import TitleFastSerializer
+from reviews.models import Category, Title
+
+PAYLOAD = {
+    'count': 2,
+    'results': [
+        ReturnDict(
+            [('id', 1), ('name', 'Сталкер '), ('rating', None)],
+            serializer=None,
+        ),
+        {
+            'pub_date': datetime(2024, 1, 2, 3, 4, 5, 678901, timezone.utc),
+            'date': date(2024, 1, 2),
+            'score': Decimal('7.5'),
+            'lazy': gettext_lazy('Фильм'),
+            1: [True, False, 1.5],
+        },
+    ],
+}
+
+
+@pytest.fixture(params=['orjson', 'stdlib'])
+def json_backend(request, monkeypatch):
+    if request.param == 'stdlib':
+        monkeypatch.setattr(renderers, 'orjson', None)
+    return request.param
+
+
+def test_renderer_matches_drf(json_backend):
+    assert FastJSONRenderer().render(PAYLOAD) == (
+        JSONRenderer().render(PAYLOAD)
+    ), 'Проверьте, что FastJSONRenderer отдаёт тот же JSON, что и DRF.'
+    media_type = 'application/json; indent=4'
+    assert FastJSONRenderer().render(PAYLOAD, media_type) == (
+        JSONRenderer().render(PAYLOAD, media_type)
+    )
+    assert FastJSONRenderer().render(None) == b''
+
+
+@pytest.mark.django_db(transaction=True)
+def test_title_list_nested_objects_follow_rename(client):
+    category = Category.objects.create(name='Фильм', slug='films')
+    Title.objects.create(name='Сталкер', year=1979, category=category)
+    response = client.get('/api/v1/titles/')
+    assert response.json()['results'][0]['category'] == {
+        'name': 'Фильм',
+        'slug': 'films',
+    }
+    # переименование в админке: обычный save() без API
+    category.name = 'Кино'
+    category.save()
+    response = client.get('/api/v1/titles/')
+    assert response.json()['results'][0]['category']['name'] == 'Кино', (
+        'Проверьте, что кеш вложенных категорий сбрасывается '
+        'при переименовании категории.'
+    )
+
+
+def test_fragments_only_for_orjson_responses(monkeypatch):
+    monkeypatch.setattr(renderers, 'FRAGMENTS', True)
+
+    def request(renderer, media_type='application/json'):
+        return SimpleNamespace(
+            accepted_renderer=renderer, accepted_media_type=media_type
+        )
+
+    assert renders_fragments(request(FastJSONRenderer()))
+    assert not renders_fragments(None)
+    assert not renders_fragments(
+        request(FastJSONRenderer(), 'application/json; indent=4')
+    ), 'Проверьте, что ответ с отступами собирается из словарей.'
+    assert not renders_fragments(request(BrowsableAPIRenderer(), 'text/html'))
+    monkeypatch.setattr(renderers, 'FRAGMENTS', False)
+    assert not renders_fragments(request(FastJSONRenderer()))
+
+
+@pytest.mark.django_db(transaction=True)
+def test_nested_fragments_follow_rename(monkeypatch):
+    monkeypatch.setattr(cache, 'fragment', lambda data: ('json', dict(data)))
+    category = Category.objects.create(name='Фильм', slug='films')
+    title = Title.objects.create(name='Сталкер', year=1979, category=category)
+
+    def category_of(fragments):
+        return TitleFastSerializer(
+            title, context={'json_fragments': fragments}
+        ).data['category']
+
+    assert category_of(True) == ('json', {'name': 'Фильм', 'slug': 'films'})
+    assert category_of(False) == {'name': 'Фильм', 'slug': 'films'}
+    category.name = 'Кино'
+    category.save()
+    title.refresh_from_db()
+    assert category_of(True) == ('json', {'name': 'Кино', 'slug': 'films'})
+
+
+@pytest.mark.skipif(not renderers.FRAGMENTS, reason='нужен orjson 3.9+')
+@pytest.mark.django_db(transaction=True)
+def test_title_list_with_fragments_matches_dicts(client):
+    category = Category.objects.create(name='Фильм', slug='films')
+    Title.objects.create(name='Сталкер', year=1979, category=category)
+    data = TitleFastSerializer(
+        Title.objects.all(), many=True, context={'json_fragments': True}
+    ).data
+    assert isinstance(data[0]['category'], renderers.orjson.Fragment)
+    assert client.get('/api/v1/titles/').json() == client.get(
+        '/api/v1/titles/', HTTP_ACCEPT='application/json; indent=2'
+    ).json(), (
+        'Проверьте, что ответ с фрагментами orjson совпадает с ответом, '
+        'собранным из словарей.'
+    )
@@ -0,0 +1,180 @@
+from http import HTTPStatus
+
+import pytest
+from rest_framework.test import APIClient
+
+from api.authentication import RoleAccessToken
+from api.throttling import SlidingWindowThrottle
+from reviews.models import Title
+
+
+@pytest.fixture
+def rates(settings):
+    """Маленькие лимиты для проверки."""
+
+    def set_rates(**scopes):
+        rest = dict(settings.REST_FRAMEWORK)
+        rest['DEFAULT_THROTTLE_RATES'] = {
+            **rest['DEFAULT_THROTTLE_RATES'],
+            **{
+                scope.replace('_', '-'): rate
+                for scope, rate in scopes.items()
+            },
+        }
+        settings.REST_FRAMEWORK = rest
+
+    return set_rates
+
+
+def _client_for(user):
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f'Bearer {RoleAccessToken.for_user(user)}'
+    )
+    return client
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27Throttling:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+    URL_TOKEN = '/api/v1/auth/token/'
+    URL_TITLES = '/api/v1/titles/'
+
+    def test_01_signup_rejected_before_db(self, client, rates,
+                                          django_assert_num_queries):
+        rates(signup='2/hour')
+        for idx in range(2):
+            response = client.post(
+                self.URL_SIGNUP,
+                {'username': f'user_{idx}', 'email': f'{idx}@yamdb.fake'},
+            )
+            assert response.status_code == HTTPStatus.OK
+        with django_assert_num_queries(0):
+            response = client.post(
+                self.URL_SIGNUP,
+                {'username': 'user_2', 'email': '2@yamdb.fake'},
+            )
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что регистрация ограничена по IP.'
+        )
+        assert int(response['Retry-After']) > 0
+        response = client.post(
+            self.URL_SIGNUP,
+            {'username': 'user_2', 'email': '2@yamdb.fake'},
+            REMOTE_ADDR='10.0.0.2',
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что лимит регистрации считается для каждого IP.'
+        )
+
+    def test_02_token_throttled_by_ip(self, client, rates,
+                                      django_assert_num_queries):
+        rates(token='3/min')
+        data = {'username': 'nobody', 'confirmation_code': 'code'}
+        for _ in range(3):
+            response = client.post(self.URL_TOKEN, data)
+            assert response.status_code == HTTPStatus.NOT_FOUND
+        with django_assert_num_queries(0):
+            response = client.post(self.URL_TOKEN, data)
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+
+    def test_03_spoofed_forwarded_for_ignored(self, client, rates,
+                                              settings):
+        rates(token='2/min')
+        data = {'username': 'nobody', 'confirmation_code': 'code'}
+        for idx in range(2):
+            response = client.post(
+                self.URL_TOKEN, data, HTTP_X_FORWARDED_FOR=f'10.1.0.{idx}'
+            )
+            assert response.status_code == HTTPStatus.NOT_FOUND
+        response = client.post(
+            self.URL_TOKEN, data, HTTP_X_FORWARDED_FOR='10.1.0.99'
+        )
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что без доверенных прокси (`NUM_PROXIES`) '
+            'подделанный `X-Forwarded-For` не сбрасывает лимит по IP.'
+        )
+
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK, 'NUM_PROXIES': 1
+        }
+        response = client.post(
+            self.URL_TOKEN, data, HTTP_X_FORWARDED_FOR='1.2.3.4, 10.1.0.99'
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что за доверенным прокси лимит считается по адресу '
+            'клиента, который добавил прокси.'
+        )
+
+    def test_04_review_write_throttled_by_user(self, user, admin, rates):
+        rates(review_write='1/hour')
+        titles = [
+            Title.objects.create(name=f'Фильм {idx}', year=2000)
+            for idx in range(2)
+        ]
+        client = _client_for(user)
+        data = {'text': 'Отзыв', 'score': 5}
+        url = '/api/v1/titles/{}/reviews/'
+        response = client.post(url.format(titles[0].pk), data)
+        assert response.status_code == HTTPStatus.CREATED
+        response = client.post(url.format(titles[1].pk), data)
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что запись отзывов ограничена для пользователя.'
+        )
+        response = client.get(url.format(titles[1].pk))
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что лимит записи не ограничивает чтение.'
+        )
+        response = _client_for(admin).post(url.format(titles[1].pk), data)
+        assert response.status_code == HTTPStatus.CREATED
+
+    def test_05_anonymous_read(self, client, user, rates):
+        rates(anonymous_read='2/min')
+        for _ in range(2):
+            assert client.get(self.URL_TITLES).status_code == HTTPStatus.OK
+        response = client.get(self.URL_TITLES)
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что чтение анонимами ограничено по IP.'
+        )
+        response = _client_for(user).get(self.URL_TITLES)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что авторизованное чтение не ограничено '
+            'лимитом анонимов.'
+        )
+
+
+class FakeRequest:
+    method = 'GET'
+    user = None
+    META = {'REMOTE_ADDR': '10.0.0.1'}
+
+
+def test_sliding_window_weighs_previous_window(settings):
+    settings.REST_FRAMEWORK = {
+        **settings.REST_FRAMEWORK,
+        'DEFAULT_THROTTLE_RATES': {'test': '10/min'},
+    }
+    now = [600.0]
+
+    class Throttle(SlidingWindowThrottle):
+        scope = 'test'
+
+        def timer(self):
+            return now[0]
+
+    def allowed():
+        return Throttle().allow_request(FakeRequest(), None)
+
+    assert all(allowed() for _ in range(10))
+    assert not allowed()
+    # половина следующего окна: предыдущее весит 5 запросов
+    now[0] = 690.0
+    assert all(allowed() for _ in range(5))
+    assert not allowed()
+    throttle = Throttle()
+    assert not throttle.allow_request(FakeRequest(), None)
+    assert 0 < throttle.wait() <= 30
+    # через два окна счётчики прошлых окон не учитываются
+    now[0] = 720.0 + 60.0
+    assert all(allowed() for _ in range(10))
@@ -0,0 +1,85 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import SCORES, Title, score_count_field
+from tests.utils import create_reviews
+
+
+def _distribution(**counts):
+    return {
+        str(score): counts.get(f's{score}', 0) for score in SCORES
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28RatingDistribution:
+
+    URL_TEMPLATE = '/api/v1/titles/{title_id}/rating-distribution/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def test_01_distribution_follows_review_writes(
+        self, client, admin_client, admin, user_client, user,
+        django_assert_num_queries,
+    ):
+        author_map = {admin: admin_client, user: user_client}
+        reviews, titles = create_reviews(admin_client, author_map)
+        title_id = titles[0]['id']
+        url = self.URL_TEMPLATE.format(title_id=title_id)
+        with django_assert_num_queries(1):
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {
+            'id': title_id,
+            'rating': 5,
+            'reviews_count': 2,
+            'distribution': _distribution(s5=2),
+        }, (
+            f'Проверьте, что `{url}` отдаёт количество отзывов '
+            'по каждой оценке.'
+        )
+        etag = response['ETag']
+
+        review_url = self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=title_id, review_id=reviews[1]['id']
+        )
+        assert user_client.patch(
+            review_url, data={'score': 9}
+        ).status_code == HTTPStatus.OK
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение отзыва сбрасывает ETag распределения.'
+        )
+        assert response.json()['distribution'] == _distribution(s5=1, s9=1)
+
+        assert user_client.delete(review_url).status_code == (
+            HTTPStatus.NO_CONTENT
+        )
+        response = client.get(url)
+        assert response.json()['distribution'] == _distribution(s5=1)
+        assert response.json()['reviews_count'] == 1
+
+        empty = client.get(self.URL_TEMPLATE.format(title_id=titles[1]['id']))
+        assert empty.json()['distribution'] == _distribution()
+        assert empty.json()['rating'] is None
+        missing = client.get(self.URL_TEMPLATE.format(title_id=10 ** 6))
+        assert missing.status_code == HTTPStatus.NOT_FOUND
+
+    def test_02_recalculate_restores_distribution(self, admin_client, admin,
+                                                  user_client, user):
+        author_map = {admin: admin_client, user: user_client}
+        _, titles = create_reviews(admin_client, author_map)
+        Title.objects.update(
+            **{score_count_field(score): 0 for score in SCORES}
+        )
+        call_command('recalculate_ratings', batch_size=1)
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert title.score_distribution() == {
+            score: 2 if score == 5 else 0 for score in SCORES
+        }, (
+            'Проверьте, что команда `recalculate_ratings` восстанавливает '
+            'счётчики оценок.'
+        )
@@ -0,0 +1,114 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from reviews.models import Category, Genre, Review, Title, User
+
+
+def _bayes(scores, prior_mean, prior_weight=10):
+    return round(
+        (prior_mean * prior_weight + sum(scores))
+        / (prior_weight + len(scores)),
+        3,
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29Leaderboard:
+
+    TOP_URL = '/api/v1/titles/top/'
+    TRENDING_URL = '/api/v1/titles/trending/'
+
+    @staticmethod
+    def _create_data():
+        films = Category.objects.create(name='Фильм', slug='films')
+        books = Category.objects.create(name='Книга', slug='books')
+        drama = Genre.objects.create(name='Драма', slug='drama')
+        authors = [
+            User.objects.create(username=f'author_{idx}', email=f'{idx}@a.ru')
+            for idx in range(6)
+        ]
+        titles = {}
+        for name, category, scores, days_ago in (
+            ('single', films, [10], 0),
+            ('popular', films, [9] * 6, 0),
+            ('bad', books, [2, 3, 1], 0),
+            ('old', books, [10] * 5, 30),
+            ('empty', books, [], 0),
+        ):
+            title = Title.objects.create(
+                name=name, year=2000, category=category
+            )
+            if name in ('single', 'old'):
+                title.genre.set([drama])
+            for author, score in zip(authors, scores):
+                review = Review.objects.create(
+                    title=title, author=author, text='Отзыв', score=score
+                )
+                Review.objects.filter(pk=review.pk).update(
+                    pub_date=timezone.now() - timedelta(days=days_ago)
+                )
+            titles[name] = title
+        call_command('recalculate_ratings')
+        call_command('refresh_title_rankings')
+        return titles
+
+    def test_01_top_uses_bayesian_average(self, client):
+        self._create_data()
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(self.TOP_URL)
+        assert response.status_code == HTTPStatus.OK
+        names = [row['name'] for row in response.json()]
+        assert names == ['old', 'popular', 'single', 'bad'], (
+            'Проверьте, что топ упорядочен по байесовскому среднему '
+            'и не содержит произведений без отзывов.'
+        )
+        prior_mean = (10 + 9 * 6 + 6 + 50) / 15
+        assert response.json()[1]['score'] == _bayes([9] * 6, prior_mean)
+        assert response.json()[1]['category'] == {
+            'name': 'Фильм', 'slug': 'films'
+        }
+        sql = ' '.join(query['sql'].upper() for query in context)
+        for aggregate in ('COUNT(', 'AVG(', 'SUM(', 'GROUP BY'):
+            assert aggregate not in sql, (
+                'Проверьте, что топ отдаётся без агрегации на запросе.'
+            )
+
+    def test_02_filters_and_limit(self, client):
+        self._create_data()
+        response = client.get(self.TOP_URL, {'category': 'books'})
+        assert [row['name'] for row in response.json()] == ['old', 'bad']
+        response = client.get(self.TOP_URL, {'genre': 'drama'})
+        assert [row['name'] for row in response.json()] == ['old', 'single']
+        response = client.get(self.TOP_URL, {'limit': 1})
+        assert [row['name'] for row in response.json()] == ['old']
+
+    def test_03_trending_uses_recent_reviews(self, client):
+        self._create_data()
+        response = client.get(self.TRENDING_URL)
+        assert [row['name'] for row in response.json()] == [
+            'popular', 'single', 'bad'
+        ], 'Проверьте, что в трендах учитываются только недавние отзывы.'
+        response = client.get(self.TRENDING_URL, {'genre': 'drama'})
+        assert [row['name'] for row in response.json()] == ['single']
+
+    def test_04_refresh_changes_etag(self, client, user):
+        titles = self._create_data()
+        Review.objects.create(
+            title=titles['empty'], author=user, text='Отзыв', score=10
+        )
+        call_command('recalculate_ratings')
+        response = client.get(self.TOP_URL)
+        assert 'empty' not in [row['name'] for row in response.json()], (
+            'Топ меняется только после пересчёта рейтингов.'
+        )
+        etag = response['ETag']
+        call_command('refresh_title_rankings')
+        response = client.get(self.TOP_URL, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+        assert 'empty' in [row['name'] for row in response.json()]
@@ -1,5 +1,8 @@
 from http import HTTPStatus
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 
 check_name_and_slug_patterns = (
     (
@@ -305,3 +308,21 @@ def check_fields(obj_type, url_pattern, obj, expected_data, detail=False):
         f'данные {obj_types[obj_type]}{results_in_msg}. Поле `id` не '
         'найдено или не является целым числом.'
     )
+
+
+def check_constant_query_count(client, url, page_sizes=(1, 10, 100)):
+    """Проверяет, что число SQL-запросов не зависит от размера страницы."""
+    query_counts = {}
+    for limit in page_sizes:
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, {'limit': limit})
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает ответ со '
+            'статусом 200.'
+        )
+        query_counts[limit] = len(context.captured_queries)
+    assert len(set(query_counts.values())) == 1, (
+        f'Проверьте, что количество SQL-запросов к `{url}` не зависит от '
+        f'размера страницы. Сейчас (limit: запросов): {query_counts}'
+    )
+    return query_counts[page_sizes[0]]